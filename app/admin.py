@@ -1,7 +1,16 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 
-from app.models import Match, Participant, Set, Tournament, User
+from app.models import (
+    GlobalRanking,
+    Match,
+    OutboxEmail,
+    Participant,
+    Set,
+    Tournament,
+    User,
+    UserCareerStats,
+)
 
 
 class ParticipantInline(admin.TabularInline):
@@ -56,17 +65,19 @@ class TournamentAdmin(admin.ModelAdmin):
         "inscription_end_date",
         "start_date",
         "end_date",
+        "draw_size",
         "current_round",
     )
     list_filter = ("current_round", "start_date")
-    search_fields = ("name",)
+    search_fields = ("name", "slug")
+    prepopulated_fields = {"slug": ("name",)}
     inlines = [ParticipantInline]
 
     fieldsets = (
         (
             None,
             {
-                "fields": ("name", "description", "image"),
+                "fields": ("name", "slug", "description", "image"),
             },
         ),
         (
@@ -78,7 +89,7 @@ class TournamentAdmin(admin.ModelAdmin):
         (
             _("Tournament Status"),
             {
-                "fields": ("current_round",),
+                "fields": ("draw_size", "current_round"),
             },
         ),
     )
@@ -155,3 +166,72 @@ class SetAdmin(admin.ModelAdmin):
         "match__participant2__user__username",
     )
     ordering = ("match", "set_number")
+
+
+@admin.register(UserCareerStats)
+class UserCareerStatsAdmin(admin.ModelAdmin):
+    """
+    Admin interface for UserCareerStats model.
+
+    The stats are maintained automatically, so they are shown read-only:
+    - List display showing user and career totals
+    - Search functionality for username
+    """
+
+    list_display = (
+        "user",
+        "tournaments_played",
+        "total_score",
+        "total_sets_won",
+        "total_games_won",
+        "total_games_lost",
+    )
+    search_fields = ("user__username",)
+    readonly_fields = (
+        "user",
+        "tournaments_played",
+        "total_score",
+        "total_sets_won",
+        "total_games_won",
+        "total_games_lost",
+    )
+
+
+@admin.register(GlobalRanking)
+class GlobalRankingAdmin(admin.ModelAdmin):
+    """
+    Admin interface for GlobalRanking model.
+
+    The ranking is maintained automatically, so it is shown read-only:
+    - List display showing rank and user
+    - Search functionality for username
+    """
+
+    list_display = ("rank", "score_rank", "user")
+    search_fields = ("user__username",)
+    readonly_fields = ("user", "tiebreaker", "rank", "score_rank")
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """
+    Admin interface for OutboxEmail model.
+
+    Shows the delivery state of the queued emails:
+    - List display with subject, recipients, status and attempts
+    - Filters by status
+    - Search functionality for subject and recipients
+    - Read-only content, which is cleared once sent
+    """
+
+    list_display = ("subject", "to", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject", "to")
+    readonly_fields = (
+        "body",
+        "alternatives",
+        "attempts",
+        "last_error",
+        "created_at",
+        "sent_at",
+    )
@@ -0,0 +1,264 @@
+import json
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST, require_safe
+
+from app import models
+from app.brackets import Bracket, round_label, round_players
+from app.cache import cached_fragment, tournament_version
+from app.views import get_cached_tournament_or_404
+
+
+def tournament_etag(request, tournament):
+    """Return the ETag of a tournament endpoint, from the tournament's version.
+
+    Only the cached metadata and the version are read, so a poll that gets a
+    304 runs no tournament queries.
+    """
+    try:
+        tournament_id = models.Tournament.objects.get_cached(tournament).tournament.id
+    except models.Tournament.DoesNotExist:
+        return None
+    version = tournament_version(tournament_id)
+    return f"{request.resolver_match.url_name}-{tournament_id}-{version}"
+
+
+def tournament_endpoint(view):
+    """Decorate a tournament JSON view with login and conditional GET handling.
+
+    Responses must be revalidated on every poll, which is answered with a 304
+    while the tournament is unchanged.
+    """
+    return login_required(
+        require_safe(
+            cache_control(private=True, no_cache=True)(
+                condition(etag_func=tournament_etag)(view),
+            ),
+        ),
+    )
+
+
+def json_response(content, status=200):
+    """Return a response with the serialized JSON content."""
+    return HttpResponse(content, content_type="application/json", status=status)
+
+
+def dumps(data):
+    """Serialize the data to JSON."""
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def player_data(participant):
+    """Return the JSON data of a participant."""
+    if participant is None:
+        return None
+    user = participant.user
+    return {
+        "id": participant.id,
+        "username": user.username,
+        "name": f"{user.first_name} {user.last_name}".strip(),
+    }
+
+
+def tournament_data(tournament):
+    """Return the JSON data of a tournament."""
+    return {
+        "id": tournament.id,
+        "slug": tournament.slug,
+        "name": tournament.name,
+        "description": tournament.description,
+        "image": tournament.image,
+        "inscription_end_date": tournament.inscription_end_date,
+        "start_date": tournament.start_date,
+        "end_date": tournament.end_date,
+        "draw_size": tournament.draw_size,
+        "current_round": tournament.current_round,
+    }
+
+
+def bracket_data(tournament):
+    """Return the JSON data of the tournament bracket, first round to final."""
+    bracket = Bracket(tournament.bracket)
+    if not bracket.nodes:
+        return []
+    players = {
+        participant.id: player_data(participant)
+        for participant in tournament.participant_set.select_related("user")
+    }
+
+    def slot_data(slot):
+        participant1, participant2 = bracket.children(slot)
+        return {
+            "slot": slot,
+            "participant1": players.get(bracket.nodes[participant1]),
+            "participant2": players.get(bracket.nodes[participant2]),
+            "winner": players.get(bracket.nodes[slot]),
+        }
+
+    return [
+        {
+            "round": key,
+            "name": round_label(round_players(key)),
+            "matches": [slot_data(slot) for slot in bracket.round_slots(key)],
+        }
+        for key in bracket.rounds
+    ]
+
+
+def matches_data(tournament):
+    """Return the JSON data of the tournament matches and sets, by round."""
+    matches = (
+        models.Match.objects.filter(tournament=tournament)
+        .order_by("date", "id")
+        .select_related("participant1__user", "participant2__user")
+        .prefetch_related("set_set")
+    )
+    rounds = {}
+    for match in matches:
+        rounds.setdefault(match.round, []).append(
+            {
+                "id": match.id,
+                "slot": match.slot,
+                "date": match.date,
+                "participant1": player_data(match.participant1),
+                "participant2": player_data(match.participant2),
+                "participant1_set_wins": match.participant1_set_wins,
+                "participant2_set_wins": match.participant2_set_wins,
+                "winner": match.winner_id,
+                "sets": [
+                    {
+                        "set_number": set_.set_number,
+                        "participant1_score": set_.participant1_score,
+                        "participant2_score": set_.participant2_score,
+                    }
+                    for set_ in match.set_set.all()
+                ],
+            },
+        )
+    # First round first: the more players left, the earlier the round
+    return [
+        {
+            "round": key,
+            "name": round_label(round_players(key)),
+            "matches": rounds[key],
+        }
+        for key in sorted(rounds, key=round_players, reverse=True)
+    ]
+
+
+def standings_data(tournament):
+    """Return the JSON data of the tournament standings."""
+    participants = (
+        models.Participant.objects.filter(tournament=tournament)
+        .exclude(status="applied")
+        .select_related("user")
+        .order_by("-score", "id")
+    )
+    return [
+        {
+            "participant": player_data(participant),
+            "status": participant.status,
+            "score": participant.score,
+            "matches_won": participant.matches_won,
+            "sets_won": participant.sets_won,
+            "games_won": participant.games_won,
+            "games_lost": participant.games_lost,
+            "position": tournament.position(participant.matches_won),
+        }
+        for participant in participants
+    ]
+
+
+def cached_json(name, tournament, build):
+    """Return the JSON of a tournament endpoint, cached per tournament version."""
+    return json_response(
+        cached_fragment(f"api-{name}", tournament.id, lambda: dumps(build(tournament))),
+    )
+
+
+@login_required
+@require_safe
+def tournaments(request):  # noqa: ARG001
+    """Tournament list endpoint."""
+    return json_response(
+        dumps(
+            [
+                tournament_data(tournament)
+                for tournament in models.Tournament.objects.listed().order_by(
+                    "start_date",
+                    "name",
+                )
+            ],
+        ),
+    )
+
+
+@tournament_endpoint
+def tournament(request, tournament):  # noqa: ARG001
+    """Tournament endpoint."""
+    tournament = get_cached_tournament_or_404(tournament).tournament
+    return cached_json("tournament", tournament, tournament_data)
+
+
+@tournament_endpoint
+def bracket(request, tournament):  # noqa: ARG001
+    """Tournament bracket endpoint."""
+    tournament = get_cached_tournament_or_404(tournament).tournament
+    return cached_json("bracket", tournament, bracket_data)
+
+
+@tournament_endpoint
+def matches(request, tournament):  # noqa: ARG001
+    """Tournament matches endpoint."""
+    tournament = get_cached_tournament_or_404(tournament).tournament
+    return cached_json("matches", tournament, matches_data)
+
+
+@tournament_endpoint
+def standings(request, tournament):  # noqa: ARG001
+    """Tournament standings endpoint."""
+    tournament = get_cached_tournament_or_404(tournament).tournament
+    return cached_json("standings", tournament, standings_data)
+
+
+def parse_round_scores(body):
+    """Return the scores of a round scores request body.
+
+    The body is ``{"matches": [{"id": 1, "sets": [[6, 4], [7, 5]]}, ...]}``,
+    with ``null`` scores for empty sets.
+    """
+    try:
+        scores = {
+            int(match["id"]): [tuple(set_scores) for set_scores in match["sets"]]
+            for match in json.loads(body)["matches"]
+        }
+    except (ValueError, KeyError, TypeError) as error:
+        msg = "Formato de resultados no válido."
+        raise ValidationError(msg) from error
+    for match_scores in scores.values():
+        for set_scores in match_scores:
+            if len(set_scores) != 2 or not all(  # noqa: PLR2004
+                score is None or type(score) is int for score in set_scores
+            ):
+                msg = "Cada set debe tener dos puntuaciones enteras o vacías."
+                raise ValidationError(msg)
+    return scores
+
+
+@login_required
+@staff_member_required
+@require_POST
+def round_scores(request, tournament):
+    """Score entry endpoint for every match of the current round."""
+    tournament = get_object_or_404(models.Tournament, slug=tournament)
+    try:
+        written = tournament.enter_round_scores(parse_round_scores(request.body))
+    except ValidationError as error:
+        return json_response(dumps({"errors": error.messages}), status=400)
+    return json_response(dumps({"sets": written}))
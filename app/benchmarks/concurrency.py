@@ -0,0 +1,137 @@
+import multiprocessing
+import random
+import time
+from statistics import median, quantiles
+
+from django.db import OperationalError, close_old_connections, connection, transaction
+from django.db.models import F
+
+from app.models import Match, Participant, Set, Tournament
+
+
+def run_worker(work, deadline, seed, results):
+    """Run units of work until the deadline and report their timings.
+
+    Every unit runs like a request: old connections are closed before and
+    after it, so ``CONN_MAX_AGE`` decides whether the connection is reused.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    timings = []
+    errors = 0
+    try:
+        while time.monotonic() < deadline:
+            close_old_connections()
+            start = time.perf_counter()
+            try:
+                work(rng)
+            except OperationalError:
+                # database is locked
+                errors += 1
+            else:
+                timings.append(time.perf_counter() - start)
+            close_old_connections()
+    finally:
+        connection.close()
+        results.put((timings, errors))
+
+
+def read_tournament(tournament_ids):
+    """Return a unit of work loading the matches and standings of a tournament.
+
+    It runs the queries of the matches and standings views without rendering,
+    so the worker processes spend their time in SQLite rather than in Python.
+    """
+
+    def work(rng):
+        tournament_id = rng.choice(tournament_ids)
+        list(
+            Match.objects.filter(tournament_id=tournament_id)
+            .select_related("participant1__user", "participant2__user")
+            .prefetch_related("set_set"),
+        )
+        list(
+            Participant.objects.filter(tournament_id=tournament_id)
+            .select_related("user")
+            .order_by("-score"),
+        )
+
+    return work
+
+
+def enter_results(tournament_ids):
+    """Return a unit of work rewriting the set scores of a tournament.
+
+    The scores of every set are swapped and the match results recomputed in one
+    transaction, like entering the results of a whole round.
+    """
+
+    def work(rng):
+        with transaction.atomic():
+            tournament_id = rng.choice(tournament_ids)
+            Set.objects.filter(match__tournament_id=tournament_id).update(
+                participant1_score=F("participant2_score"),
+                participant2_score=F("participant1_score"),
+            )
+            Match.objects.filter(tournament_id=tournament_id).refresh_results()
+
+    return work
+
+
+def run_workload(readers, writers, duration):
+    """Run reader and writer processes on the database for ``duration`` seconds.
+
+    Returns the throughput, latency and lock errors of the reads and writes.
+    """
+    tournament_ids = list(
+        Tournament.objects.filter(slug__startswith="torneo").values_list(
+            "id",
+            flat=True,
+        ),
+    )
+    # Children open their own connections, like separate server workers
+    connection.close()
+
+    context = multiprocessing.get_context("fork")
+    deadline = time.monotonic() + duration
+    groups = {
+        "reads": [read_tournament(tournament_ids)] * readers,
+        "writes": [enter_results(tournament_ids)] * writers,
+    }
+    results = {}
+    processes = []
+    for name, works in groups.items():
+        results[name] = context.Queue()
+        for work in works:
+            processes.append(
+                context.Process(
+                    target=run_worker,
+                    args=(work, deadline, len(processes), results[name]),
+                ),
+            )
+    for process in processes:
+        process.start()
+    summary = {
+        name: summarize(
+            [results[name].get() for _ in groups[name]],
+            duration,
+        )
+        for name in groups
+    }
+    for process in processes:
+        process.join()
+    return summary
+
+
+def summarize(workers, duration):
+    """Return the throughput, latency percentiles and errors of the workers."""
+    timings = [timing for worker_timings, _ in workers for timing in worker_timings]
+    result = {
+        "per_second": round(len(timings) / duration, 1),
+        "errors": sum(errors for _, errors in workers),
+        "p50_ms": None,
+        "p95_ms": None,
+    }
+    if len(timings) > 1:
+        result["p50_ms"] = round(median(timings) * 1000, 1)
+        result["p95_ms"] = round(quantiles(timings, n=20)[-1] * 1000, 1)
+    return result
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from statistics import quantiles
+from urllib.parse import quote, unquote
+
+from django.db import connection
+from django.test import AsyncClient, Client
+
+
+def summarize(timings, elapsed):
+    """Return the throughput and latency percentiles of the requests."""
+    result = {"per_second": round(len(timings) / elapsed, 1), "p95_ms": None}
+    if len(timings) > 1:
+        result["p95_ms"] = round(quantiles(timings, n=20)[-1] * 1000, 1)
+    return result
+
+
+def check(response, path):
+    """Fail on error responses."""
+    if response.status_code >= 400:  # noqa: PLR2004
+        msg = f"{path} answered {response.status_code}"
+        raise RuntimeError(msg)
+
+
+def run_wsgi(path, user, concurrency, requests):
+    """Serve the requests through the sync (WSGI) handler from a thread pool.
+
+    Each thread plays a server worker thread with its own client and database
+    connection.
+    """
+    timings = []
+    errors = []
+
+    def worker(client):
+        try:
+            for _ in range(requests // concurrency):
+                start = time.perf_counter()
+                check(client.get(path), path)
+                timings.append(time.perf_counter() - start)
+        except Exception as error:  # noqa: BLE001
+            errors.append(error)
+        finally:
+            connection.close()
+
+    clients = []
+    for _ in range(concurrency):
+        client = Client()
+        client.force_login(user)
+        clients.append(client)
+
+    threads = [threading.Thread(target=worker, args=(client,)) for client in clients]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return summarize(timings, elapsed)
+
+
+async def run_asgi(path, user, concurrency, requests):
+    """Serve the requests through the async (ASGI) handler on one event loop."""
+    timings = []
+    # The async test client decodes the path as Latin-1 like a WSGI environ,
+    # so non-ASCII paths have to be percent-encoded in Latin-1 for it
+    path = quote(unquote(path), encoding="latin-1")
+
+    async def worker(client):
+        for _ in range(requests // concurrency):
+            start = time.perf_counter()
+            check(await client.get(path), path)
+            timings.append(time.perf_counter() - start)
+
+    clients = []
+    for _ in range(concurrency):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        clients.append(client)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(client) for client in clients))
+    return summarize(timings, time.perf_counter() - start)
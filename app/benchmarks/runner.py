@@ -0,0 +1,120 @@
+import json
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from statistics import median
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from app.cache import tournament_cache, tournament_slugs
+
+
+def measure(scenario, repeat):
+    """Return the query count and median wall time of a scenario.
+
+    Every repetition starts with empty caches and is rolled back, so each one
+    sees the same data.
+    """
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        cache.clear()
+        tournament_cache.clear()
+        tournament_slugs.clear()
+        with transaction.atomic():
+            if scenario.setup is not None:
+                scenario.setup()
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                scenario.run()
+                timings.append(time.perf_counter() - start)
+            queries = len(context.captured_queries)
+            transaction.set_rollback(True)
+    return {"queries": queries, "seconds": round(median(timings), 4)}
+
+
+def compare(results, budgets, tolerance, query_tolerance=0):
+    """Return the budget violations and the scenarios without a budget.
+
+    A scenario violates its budget when it runs more than ``query_tolerance``
+    queries over the budget or is more than ``tolerance`` (a fraction) slower.
+    """
+    violations = []
+    missing = []
+    for name, result in results.items():
+        budget = budgets.get(name)
+        if budget is None:
+            missing.append(name)
+            continue
+        if result["queries"] > budget["queries"] + query_tolerance:
+            violations.append(
+                f"{name}: {result['queries']} queries, budget {budget['queries']}",
+            )
+        if result["seconds"] > budget["seconds"] * (1 + tolerance):
+            violations.append(
+                f"{name}: {result['seconds']:.4f}s, budget {budget['seconds']:.4f}s "
+                f"+{tolerance:.0%}",
+            )
+    return violations, missing
+
+
+def load_budgets(path):
+    """Return the budget file contents, empty if it does not exist yet."""
+    try:
+        with Path(path).open(encoding="utf-8") as budget_file:
+            return json.load(budget_file)
+    except FileNotFoundError:
+        return {}
+
+
+def write_budgets(path, dataset, rows, tolerance, results):
+    """Write the results as the new budgets, with the row counts they ran on."""
+    with Path(path).open("w", encoding="utf-8") as budget_file:
+        json.dump(
+            {
+                "dataset": dataset,
+                "rows": rows,
+                "tolerance": tolerance,
+                "budgets": results,
+            },
+            budget_file,
+            indent=2,
+            ensure_ascii=False,
+        )
+        budget_file.write("\n")
+
+
+@contextmanager
+def file_test_database(**overrides):
+    """Create a test database in a temporary file for the block.
+
+    The default test database lives in memory, which has no WAL and locks
+    whole tables between connections, so concurrent benchmarks use a file.
+    ``overrides`` are applied to the database settings meanwhile.
+    """
+    settings_dict = connection.settings_dict
+    saved = {key: settings_dict.get(key) for key in overrides}
+    saved_test_name = settings_dict["TEST"]["NAME"]
+    with tempfile.TemporaryDirectory() as directory:
+        settings_dict["TEST"]["NAME"] = str(Path(directory) / "benchmark.sqlite3")
+        settings_dict.update(overrides)
+        connection.close()
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            yield
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            settings_dict.update(saved)
+            settings_dict["TEST"]["NAME"] = saved_test_name
+            connection.close()
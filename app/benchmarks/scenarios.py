@@ -0,0 +1,293 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.test.client import MULTIPART_CONTENT
+from django.urls import reverse
+
+from app.models import GlobalRanking, Match, Participant, Set, Tournament, User
+
+
+class Scenario:
+    """A piece of work measured by the benchmark suite.
+
+    ``setup`` prepares the data and is not measured; ``run`` is. Both run
+    inside a transaction that is rolled back afterwards, so scenarios can
+    write freely.
+    """
+
+    def __init__(self, name, run, setup=None):
+        """Initialize with a name and the callables to run."""
+        self.name = name
+        self.run = run
+        self.setup = setup
+
+
+class Fixtures:
+    """Rows of the seeded club the scenarios work on."""
+
+    def __init__(self, client):
+        """Pick the rows and log the client in."""
+        self.client = client
+        self.superuser = User.objects.filter(is_superuser=True).first()
+        # the most active player, so user pages show a long history
+        self.user = (
+            get_user_model()
+            .objects.filter(is_superuser=False)
+            .annotate(played=Count("participant"))
+            .order_by("-played", "id")
+            .first()
+        )
+        self.finished = (
+            Tournament.objects.filter(current_round="finalizado")
+            .annotate(entrants=Count("participant"))
+            .order_by("-entrants", "-id")
+            .first()
+        )
+        self.ongoing = (
+            Tournament.objects.exclude(current_round__in=["finalizado", "no_comenzado"])
+            .order_by("-id")
+            .first()
+        )
+        self.match = self.ongoing.match_set.order_by("id").first()
+
+    def get(self, name, *args, query=""):
+        """Request a page and fail on error responses.
+
+        Streamed responses are read to the end, as their queries run then.
+        """
+        response = self.client.get(reverse(name, args=args) + query)
+        if response.status_code >= 400:  # noqa: PLR2004
+            msg = f"{name} answered {response.status_code}"
+            raise RuntimeError(msg)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def post(self, name, *args, data=None, content_type=MULTIPART_CONTENT):
+        """Post a form, empty by default, to a page and fail on error responses."""
+        response = self.client.post(
+            reverse(name, args=args),
+            data,
+            content_type=content_type,
+        )
+        if response.status_code >= 400:  # noqa: PLR2004
+            msg = f"{name} answered {response.status_code}"
+            raise RuntimeError(msg)
+        return response
+
+    def view(  # noqa: PLR0913
+        self,
+        name,
+        *args,
+        user=None,
+        anonymous=False,
+        method="get",
+        query="",
+        data=None,
+        content_type=MULTIPART_CONTENT,
+        setup=None,
+        label=None,
+    ):
+        """Return the scenario requesting a page.
+
+        The client logs in as ``user`` (the most active player by default)
+        while setting up, so the session queries are not measured.
+        """
+
+        def prepare():
+            if anonymous:
+                self.client.logout()
+            else:
+                self.client.force_login(user or self.user)
+            if setup is not None:
+                setup()
+
+        if method == "post":
+            run = lambda: self.post(  # noqa: E731
+                name,
+                *args,
+                data=data,
+                content_type=content_type,
+            )
+        else:
+            run = lambda: self.get(name, *args, query=query)  # noqa: E731
+        return Scenario(f"view:{label or name}", run, setup=prepare)
+
+    def not_modified(self, name, *args):
+        """Return the scenario polling an API endpoint with its last ETag.
+
+        The ETag is fetched while setting up, so only the 304 is measured.
+        """
+        etag = {}
+
+        def prepare():
+            self.client.force_login(self.user)
+            etag["value"] = self.get(name, *args).headers["ETag"]
+
+        def run():
+            response = self.client.get(
+                reverse(name, args=args),
+                headers={"if-none-match": etag["value"]},
+            )
+            if response.status_code != 304:  # noqa: PLR2004
+                msg = f"{name} answered {response.status_code}, expected 304"
+                raise RuntimeError(msg)
+            return response
+
+        return Scenario(f"view:{name}:not_modified", run, setup=prepare)
+
+    def round_scores(self):
+        """Return 6-4 6-4 wins for participant1 in every open match."""
+        return {
+            match_id: [(6, 4), (6, 4)]
+            for match_id in Match.objects.filter(
+                tournament=self.ongoing,
+                round=self.ongoing.current_round,
+            ).values_list("id", flat=True)
+        }
+
+    def enter_round_results(self):
+        """Enter a 6-4 6-4 win for participant1 in every open match."""
+        matches = list(
+            Match.objects.filter(
+                tournament=self.ongoing,
+                round=self.ongoing.current_round,
+            ),
+        )
+        Set.objects.bulk_create(
+            Set(
+                match=match,
+                set_number=set_number,
+                participant1_score=6,
+                participant2_score=4,
+            )
+            for match in matches
+            for set_number in (1, 2)
+        )
+        Match.objects.filter(id__in=[match.id for match in matches]).refresh_results()
+
+    def open_inscriptions(self):
+        """Turn the ongoing tournament back into one taking applications."""
+        Match.objects.filter(tournament=self.ongoing).delete()
+        self.ongoing.current_round = "no_comenzado"
+        self.ongoing.bracket = []
+        self.ongoing.save()
+        Participant.objects.filter(tournament=self.ongoing).update(
+            status="applied",
+        )
+
+
+def get_scenarios(fixtures):
+    """Return the scenarios: every view of app/urls.py and the domain methods."""
+    f = fixtures
+    scores = f.round_scores()
+    return [
+        # Views
+        f.view("home"),
+        f.view("login", anonymous=True),
+        f.view("register", anonymous=True),
+        f.view("password_reset", anonymous=True),
+        f.view("password_reset_done", anonymous=True),
+        f.view("logout", method="post"),
+        f.view("tournament", f.finished.slug),
+        f.view("standings", f.finished.slug),
+        f.view("matches", f.finished.slug),
+        f.view(
+            "matches",
+            f.finished.slug,
+            setup=lambda: f.get("matches", f.finished.slug),
+            label="matches:cached",
+        ),
+        f.view("match", f.ongoing.slug, f.match.id, user=f.superuser),
+        f.view(
+            "select_participants",
+            f.ongoing.slug,
+            user=f.superuser,
+            method="post",
+            setup=f.open_inscriptions,
+        ),
+        f.view(
+            "settle_round",
+            f.ongoing.slug,
+            user=f.superuser,
+            method="post",
+            setup=f.enter_round_results,
+        ),
+        f.view("round_scores", f.ongoing.slug, user=f.superuser),
+        f.view(
+            "round_scores",
+            f.ongoing.slug,
+            user=f.superuser,
+            method="post",
+            data={
+                f"match_{match_id}_set_{number}_{side}": score
+                for match_id, sets in scores.items()
+                for number, set_scores in enumerate(sets, 1)
+                for side, score in enumerate(set_scores, 1)
+            },
+            label="round_scores:post",
+        ),
+        f.view(
+            "api_round_scores",
+            f.ongoing.slug,
+            user=f.superuser,
+            method="post",
+            data={
+                "matches": [
+                    {"id": match_id, "sets": sets} for match_id, sets in scores.items()
+                ],
+            },
+            content_type="application/json",
+        ),
+        f.view("global_ranking"),
+        f.view(
+            "global_ranking",
+            query="?mi_posicion=1",
+            label="global_ranking:own_page",
+        ),
+        f.view("export_global_ranking", "csv"),
+        f.view("export_standings", f.finished.slug, "ndjson"),
+        f.view("export_history", "csv", user=f.superuser),
+        f.view(
+            "export_history",
+            "csv",
+            user=f.superuser,
+            query="?gzip",
+            label="export_history:gzip",
+        ),
+        f.view("personal_stats"),
+        f.view("history"),
+        f.view("profile"),
+        f.view("api_tournaments"),
+        f.view("api_tournament", f.ongoing.slug),
+        f.view("api_bracket", f.finished.slug),
+        f.view("api_matches", f.finished.slug),
+        f.view("api_standings", f.finished.slug),
+        f.not_modified("api_matches", f.finished.slug),
+        # Domain methods
+        Scenario(
+            "tournament:settle_round",
+            lambda: Tournament.objects.get(pk=f.ongoing.pk).settle_round(),
+            setup=f.enter_round_results,
+        ),
+        Scenario(
+            "tournament:select_participants",
+            lambda: Tournament.objects.get(pk=f.ongoing.pk).select_participants(),
+            setup=f.open_inscriptions,
+        ),
+        Scenario(
+            "tournament:distribute_points",
+            lambda: Tournament.objects.get(pk=f.finished.pk).distribute_points(),
+        ),
+        Scenario(
+            "tournament:round_finished",
+            lambda: Tournament.objects.get(pk=f.ongoing.pk).round_finished,
+        ),
+        Scenario(
+            "user:tournament_stats",
+            lambda: f.user.get_statistics().get_tournament_stats(),
+        ),
+        Scenario(
+            "ranking:refresh_user",
+            lambda: GlobalRanking.objects.refresh(user_ids=[f.user.id]),
+        ),
+    ]
@@ -0,0 +1,201 @@
+import random
+
+MAX_DRAW_SIZE = 1024
+
+# Round key, readable name and title of the players who reach it, by the
+# number of players in the round
+ROUND_NAMES = {
+    2: ("final", "Final", "Finalista"),
+    4: ("semifinal", "Semifinal", "Semifinalista"),
+    8: ("cuartos", "Cuartos de Final", "Cuartofinalista"),
+    16: ("octavos", "Octavos de Final", "Octavofinalista"),
+    32: ("dieciseisavos", "Dieciseisavos de Final", "Dieciseisavofinalista"),
+    64: ("treintaidosavos", "Treintaidosavos de Final", "Treintaidosavofinalista"),
+    128: (
+        "sesentaicuatroavos",
+        "Sesentaicuatroavos de Final",
+        "Sesentaicuatroavofinalista",
+    ),
+}
+
+
+def _round_names(players):
+    """Return the key, readable name and title of a round."""
+    return ROUND_NAMES.get(
+        players,
+        (f"ronda_{players}", f"Ronda de {players}", f"Jugador de ronda de {players}"),
+    )
+
+
+def round_key(players):
+    """Return the key of the round played by the given number of players."""
+    return _round_names(players)[0]
+
+
+def round_label(players):
+    """Return the readable name of the round played by the given players."""
+    return _round_names(players)[1]
+
+
+def round_title(players):
+    """Return the title of a participant who reached the given round."""
+    return _round_names(players)[2]
+
+
+def round_players(key):
+    """Return the number of players in the round with the given key."""
+    for players, names in ROUND_NAMES.items():
+        if names[0] == key:
+            return players
+    prefix, _, players = key.partition("_")
+    if prefix == "ronda" and players.isdigit():
+        return int(players)
+    msg = f"Unknown round: {key}"
+    raise ValueError(msg)
+
+
+def bracket_size(entrants):
+    """Return the smallest power of two holding the given number of entrants."""
+    return max(2, 1 << (entrants - 1).bit_length())
+
+
+def bracket_rounds(size):
+    """Return the round keys of a bracket of the given size, first to final."""
+    return [round_key(size >> index) for index in range(size.bit_length() - 1)]
+
+
+def get_round_choices(max_size=MAX_DRAW_SIZE):
+    """Return the choices for the round of a tournament or match."""
+    return [
+        ("no_comenzado", "No comenzado"),
+        *[(key, round_label(round_players(key))) for key in bracket_rounds(max_size)],
+        ("finalizado", "Finalizado"),
+    ]
+
+
+def count_byes(participants):
+    """Return how many participants advance without playing this round.
+
+    Byes bring the next round down to the largest power of two not above the
+    number of participants, so every later round pairs up evenly.
+    """
+    if participants < 2:  # noqa: PLR2004
+        return participants
+    next_round = 1 << (participants.bit_length() - 1)
+    if next_round == participants:
+        return 0
+    return 2 * next_round - participants
+
+
+def pair_participants(participants, rng=random):
+    """Randomly pair the participants of a round.
+
+    Returns a ``(pairs, byes)`` tuple: the list of ``(participant1,
+    participant2)`` pairs to play and the list of participants that advance
+    without playing.
+    """
+    shuffled = list(participants)
+    rng.shuffle(shuffled)
+
+    byes = count_byes(len(shuffled))
+    playing = shuffled[byes:]
+    pairs = list(zip(playing[::2], playing[1::2], strict=True))
+    return pairs, shuffled[:byes]
+
+
+class Bracket:
+    """Single elimination bracket stored as a heap-indexed array.
+
+    For a bracket of ``size`` entrants, ``nodes`` has ``2 * size`` slots (slot 0
+    is unused). The entrants sit in the leaves ``size .. 2 * size - 1`` and slot
+    ``s`` holds the winner of the match between slots ``2 * s`` and
+    ``2 * s + 1``, so slot 1 holds the champion. A match is identified by the
+    slot its winner moves to: the final is slot 1, the semifinals slots 2 and 3,
+    and a round of ``n`` players uses slots ``n / 2 .. n - 1``.
+    """
+
+    def __init__(self, nodes):
+        """Initialize with the array of participants, None for empty slots."""
+        self.nodes = list(nodes)
+
+    @classmethod
+    def seed(cls, entrants, rng=random):
+        """Place the entrants randomly in a new bracket.
+
+        When the entrants do not fill the bracket, every first round match gets
+        at most one bye.
+        """
+        entrants = list(entrants)
+        size = bracket_size(len(entrants))
+        pairs, byes = pair_participants(entrants, rng=rng)
+        first_round = [*pairs, *((bye, None) for bye in byes)]
+        rng.shuffle(first_round)
+
+        leaves = [entrant for pair in first_round for entrant in pair]
+        return cls([None] * size + leaves + [None] * (size - len(leaves)))
+
+    @property
+    def size(self):
+        """Return the number of entrants the bracket holds."""
+        return len(self.nodes) // 2
+
+    @property
+    def rounds(self):
+        """Return the round keys of the bracket, first to final."""
+        return bracket_rounds(self.size)
+
+    @staticmethod
+    def parent(slot):
+        """Return the slot of the match the winner of ``slot`` plays next."""
+        return slot // 2
+
+    @staticmethod
+    def children(slot):
+        """Return the slots whose winners meet in ``slot``."""
+        return 2 * slot, 2 * slot + 1
+
+    @staticmethod
+    def path_to_final(slot):
+        """Return the slots from ``slot`` up to the final."""
+        return [slot >> depth for depth in range(slot.bit_length())]
+
+    @staticmethod
+    def slot_round(slot):
+        """Return the key of the round the match in ``slot`` belongs to."""
+        return round_key(1 << slot.bit_length())
+
+    @staticmethod
+    def round_slots(key):
+        """Return the match slots of the round with the given key."""
+        players = round_players(key)
+        return range(players // 2, players)
+
+    def pairings(self, key):
+        """Return the matches and byes of a round.
+
+        Returns a ``(matches, byes)`` tuple of ``(slot, participant1,
+        participant2)`` and ``(slot, participant)`` lists. Byes still have to be
+        moved up with :meth:`advance`.
+        """
+        matches = []
+        byes = []
+        for slot in self.round_slots(key):
+            participant1, participant2 = (
+                self.nodes[child] for child in self.children(slot)
+            )
+            if participant1 is not None and participant2 is not None:
+                matches.append((slot, participant1, participant2))
+            elif participant1 is not None:
+                byes.append((slot, participant1))
+            elif participant2 is not None:
+                byes.append((slot, participant2))
+        return matches, byes
+
+    def advance(self, slot, participant):
+        """Move the winner of the match in ``slot`` into it."""
+        self.nodes[slot] = participant
+
+    @property
+    def champion(self):
+        """Return the winner of the final, if played."""
+        return self.nodes[1]
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.safestring import mark_safe
+
+from app.routers import primary_reads
+
+TOURNAMENT_CACHE_TIMEOUT = 60
+TOURNAMENT_CACHE_MAX_ENTRIES = 256
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class LocalCache:
+    """Process-local cache with a time to live and LRU eviction.
+
+    Every entry is stored with the version it was computed for and is only
+    served while that version is still the current one, so invalidation is a
+    matter of bumping the version (see ``bump_tournament_version``).
+    """
+
+    def __init__(self, max_entries, timeout, clock=time.monotonic):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version):
+        """Return the value cached for the key and version, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires, value = entry
+                if entry_version == version and expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, version, value):
+        """Cache the value for the key and version."""
+        with self._lock:
+            self._entries[key] = (version, self.clock() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove the key from the cache."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return the hit, miss and eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+tournament_cache = LocalCache(TOURNAMENT_CACHE_MAX_ENTRIES, TOURNAMENT_CACHE_TIMEOUT)
+# Slug to id lookups, kept apart so they do not count in the cache stats
+tournament_slugs = LocalCache(TOURNAMENT_CACHE_MAX_ENTRIES, TOURNAMENT_CACHE_TIMEOUT)
+
+
+def _version_key(tournament_id):
+    return f"tournament-version:{tournament_id}"
+
+
+def tournament_version(tournament_id):
+    """Return the current version of the tournament's data.
+
+    Versions live in the shared Django cache so every worker process agrees on
+    them. A missing counter starts from the clock, so a counter lost to
+    eviction never goes back to a version some process already cached.
+    """
+    key = _version_key(tournament_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(tournament_id):
+    key = _version_key(tournament_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_tournament_version(tournament_id):
+    """Invalidate everything cached for the tournament.
+
+    The version is bumped right away and again once the current transaction
+    commits, so values cached from data read before the commit are not served.
+    """
+    _bump(tournament_id)
+    transaction.on_commit(lambda: _bump(tournament_id))
+
+
+def cached_fragment(name, tournament_id, render, *variant):
+    """Return a rendered fragment of a tournament page from the shared cache.
+
+    The key holds the tournament's version, so any change to the tournament
+    makes every fragment of it miss. ``render`` is only called on a miss and
+    ``variant`` tells apart fragments that differ between users. Misses are
+    rendered from the primary database, so replica lag is never cached.
+    """
+    version = tournament_version(tournament_id)
+    key = ":".join(
+        ["tournament-fragment", name, str(tournament_id), str(version)]
+        + [str(part) for part in variant],
+    )
+    html = cache.get(key)
+    if html is None:
+        with primary_reads():
+            html = render()
+        cache.set(key, str(html), FRAGMENT_CACHE_TIMEOUT)
+    return mark_safe(html)  # noqa: S308
@@ -0,0 +1,199 @@
+import csv
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from app import models
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+class Export:
+    """Rows of an export, read lazily from a ``values_list`` queryset."""
+
+    def __init__(self, name, header, queryset, transform=None):
+        """Initialize the export."""
+        self.name = name
+        self.header = header
+        self.queryset = queryset
+        self.transform = transform
+
+    def rows(self):
+        """Yield the rows, fetching them from the database in chunks."""
+        rows = self.queryset.iterator(chunk_size=CHUNK_SIZE)
+        if self.transform is None:
+            return rows
+        return map(self.transform, rows)
+
+
+def ranking_export():
+    """Return the export of the global ranking."""
+    return Export(
+        "ranking",
+        [
+            "rank",
+            "username",
+            "first_name",
+            "last_name",
+            "total_score",
+            "tournaments_played",
+            "sets_won",
+            "games_won",
+            "games_lost",
+        ],
+        models.GlobalRanking.objects.order_by("rank").values_list(
+            "rank",
+            "user__username",
+            "user__first_name",
+            "user__last_name",
+            "user__career_stats__total_score",
+            "user__career_stats__tournaments_played",
+            "user__career_stats__total_sets_won",
+            "user__career_stats__total_games_won",
+            "user__career_stats__total_games_lost",
+        ),
+    )
+
+
+def standings_export(tournament):
+    """Return the export of the standings of the tournament."""
+
+    def with_position(row):
+        *values, matches_won = row
+        return (*values, tournament.position(matches_won))
+
+    return Export(
+        f"clasificacion-{tournament.slug}",
+        [
+            "username",
+            "first_name",
+            "last_name",
+            "score",
+            "sets_won",
+            "games_won",
+            "games_lost",
+            "position",
+        ],
+        models.Participant.objects.filter(tournament=tournament)
+        .exclude(status="applied")
+        .order_by("-score", "id")
+        .values_list(
+            "user__username",
+            "user__first_name",
+            "user__last_name",
+            "score",
+            "sets_won",
+            "games_won",
+            "games_lost",
+            "matches_won",
+        ),
+        with_position,
+    )
+
+
+def history_export():
+    """Return the export of every set played, in match order."""
+    return Export(
+        "historial",
+        [
+            "tournament",
+            "round",
+            "match",
+            "date",
+            "player1",
+            "player2",
+            "set",
+            "player1_games",
+            "player2_games",
+            "winner",
+        ],
+        # ordered like the (match, set_number) unique index, so no sort is needed
+        models.Set.objects.order_by("match_id", "set_number").values_list(
+            "match__tournament__slug",
+            "match__round",
+            "match_id",
+            "match__date",
+            "match__participant1__user__username",
+            "match__participant2__user__username",
+            "set_number",
+            "participant1_score",
+            "participant2_score",
+            "match__winner__user__username",
+        ),
+    )
+
+
+class Echo:
+    """File-like object that returns what is written instead of storing it."""
+
+    def write(self, value):
+        """Return the value."""
+        return value
+
+
+def csv_lines(export):
+    """Yield the export as CSV lines, header first."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(export.header)
+    for row in export.rows():
+        yield writer.writerow(row)
+
+
+def ndjson_lines(export):
+    """Yield the export as one JSON object per line."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in export.rows():
+        yield encoder.encode(dict(zip(export.header, row, strict=True))) + "\n"
+
+
+def stream(export, export_format, compress=False):
+    """Yield the export encoded in UTF-8, optionally gzipped.
+
+    Lines are joined into blocks of about ``BUFFER_SIZE`` bytes, so a large
+    export is sent in a few thousand writes instead of one per row.
+    """
+    lines = csv_lines(export) if export_format == "csv" else ndjson_lines(export)
+    compressor = zlib.compressobj(wbits=31) if compress else None  # gzip header
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= BUFFER_SIZE:
+            block = "".join(buffer).encode()
+            buffer = []
+            size = 0
+            if compressor is None:
+                yield block
+            elif compressed := compressor.compress(block):
+                yield compressed
+    block = "".join(buffer).encode()
+    if compressor is None:
+        if block:
+            yield block
+    else:
+        yield compressor.compress(block) + compressor.flush()
+
+
+async def aiterate(blocks):
+    """Yield the blocks of a sync stream without reading it all first.
+
+    Under ASGI a sync iterator would be consumed whole before sending, so each
+    block is read in the thread that holds the database connection instead.
+    """
+    end = object()
+    next_block = sync_to_async(next)
+    while (block := await next_block(blocks, end)) is not end:
+        yield block
+
+
+def filename(export, export_format, compress=False):
+    """Return the download file name of the export."""
+    name = f"{export.name}.{export_format}"
+    return f"{name}.gz" if compress else name
@@ -1,10 +1,12 @@
+import functools
+
 from django import forms
 from django.contrib.auth import get_user_model, password_validation
 from django.contrib.auth.forms import UserChangeForm, UserCreationForm
 from django.forms import modelformset_factory
 from phonenumber_field.formfields import PhoneNumberField
 
-from app.models import Set
+from app.models import MAX_SETS, Set
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -80,37 +82,96 @@ class UserProfileForm(UserChangeForm):
         return user
 
 
+def player_name(participant):
+    """Return the full name of a participant."""
+    return f"{participant.user.first_name} {participant.user.last_name}"
+
+
+class SetForm(forms.ModelForm):
+    """Form for individual sets in a match."""
+
+    class Meta:
+        """Meta class."""
+
+        model = Set
+        fields = ["match", "set_number", "participant1_score", "participant2_score"]
+        widgets = {
+            "match": forms.HiddenInput(),
+            "set_number": forms.TextInput(attrs={"readonly": True, "hidden": True}),
+            "participant1_score": forms.NumberInput(attrs={"required": False}),
+            "participant2_score": forms.NumberInput(attrs={"required": False}),
+        }
+
+    def __init__(self, *args, players=(), **kwargs):
+        """Initialize the form, labelling the scores with the players' names."""
+        super().__init__(*args, **kwargs)
+        for field, player in zip(
+            ["participant1_score", "participant2_score"],
+            players,
+            strict=False,
+        ):
+            self.fields[field].label = f"Puntuación de {player}"
+
+
+@functools.cache
+def set_formset_class(extra):
+    """Return the set formset class with ``extra`` empty forms, built once."""
+    return modelformset_factory(Set, form=SetForm, extra=extra)
+
+
 def create_set_formset(match):
-    """Create a formset for match sets."""
-
-    class SetForm(forms.ModelForm):
-        """Form for individual sets in a match."""
-
-        class Meta:
-            model = Set
-            fields = ["match", "set_number", "participant1_score", "participant2_score"]
-            labels = {
-                "participant1_score": (
-                    f"Puntuación de {match.participant1.user.first_name} "
-                    f"{match.participant1.user.last_name}"
-                ),
-                "participant2_score": (
-                    f"Puntuación de {match.participant2.user.first_name} "
-                    f"{match.participant2.user.last_name}"
-                ),
-            }
-            widgets = {
-                "match": forms.HiddenInput(),
-                "set_number": forms.TextInput(attrs={"readonly": True, "hidden": True}),
-                "participant1_score": forms.NumberInput(attrs={"required": False}),
-                "participant2_score": forms.NumberInput(attrs={"required": False}),
-            }
-
-    match_sets = Set.objects.filter(match=match)
-    extra = 0 if match_sets.exists() else 5
-
-    return modelformset_factory(
-        Set,
-        form=SetForm,
-        extra=extra,
+    """Create a formset for match sets.
+
+    The formset class is shared between requests, only the players' names
+    used as labels are bound to it.
+    """
+    extra = 0 if match.set_set.exists() else MAX_SETS
+    return functools.partial(
+        set_formset_class(extra),
+        form_kwargs={
+            "players": [
+                player_name(match.participant1),
+                player_name(match.participant2),
+            ],
+        },
     )
+
+
+class RoundScoresForm(forms.Form):
+    """Form for the set scores of every match of a round."""
+
+    def __init__(self, matches, *args, **kwargs):
+        """Add two score fields per set of each match, filled with its sets."""
+        super().__init__(*args, **kwargs)
+        self.matches = list(matches)
+        for match in self.matches:
+            sets = {set_.set_number: set_ for set_ in match.set_set.all()}
+            match.score_fields = []
+            for number in range(1, MAX_SETS + 1):
+                set_ = sets.get(number)
+                names = []
+                for side in (1, 2):
+                    name = f"match_{match.id}_set_{number}_{side}"
+                    self.fields[name] = forms.IntegerField(
+                        min_value=0,
+                        required=False,
+                        initial=getattr(set_, f"participant{side}_score", None),
+                        widget=forms.NumberInput(attrs={"class": "w-16"}),
+                    )
+                    names.append(name)
+                match.score_fields.append(
+                    (number, self[names[0]], self[names[1]]),
+                )
+
+    def scores(self):
+        """Return the cleaned scores, as taken by ``Tournament.enter_round_scores``."""
+        return {
+            match.id: [
+                (
+                    self.cleaned_data[f"match_{match.id}_set_{number}_1"],
+                    self.cleaned_data[f"match_{match.id}_set_{number}_2"],
+                )
+                for number in range(1, MAX_SETS + 1)
+            ]
+            for match in self.matches
+        }
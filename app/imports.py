@@ -0,0 +1,240 @@
+import csv
+import gzip
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from app.cache import bump_tournament_version
+from app.models import MAX_SETS, Match, Participant, Set
+
+COLUMNS = [
+    "tournament",
+    "round",
+    "player1",
+    "player2",
+    "set",
+    "player1_games",
+    "player2_games",
+]
+LOOKUP_CHUNK_SIZE = 5000
+
+
+class RowError(ValueError):
+    """A row of the results file that cannot be imported."""
+
+
+@contextmanager
+def open_results(path):
+    """Open a results CSV file, gzipped if its name ends in ``.gz``."""
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as file:
+        yield file
+
+
+class ResultImporter:
+    """Import set scores from the rows of a results CSV file.
+
+    The columns are the ones of the history export: tournament slug, round,
+    both players' usernames, set number and games of each player, so the
+    current round of an export can be imported back. Only matches of the
+    current round of unfinished tournaments take results, as nothing settles
+    earlier rounds again. The file is read twice: first for the tournaments it
+    names, whose participants and matches are then resolved from lookups
+    built with one query each, and then for the sets, which are upserted with
+    batched ``bulk_create``. Invalid rows are recorded in ``errors`` and skipped.
+    ``progress`` is called with the number of rows read after every batch.
+    """
+
+    def __init__(self, batch_size=5000, progress=None):
+        """Initialize the importer."""
+        self.batch_size = batch_size
+        self.progress = progress
+        self.counts = Counter()
+        self.errors = []
+        self.match_ids = set()
+        self.tournament_ids = set()
+        self._batch = {}
+
+    @staticmethod
+    def load_participants(slugs):
+        """Return the participant ids of the tournaments by slug and username."""
+        return {
+            (slug, username): participant_id
+            for participant_id, slug, username in Participant.objects.filter(
+                tournament__slug__in=slugs,
+            )
+            .values_list(
+                "id",
+                "tournament__slug",
+                "user__username",
+            )
+            .iterator(chunk_size=LOOKUP_CHUNK_SIZE)
+        }
+
+    @staticmethod
+    def load_matches(slugs):
+        """Return the id, round and current round of the tournaments' matches.
+
+        The matches are keyed by their players and also carry their tournament.
+        """
+        return {
+            (participant1_id, participant2_id): (
+                match_id,
+                tournament_id,
+                round_,
+                current_round,
+            )
+            for (
+                match_id,
+                tournament_id,
+                round_,
+                current_round,
+                participant1_id,
+                participant2_id,
+            ) in Match.objects.filter(tournament__slug__in=slugs)
+            .values_list(
+                "id",
+                "tournament_id",
+                "round",
+                "tournament__current_round",
+                "participant1_id",
+                "participant2_id",
+            )
+            .iterator(chunk_size=LOOKUP_CHUNK_SIZE)
+        }
+
+    @staticmethod
+    def reader(file):
+        """Return a reader of the rows of the file, checking its columns."""
+        reader = csv.DictReader(file)
+        missing = [
+            column for column in COLUMNS if column not in (reader.fieldnames or [])
+        ]
+        if missing:
+            msg = f"Missing columns: {', '.join(missing)}."
+            raise RowError(msg)
+        return reader
+
+    def run(self, file):
+        """Import the rows of the CSV file and return the counts."""
+        slugs = {row["tournament"] for row in self.reader(file)}
+        participants = self.load_participants(slugs)
+        matches = self.load_matches(slugs)
+        file.seek(0)
+        reader = self.reader(file)
+        with transaction.atomic():
+            for row in reader:
+                self.counts["rows"] += 1
+                try:
+                    set_ = self.parse(row, participants, matches)
+                except RowError as error:
+                    self.errors.append((reader.line_num, str(error)))
+                else:
+                    self._batch[set_.match_id, set_.set_number] = set_
+                if len(self._batch) >= self.batch_size:
+                    self.flush()
+            self.flush()
+            self.refresh()
+        return self.counts
+
+    def parse(self, row, participants, matches):
+        """Return the unsaved set of a row, raising ``RowError`` if invalid."""
+        slug = row["tournament"]
+        participant_ids = []
+        for column in ("player1", "player2"):
+            participant_id = participants.get((slug, row[column]))
+            if participant_id is None:
+                msg = f"{row[column]!r} does not play in tournament {slug!r}."
+                raise RowError(msg)
+            participant_ids.append(participant_id)
+
+        scores = [
+            self.parse_score(row, column)
+            for column in ("player1_games", "player2_games")
+        ]
+        match = matches.get(tuple(participant_ids))
+        if match is None:
+            # The sheet may list the players the other way round
+            match = matches.get(tuple(reversed(participant_ids)))
+            scores.reverse()
+        if match is None:
+            msg = f"{row['player1']} and {row['player2']} have no match in {slug!r}."
+            raise RowError(msg)
+        match_id, tournament_id, round_, current_round = match
+        self.check_round(row, round_, current_round)
+
+        try:
+            set_number = int(row["set"])
+        except (TypeError, ValueError):
+            set_number = 0
+        if not 1 <= set_number <= MAX_SETS:
+            msg = f"Invalid set number {row['set']!r}."
+            raise RowError(msg)
+        if (scores[0] is None) != (scores[1] is None):
+            msg = "Only one player has a score."
+            raise RowError(msg)
+
+        self.match_ids.add(match_id)
+        self.tournament_ids.add(tournament_id)
+        return Set(
+            match_id=match_id,
+            set_number=set_number,
+            participant1_score=scores[0],
+            participant2_score=scores[1],
+        )
+
+    @staticmethod
+    def check_round(row, round_, current_round):
+        """Raise ``RowError`` unless the match of the row can take results."""
+        slug = row["tournament"]
+        if round_ != row["round"]:
+            msg = f"The match of {row['player1']} and {row['player2']} is in {round_}."
+            raise RowError(msg)
+        if current_round == "finalizado":
+            msg = f"Tournament {slug!r} is finished."
+            raise RowError(msg)
+        if round_ != current_round:
+            msg = f"The {round_} of {slug!r} is settled, it plays {current_round}."
+            raise RowError(msg)
+
+    @staticmethod
+    def parse_score(row, column):
+        """Return the games in the column, None if empty."""
+        value = (row[column] or "").strip()
+        if not value:
+            return None
+        if not value.isdigit():
+            msg = f"Invalid {column} {value!r}."
+            raise RowError(msg)
+        return int(value)
+
+    def flush(self):
+        """Write the pending sets, replacing the scores of existing ones."""
+        if not self._batch:
+            return
+        Set.objects.bulk_create(
+            self._batch.values(),
+            update_conflicts=True,
+            unique_fields=["match", "set_number"],
+            update_fields=["participant1_score", "participant2_score"],
+        )
+        self.counts["sets"] += len(self._batch)
+        self._batch = {}
+        if self.progress is not None:
+            self.progress(self.counts["rows"])
+
+    def refresh(self):
+        """Recompute the results of the imported matches.
+
+        Bulk writes skip the signals that keep them up to date, as well as the
+        invalidation of the tournaments' cached data.
+        """
+        match_ids = sorted(self.match_ids)
+        for start in range(0, len(match_ids), self.batch_size):
+            Match.objects.filter(
+                id__in=match_ids[start : start + self.batch_size],
+            ).refresh_results()
+        for tournament_id in self.tournament_ids:
+            bump_tournament_version(tournament_id)
+        self.counts["matches"] = len(match_ids)
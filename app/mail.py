@@ -0,0 +1,140 @@
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from app.models import OutboxEmail
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Email backend that stores the messages in the outbox instead of sending them.
+
+    Requests only pay for an INSERT, the ``send_outbox`` worker delivers the
+    emails through ``OUTBOX_BACKEND``.
+    """
+
+    def send_messages(self, email_messages):
+        """Store the messages in the outbox and return how many were stored."""
+        emails = [
+            OutboxEmail.from_message(message)
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutboxEmail.objects.bulk_create(emails)
+        return len(emails)
+
+
+def retry_delay(attempts):
+    """Return the seconds to wait before retrying after ``attempts`` failures."""
+    return min(
+        settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.OUTBOX_MAX_RETRY_DELAY,
+    )
+
+
+class OutboxSender:
+    """Deliver the outbox emails from a pool of threads.
+
+    Every thread keeps its own connection to ``OUTBOX_BACKEND`` open between
+    emails, so an SMTP server only does the handshake once per thread. Failed
+    emails are retried with exponential backoff until ``OUTBOX_MAX_ATTEMPTS``.
+    The content of sent emails is cleared, as some carry passwords. Only the
+    calling thread touches the database.
+    """
+
+    def __init__(self, threads, batch_size=100, backend=None):
+        """Initialize the sender."""
+        self.threads = threads
+        self.batch_size = batch_size
+        self.backend = backend or settings.OUTBOX_BACKEND
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=threads)
+
+    def __enter__(self):
+        """Return the sender."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the threads and close their connections."""
+        self.close()
+
+    def close(self):
+        """Stop the threads and close their connections."""
+        self._executor.shutdown()
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+
+    def connection(self):
+        """Return the open connection of the current thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = get_connection(self.backend, fail_silently=False)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        # Opened here so send_messages does not close it after each email
+        connection.open()
+        return connection
+
+    def deliver(self, email):
+        """Send one email, returning the error or None."""
+        try:
+            self.connection().send_messages([email.to_message()])
+        except Exception as error:  # noqa: BLE001
+            # The connection may be broken, the next email reopens it
+            connection = getattr(self._local, "connection", None)
+            if connection is not None:
+                connection.close()
+            return error
+        return None
+
+    def send_batch(self):
+        """Claim and deliver a batch of due emails, returning the counts."""
+        emails = OutboxEmail.objects.claim(
+            self.batch_size,
+            settings.OUTBOX_CLAIM_SECONDS,
+        )
+        errors = list(self._executor.map(self.deliver, emails))
+        now = timezone.now()
+        counts = {"sent": 0, "retried": 0, "failed": 0}
+        for email, error in zip(emails, errors, strict=True):
+            email.attempts += 1
+            email.claim = None
+            if error is None:
+                email.status = OutboxEmail.Status.SENT
+                email.sent_at = now
+                email.last_error = ""
+                email.body = ""
+                email.alternatives = []
+                counts["sent"] += 1
+                continue
+            email.last_error = f"{type(error).__name__}: {error}"
+            if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                email.status = OutboxEmail.Status.FAILED
+                counts["failed"] += 1
+            else:
+                email.next_attempt_at = now + datetime.timedelta(
+                    seconds=retry_delay(email.attempts),
+                )
+                counts["retried"] += 1
+        OutboxEmail.objects.bulk_update(
+            emails,
+            [
+                "status",
+                "attempts",
+                "claim",
+                "next_attempt_at",
+                "last_error",
+                "sent_at",
+                "body",
+                "alternatives",
+            ],
+        )
+        return counts
@@ -0,0 +1,132 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from app.benchmarks.runner import compare, load_budgets, measure, write_budgets
+from app.benchmarks.scenarios import Fixtures, get_scenarios
+from app.seeding import seed_club
+
+BUDGETS_PATH = Path(__file__).resolve().parents[2] / "benchmarks" / "budgets.json"
+# About a million sets, in 400 tournaments of the largest draw
+DEFAULT_DATASET = {
+    "users": 20000,
+    "tournaments": 400,
+    "draw_size": 1024,
+    "unfinished": 5,
+    "seed": 0,
+}
+DEFAULT_TOLERANCE = 0.5
+
+
+class Command(BaseCommand):
+    """Check query counts and latency of the views against the budgets."""
+
+    help = (
+        "Seed a synthetic club in a test database, measure the query count and "
+        "wall time of every view and the main domain methods, and compare them "
+        "with the committed budgets."
+    )
+
+    def add_arguments(self, parser):
+        """Add the dataset, budget and tolerance options."""
+        for option, value in DEFAULT_DATASET.items():
+            parser.add_argument(
+                f"--{option.replace('_', '-')}",
+                type=int,
+                help=f"Dataset {option} (budget file value or {value}).",
+            )
+        parser.add_argument("--budgets", default=BUDGETS_PATH, type=Path)
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            help="Allowed slowdown as a fraction of the budget time.",
+        )
+        parser.add_argument(
+            "--query-tolerance",
+            type=int,
+            default=0,
+            help="Allowed number of queries over the budget.",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--only", help="Only run scenarios containing this.")
+        parser.add_argument(
+            "--write",
+            action="store_true",
+            help="Store the measurements as the new budgets.",
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        """Run the suite."""
+        saved = load_budgets(options["budgets"])
+        dataset = {
+            option: (
+                options[option]
+                if options[option] is not None
+                else saved.get("dataset", DEFAULT_DATASET)[option]
+            )
+            for option in DEFAULT_DATASET
+        }
+        tolerance = options["tolerance"]
+        if tolerance is None:
+            tolerance = saved.get("tolerance", DEFAULT_TOLERANCE)
+
+        rows, results = self.run_suite(dataset, options["repeat"], options["only"])
+
+        if options["write"]:
+            write_budgets(options["budgets"], dataset, rows, tolerance, results)
+            self.stdout.write(
+                self.style.SUCCESS(f"Budgets written to {options['budgets']}"),
+            )
+            return
+
+        if saved and saved.get("dataset") != dataset:
+            self.stderr.write(
+                self.style.WARNING("The dataset differs from the budgeted one."),
+            )
+        violations, missing = compare(
+            results,
+            saved.get("budgets", {}),
+            tolerance,
+            options["query_tolerance"],
+        )
+        for name in missing:
+            self.stderr.write(self.style.WARNING(f"{name}: no budget"))
+        if violations:
+            raise CommandError("Over budget:\n" + "\n".join(violations))
+        self.stdout.write(self.style.SUCCESS("All scenarios within budget."))
+
+    def run_suite(self, dataset, repeat, only):
+        """Seed a test database and return its row counts and measurements."""
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self.stdout.write(f"Seeding {dataset}...")
+            rows = seed_club(
+                dataset["users"],
+                dataset["tournaments"],
+                draw_size=dataset["draw_size"],
+                unfinished=max(dataset["unfinished"], 1),
+                seed=dataset["seed"],
+            )
+            fixtures = Fixtures(Client())
+
+            results = {}
+            for scenario in get_scenarios(fixtures):
+                if only and only not in scenario.name:
+                    continue
+                results[scenario.name] = measure(scenario, repeat)
+                self.stdout.write(
+                    f"{scenario.name:<40} {results[scenario.name]['queries']:>5} "
+                    f"queries {results[scenario.name]['seconds'] * 1000:>9.1f} ms",
+                )
+            return dict(rows), results
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
@@ -0,0 +1,65 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from app.benchmarks.handlers import run_asgi, run_wsgi
+from app.benchmarks.runner import file_test_database
+from app.benchmarks.scenarios import Fixtures
+from app.seeding import seed_club
+
+
+class Command(BaseCommand):
+    """Compare the throughput of the read views under WSGI and ASGI."""
+
+    help = (
+        "Seed a synthetic club in a test database and serve concurrent requests "
+        "to the read-only views through the sync (WSGI) and async (ASGI) "
+        "request handlers, reporting requests per second and p95 latency."
+    )
+
+    def add_arguments(self, parser):
+        """Add the dataset and load options."""
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--tournaments", type=int, default=100)
+        parser.add_argument("--draw-size", type=int, default=32)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--only", help="Only run views containing this.")
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        """Run the benchmark."""
+        with file_test_database():
+            seed_club(
+                options["users"],
+                options["tournaments"],
+                draw_size=options["draw_size"],
+                unfinished=1,
+                seed=options["seed"],
+            )
+            fixtures = Fixtures(Client())
+            paths = {
+                "home": reverse("home"),
+                "standings": reverse("standings", args=[fixtures.finished.slug]),
+                "matches": reverse("matches", args=[fixtures.finished.slug]),
+                "global_ranking": reverse("global_ranking"),
+                "history": reverse("history"),
+                "personal_stats": reverse("personal_stats"),
+            }
+
+            self.stdout.write(
+                f"{'view':<16} {'wsgi req/s':>11} {'p95 ms':>8} "
+                f"{'asgi req/s':>11} {'p95 ms':>8}",
+            )
+            for name, path in paths.items():
+                if options["only"] and options["only"] not in name:
+                    continue
+                load = (fixtures.user, options["concurrency"], options["requests"])
+                wsgi = run_wsgi(path, *load)
+                asgi = asyncio.run(run_asgi(path, *load))
+                self.stdout.write(
+                    f"{name:<16} {wsgi['per_second']:>11} {wsgi['p95_ms']!s:>8} "
+                    f"{asgi['per_second']:>11} {asgi['p95_ms']!s:>8}",
+                )
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.benchmarks.concurrency import run_workload
+from app.benchmarks.runner import file_test_database
+from app.seeding import seed_club
+
+PROFILES = {
+    "development": {
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": False,
+        "OPTIONS": {},
+    },
+    "production": settings.SQLITE_PRODUCTION,
+}
+
+
+class Command(BaseCommand):
+    """Compare reader throughput during writes across the SQLite profiles."""
+
+    help = (
+        "Seed a synthetic club in a file test database for each database "
+        "profile and measure how many reads go through while score entry "
+        "writes run in parallel."
+    )
+
+    def add_arguments(self, parser):
+        """Add the dataset and workload options."""
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--tournaments", type=int, default=40)
+        parser.add_argument("--draw-size", type=int, default=32)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=1)
+        parser.add_argument("--duration", type=float, default=10)
+        parser.add_argument(
+            "--profile",
+            choices=PROFILES,
+            action="append",
+            help="Profile to measure, every profile by default.",
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        """Run the workload on every profile."""
+        results = {}
+        for profile in options["profile"] or PROFILES:
+            self.stdout.write(f"Measuring the {profile} profile...")
+            results[profile] = self.run_profile(PROFILES[profile], options)
+
+        self.stdout.write(
+            f"{'profile':<12} {'reads/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'errors':>7} {'writes/s':>9} {'p95 ms':>8} {'errors':>7}",
+        )
+        for profile, result in results.items():
+            reads, writes = result["reads"], result["writes"]
+            self.stdout.write(
+                f"{profile:<12} {reads['per_second']:>8} {reads['p50_ms']!s:>8} "
+                f"{reads['p95_ms']!s:>8} {reads['errors']:>7} "
+                f"{writes['per_second']:>9} {writes['p95_ms']!s:>8} "
+                f"{writes['errors']:>7}",
+            )
+
+    def run_profile(self, profile, options):
+        """Seed a file database with the profile and run the workload on it."""
+        with file_test_database(**profile):
+            seed_club(
+                options["users"],
+                options["tournaments"],
+                draw_size=options["draw_size"],
+            )
+            return run_workload(
+                options["readers"],
+                options["writers"],
+                options["duration"],
+            )
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app import exports
+from app.models import Tournament
+
+
+class Command(BaseCommand):
+    """Export the global ranking, a tournament's standings or the match history."""
+
+    help = (
+        "Stream the global ranking, the standings of a tournament or the full "
+        "match and set history into a CSV or NDJSON file, optionally gzipped, "
+        "without loading the rows in memory."
+    )
+
+    def add_arguments(self, parser):
+        """Add the export options."""
+        parser.add_argument("dataset", choices=["ranking", "standings", "history"])
+        parser.add_argument("output", type=Path)
+        parser.add_argument("--tournament", help="Slug of the standings tournament.")
+        parser.add_argument("--format", choices=exports.EXPORT_FORMATS, default="csv")
+        parser.add_argument("--gzip", action="store_true")
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        """Write the export."""
+        export = self.get_export(options["dataset"], options["tournament"])
+        with options["output"].open("wb") as output:
+            for block in exports.stream(
+                export,
+                options["format"],
+                compress=options["gzip"],
+            ):
+                output.write(block)
+        self.stdout.write(self.style.SUCCESS(f"Exported to {options['output']}."))
+
+    @staticmethod
+    def get_export(dataset, slug):
+        """Return the export of the dataset."""
+        if dataset == "ranking":
+            return exports.ranking_export()
+        if dataset == "history":
+            return exports.history_export()
+        if slug is None:
+            msg = "The standings export needs --tournament."
+            raise CommandError(msg)
+        try:
+            return exports.standings_export(Tournament.objects.get(slug=slug))
+        except Tournament.DoesNotExist:
+            msg = f"No tournament with slug {slug}."
+            raise CommandError(msg) from None
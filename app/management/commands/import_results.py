@@ -0,0 +1,68 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from app.imports import ResultImporter, RowError, open_results
+
+PROGRESS_INTERVAL = 1
+
+
+class Command(BaseCommand):
+    """Import set scores from a results CSV file."""
+
+    help = (
+        "Stream a CSV of tournament, round, players and set scores (the columns "
+        "of the history export, optionally gzipped) into the matches. Runs as a "
+        "dry run that rolls everything back unless --commit is given, and "
+        "reports the rows that cannot be imported."
+    )
+
+    def add_arguments(self, parser):
+        """Add the import options."""
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--commit",
+            action="store_true",
+            help="Save the results, instead of only checking them.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        """Import the results."""
+        importer = ResultImporter(
+            batch_size=options["batch_size"],
+            progress=self.progress,
+        )
+        self.started = self.reported = time.perf_counter()
+        try:
+            with transaction.atomic(), open_results(options["path"]) as file:
+                counts = importer.run(file)
+                transaction.set_rollback(not options["commit"])
+        except (OSError, RowError) as error:
+            raise CommandError(error) from error
+        elapsed = time.perf_counter() - self.started
+
+        for line, message in importer.errors:
+            self.stderr.write(f"Line {line}: {message}")
+        verb = "Imported" if options["commit"] else "Dry run, would import"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {counts['sets']:,} sets of {counts['matches']:,} matches "
+                f"from {counts['rows']:,} rows in {elapsed:.1f} s "
+                f"({counts['rows'] / elapsed:,.0f} rows/s), "
+                f"{len(importer.errors):,} rows with errors.",
+            ),
+        )
+
+    def progress(self, rows):
+        """Report the rows read so far, at most once per interval."""
+        now = time.perf_counter()
+        if now - self.reported < PROGRESS_INTERVAL:
+            return
+        self.reported = now
+        elapsed = now - self.started
+        self.stdout.write(
+            f"{elapsed:6.1f} s  {rows:,} rows ({rows / elapsed:,.0f} rows/s)",
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from app.models import GlobalRanking
+
+
+class Command(BaseCommand):
+    """Rebuild the global ranking table from scratch."""
+
+    help = "Recompute every user's totals and rank in the global ranking."
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        """Rebuild the ranking."""
+        GlobalRanking.objects.refresh()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Global ranking rebuilt with {GlobalRanking.objects.count()} users.",
+            ),
+        )
@@ -0,0 +1,70 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from app.seeding import seed_club
+
+PROGRESS_INTERVAL = 1
+
+
+class Command(BaseCommand):
+    """Generate a synthetic club to develop and benchmark against."""
+
+    help = (
+        "Create users, tournaments of any draw size, matches and set scores "
+        "from a deterministic seed, reporting rows per second while it runs."
+    )
+
+    def add_arguments(self, parser):
+        """Add the dataset options."""
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--tournaments", type=int, default=50)
+        parser.add_argument("--draw-size", type=int, default=16)
+        parser.add_argument(
+            "--unfinished",
+            type=int,
+            default=0,
+            help="Number of tournaments left in progress.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        """Seed the club."""
+        self.rows = Counter()
+        self.started = self.reported = time.perf_counter()
+        counts = seed_club(
+            options["users"],
+            options["tournaments"],
+            draw_size=options["draw_size"],
+            unfinished=options["unfinished"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            progress=self.progress,
+        )
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {self.format_rows(counts)} in {elapsed:.1f} s "
+                f"({counts.total() / elapsed:,.0f} rows/s).",
+            ),
+        )
+
+    def progress(self, model, rows):
+        """Report the rows written so far, at most once per interval."""
+        self.rows[model.__name__] += rows
+        now = time.perf_counter()
+        if now - self.reported < PROGRESS_INTERVAL:
+            return
+        self.reported = now
+        elapsed = now - self.started
+        self.stdout.write(
+            f"{elapsed:6.1f} s  {self.format_rows(self.rows)} "
+            f"({self.rows.total() / elapsed:,.0f} rows/s)",
+        )
+
+    @staticmethod
+    def format_rows(counts):
+        """Return the row counts as a readable list."""
+        return ", ".join(f"{rows:,} {name}" for name, rows in counts.items())
@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.mail import OutboxSender
+
+
+class Command(BaseCommand):
+    """Deliver the emails waiting in the outbox."""
+
+    help = (
+        "Drain the email outbox through OUTBOX_BACKEND from a pool of threads "
+        "that reuse their connection, retrying failed emails with exponential "
+        "backoff. Keeps polling for new emails unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        """Add the worker options."""
+        parser.add_argument("--threads", type=int, default=settings.OUTBOX_THREADS)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Seconds to wait when no email is due.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no email is due.",
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        """Run the worker."""
+        with OutboxSender(
+            options["threads"],
+            batch_size=options["batch_size"],
+        ) as sender:
+            while True:
+                counts = sender.send_batch()
+                if any(counts.values()):
+                    self.stdout.write(
+                        f"{counts['sent']} sent, {counts['retried']} to retry, "
+                        f"{counts['failed']} failed",
+                    )
+                elif options["once"]:
+                    break
+                else:
+                    time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("Outbox drained."))
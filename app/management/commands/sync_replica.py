@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from app.routers import PRIMARY_DATABASE
+
+
+class Command(BaseCommand):
+    """Copy the primary SQLite database into the replica."""
+
+    help = (
+        "Copy the primary database into the replica with the SQLite backup API, "
+        "to stand in for replication when trying the replica locally."
+    )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        """Copy the database."""
+        if not settings.REPLICA_DATABASE:
+            msg = "No replica configured, set DATABASE_REPLICA."
+            raise CommandError(msg)
+
+        primary = connections[PRIMARY_DATABASE]
+        replica = connections[settings.REPLICA_DATABASE]
+        primary.ensure_connection()
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Copied {primary.settings_dict['NAME']} "
+                f"into {replica.settings_dict['NAME']}.",
+            ),
+        )
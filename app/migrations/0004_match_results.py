@@ -0,0 +1,62 @@
+# Generated by Django 5.1.3 on 2026-10-18 10:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_match_results(apps, schema_editor):
+    Match = apps.get_model("app", "Match")
+    Set = apps.get_model("app", "Set")
+
+    set_wins = {}
+    for match_id, score1, score2 in Set.objects.values_list(
+        "match_id", "participant1_score", "participant2_score"
+    ):
+        wins = set_wins.setdefault(match_id, [0, 0])
+        if score1 is None or score2 is None:
+            continue
+        if score1 > score2:
+            wins[0] += 1
+        elif score2 > score1:
+            wins[1] += 1
+
+    matches = list(Match.objects.filter(id__in=set_wins))
+    for match in matches:
+        wins1, wins2 = set_wins[match.id]
+        match.participant1_set_wins = wins1
+        match.participant2_set_wins = wins2
+        if wins1 > wins2:
+            match.winner_id = match.participant1_id
+        elif wins2 > wins1:
+            match.winner_id = match.participant2_id
+    Match.objects.bulk_update(
+        matches,
+        ["participant1_set_wins", "participant2_set_wins", "winner"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_alter_participant_games_lost_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='participant1_set_wins',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='participant2_set_wins',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='winner',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='won_matches', to='app.participant'),
+        ),
+        migrations.RunPython(backfill_match_results, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.3 on 2026-10-18 10:26
+
+import app.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Sum
+
+
+def populate_global_ranking(apps, schema_editor):
+    Participant = apps.get_model("app", "Participant")
+    GlobalRanking = apps.get_model("app", "GlobalRanking")
+
+    totals = (
+        Participant.objects.filter(tournament__current_round="finalizado")
+        .exclude(status="applied")
+        .order_by()
+        .values("user_id")
+        .annotate(
+            total_sets_won=Sum("sets_won"),
+            total_games_won=Sum("games_won"),
+            total_games_lost=Sum("games_lost"),
+        )
+    )
+    GlobalRanking.objects.bulk_create(
+        (GlobalRanking(**total) for total in totals),
+        batch_size=500,
+    )
+
+    rankings = list(
+        GlobalRanking.objects.order_by(
+            F("total_sets_won").desc(),
+            F("total_games_won").desc(),
+            F("total_games_lost").asc(),
+            "tiebreaker",
+        ).only("user_id"),
+    )
+    for rank, ranking in enumerate(rankings, 1):
+        ranking.rank = rank
+    GlobalRanking.objects.bulk_update(rankings, ["rank"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_match_results'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GlobalRanking',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='global_ranking', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_sets_won', models.PositiveIntegerField(default=0)),
+                ('total_games_won', models.PositiveIntegerField(default=0)),
+                ('total_games_lost', models.PositiveIntegerField(default=0)),
+                ('tiebreaker', models.FloatField(default=app.models.random_tiebreaker)),
+                ('rank', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['rank'],
+                'indexes': [models.Index(fields=['rank'], name='app_globalr_rank_556d59_idx'), models.Index(fields=['-total_sets_won', '-total_games_won', 'total_games_lost', 'tiebreaker'], name='globalranking_order_idx')],
+            },
+        ),
+        migrations.RunPython(populate_global_ranking, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.3 on 2026-10-18 10:28
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def populate_score_ranks(apps, schema_editor):
+    Participant = apps.get_model("app", "Participant")
+    GlobalRanking = apps.get_model("app", "GlobalRanking")
+
+    scores = dict(
+        Participant.objects.filter(tournament__current_round="finalizado")
+        .exclude(status="applied")
+        .order_by()
+        .values("user_id")
+        .annotate(total_score=Sum("score"))
+        .values_list("user_id", "total_score"),
+    )
+    score_ranks = {
+        score: score_rank
+        for score_rank, score in enumerate(
+            sorted(set(scores.values()), reverse=True),
+            1,
+        )
+    }
+    rankings = list(GlobalRanking.objects.only("user_id"))
+    for ranking in rankings:
+        ranking.total_score = scores.get(ranking.user_id, 0)
+        ranking.score_rank = score_ranks.get(ranking.total_score, 0)
+    GlobalRanking.objects.bulk_update(
+        rankings,
+        ["total_score", "score_rank"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_global_ranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='globalranking',
+            name='score_rank',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='globalranking',
+            name='total_score',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='globalranking',
+            index=models.Index(fields=['score_rank'], name='app_globalr_score_r_1f9d39_idx'),
+        ),
+        migrations.RunPython(populate_score_ranks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.3 on 2026-10-18 10:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_career_stats(apps, schema_editor):
+    Participant = apps.get_model("app", "Participant")
+    UserCareerStats = apps.get_model("app", "UserCareerStats")
+
+    totals = (
+        Participant.objects.filter(tournament__current_round="finalizado")
+        .exclude(status="applied")
+        .order_by()
+        .values("user_id")
+        .annotate(
+            tournaments_played=Count("id"),
+            total_score=Sum("score"),
+            total_sets_won=Sum("sets_won"),
+            total_games_won=Sum("games_won"),
+            total_games_lost=Sum("games_lost"),
+        )
+    )
+    UserCareerStats.objects.bulk_create(
+        (UserCareerStats(**total) for total in totals),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_global_ranking_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserCareerStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='career_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('tournaments_played', models.PositiveIntegerField(default=0)),
+                ('total_score', models.PositiveIntegerField(default=0)),
+                ('total_sets_won', models.PositiveIntegerField(default=0)),
+                ('total_games_won', models.PositiveIntegerField(default=0)),
+                ('total_games_lost', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'user career stats',
+            },
+        ),
+        migrations.RunPython(populate_career_stats, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='globalranking',
+            name='globalranking_order_idx',
+        ),
+        migrations.RemoveField(
+            model_name='globalranking',
+            name='total_games_lost',
+        ),
+        migrations.RemoveField(
+            model_name='globalranking',
+            name='total_games_won',
+        ),
+        migrations.RemoveField(
+            model_name='globalranking',
+            name='total_score',
+        ),
+        migrations.RemoveField(
+            model_name='globalranking',
+            name='total_sets_won',
+        ),
+        migrations.AddIndex(
+            model_name='usercareerstats',
+            index=models.Index(fields=['-total_score', '-total_sets_won', '-total_games_won', 'total_games_lost'], name='careerstats_seeding_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.3 on 2026-10-18 10:36
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_user_career_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='slot',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='bracket',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='draw_size',
+            field=models.PositiveIntegerField(default=16, help_text='Maximum number of participants selected for the tournament.', validators=[django.core.validators.MinValueValidator(2), django.core.validators.MaxValueValidator(1024)]),
+        ),
+        migrations.AlterField(
+            model_name='match',
+            name='round',
+            field=models.CharField(choices=[('no_comenzado', 'No comenzado'), ('ronda_1024', 'Ronda de 1024'), ('ronda_512', 'Ronda de 512'), ('ronda_256', 'Ronda de 256'), ('sesentaicuatroavos', 'Sesentaicuatroavos de Final'), ('treintaidosavos', 'Treintaidosavos de Final'), ('dieciseisavos', 'Dieciseisavos de Final'), ('octavos', 'Octavos de Final'), ('cuartos', 'Cuartos de Final'), ('semifinal', 'Semifinal'), ('final', 'Final'), ('finalizado', 'Finalizado')], max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='tournament',
+            name='current_round',
+            field=models.CharField(choices=[('no_comenzado', 'No comenzado'), ('ronda_1024', 'Ronda de 1024'), ('ronda_512', 'Ronda de 512'), ('ronda_256', 'Ronda de 256'), ('sesentaicuatroavos', 'Sesentaicuatroavos de Final'), ('treintaidosavos', 'Treintaidosavos de Final'), ('dieciseisavos', 'Dieciseisavos de Final'), ('octavos', 'Octavos de Final'), ('cuartos', 'Cuartos de Final'), ('semifinal', 'Semifinal'), ('final', 'Final'), ('finalizado', 'Finalizado')], default='no_comenzado', max_length=255),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:00
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def unique_slug(name, used, max_length=255):
+    # Frozen copy of app.models.unique_slug, as the slugs were when added
+    base = slugify(name) or "torneo"
+    slug, suffix = base[:max_length], 2
+    while slug in used:
+        tail = f"-{suffix}"
+        slug, suffix = f"{base[: max_length - len(tail)]}{tail}", suffix + 1
+    return slug
+
+
+def populate_slugs(apps, schema_editor):
+    Tournament = apps.get_model("app", "Tournament")
+
+    used = set()
+    tournaments = list(Tournament.objects.order_by("id"))
+    for tournament in tournaments:
+        tournament.slug = unique_slug(tournament.name, used)
+        used.add(tournament.slug)
+    Tournament.objects.bulk_update(tournaments, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_bracket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='slug',
+            field=models.SlugField(max_length=255, null=True),
+        ),
+        migrations.RunPython(populate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='tournament',
+            name='slug',
+            field=models.SlugField(max_length=255, unique=True),
+        ),
+    ]
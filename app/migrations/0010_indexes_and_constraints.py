@@ -0,0 +1,101 @@
+# Generated by Django 5.1.3 on 2026-10-18 10:44
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicates(apps, schema_editor):
+    Participant = apps.get_model("app", "Participant")
+    Match = apps.get_model("app", "Match")
+    Set = apps.get_model("app", "Set")
+
+    # Duplicate participants: keep the first row and move matches onto it
+    duplicated = (
+        Participant.objects.order_by()
+        .values("user_id", "tournament_id")
+        .annotate(keep=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for row in duplicated:
+        duplicates = Participant.objects.filter(
+            user_id=row["user_id"],
+            tournament_id=row["tournament_id"],
+        ).exclude(id=row["keep"])
+        for field in ("participant1", "participant2", "winner"):
+            Match.objects.filter(**{f"{field}__in": duplicates}).update(
+                **{field: row["keep"]},
+            )
+        duplicates.delete()
+
+    # Duplicate set numbers: keep the first row and recount the match results
+    duplicated = (
+        Set.objects.order_by()
+        .values("match_id", "set_number")
+        .annotate(keep=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    match_ids = set()
+    for row in duplicated:
+        Set.objects.filter(
+            match_id=row["match_id"],
+            set_number=row["set_number"],
+        ).exclude(id=row["keep"]).delete()
+        match_ids.add(row["match_id"])
+
+    matches = list(Match.objects.filter(id__in=match_ids))
+    for match in matches:
+        wins1 = wins2 = 0
+        for score1, score2 in Set.objects.filter(match=match).values_list(
+            "participant1_score", "participant2_score"
+        ):
+            if score1 is None or score2 is None:
+                continue
+            wins1 += score1 > score2
+            wins2 += score2 > score1
+        match.participant1_set_wins = wins1
+        match.participant2_set_wins = wins2
+        match.winner_id = None
+        if wins1 > wins2:
+            match.winner_id = match.participant1_id
+        elif wins2 > wins1:
+            match.winner_id = match.participant2_id
+    Match.objects.bulk_update(
+        matches,
+        ["participant1_set_wins", "participant2_set_wins", "winner"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_tournament_slug'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'round'], name='match_round_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'date'], name='match_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['tournament', 'status'], name='participant_tournament_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['user', 'status'], name='participant_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='participant',
+            constraint=models.UniqueConstraint(fields=('user', 'tournament'), name='unique_participant'),
+        ),
+        migrations.AddConstraint(
+            model_name='set',
+            constraint=models.UniqueConstraint(fields=('match', 'set_number'), name='unique_set_number'),
+        ),
+    ]
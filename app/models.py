@@ -1,24 +1,57 @@
 import datetime
 import logging
-from random import shuffle
+import uuid
+from collections import defaultdict
+from random import random, shuffle
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import AbstractUser
+from django.core.exceptions import ValidationError
+from django.core.mail import EmailMultiAlternatives
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models, transaction
-from django.db.models import F, Q, Sum, Window
-from django.db.models.functions import Coalesce, DenseRank, Random
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    When,
+)
+from django.db.models.functions import Coalesce, Random
+from django.db.models.lookups import GreaterThan
 from django.utils import timezone
+from django.utils.text import slugify
 from phonenumber_field.modelfields import PhoneNumberField
 
+from app.brackets import (
+    MAX_DRAW_SIZE,
+    Bracket,
+    bracket_rounds,
+    bracket_size,
+    get_round_choices,
+    pair_participants,
+    round_players,
+    round_title,
+)
+from app.cache import (
+    bump_tournament_version,
+    tournament_cache,
+    tournament_slugs,
+    tournament_version,
+)
+from app.points import DEFAULT_POINTS_TABLE
+from app.routers import primary_reads
+
 logger = logging.getLogger(__name__)
 
-round_choices = [
-    ("no_comenzado", "No comenzado"),
-    ("octavos", "Octavos de Final"),
-    ("cuartos", "Cuartos de Final"),
-    ("semifinal", "Semifinal"),
-    ("final", "Final"),
-    ("finalizado", "Finalizado"),
-]
+round_choices = get_round_choices()
+
+MAX_SETS = 5
+# Finished tournaments stay listed for this long after they end
+LISTED_DAYS = 365
 
 
 class UserStatistics:
@@ -31,63 +64,68 @@ class UserStatistics:
 
     @property
     def total_points(self):
-        """Calculate total points across all tournaments."""
-        return self._participants.aggregate(
-            total=Coalesce(Sum("score"), 0),
-        )["total"]
+        """Return the points of the finished tournaments, as counted by the rank."""
+        return self._career_score().first() or 0
+
+    async def atotal_points(self):
+        """Async version of ``total_points``."""
+        return await self._career_score().afirst() or 0
+
+    def _career_score(self):
+        """Return a query of the user's maintained career score."""
+        return UserCareerStats.objects.filter(user=self.user).values_list(
+            "total_score",
+            flat=True,
+        )
 
     def get_tournament_stats(self):
         """Get detailed tournament statistics including set-by-set breakdown."""
-        round_order = {
-            "octavos": 1,
-            "cuartos": 2,
-            "semifinal": 3,
-            "final": 4,
-        }
-
-        tournaments_data = []
-
         # Get all finished tournaments for the user
-        finished_tournaments = self._participants.filter(
-            tournament__current_round="finalizado",
-        ).select_related("tournament")
+        finished_participants = list(
+            self._participants.filter(
+                tournament__current_round="finalizado",
+            ).select_related("tournament"),
+        )
 
-        for participant in finished_tournaments:
-            # Get all matches where the user participated
-            matches = (
-                Match.objects.filter(
-                    tournament=participant.tournament,
-                )
-                .filter(
-                    Q(participant1=participant) | Q(participant2=participant),
-                )
-                .select_related(
-                    "participant1",
-                    "participant2",
-                )
-                .order_by("date")
+        # Get all their matches and sets at once, grouped by participant
+        matches = (
+            Match.objects.filter(
+                Q(participant1__in=finished_participants)
+                | Q(participant2__in=finished_participants),
             )
+            .select_related(
+                "participant1__user",
+                "participant2__user",
+            )
+            .prefetch_related("set_set")
+            .order_by("date")
+        )
+        participant_matches = defaultdict(list)
+        for match in matches:
+            participant_matches[match.participant1_id].append(match)
+            participant_matches[match.participant2_id].append(match)
 
+        tournaments_data = []
+
+        for participant in finished_participants:
             matches_data = []
             total_sets_won = 0
             total_sets_lost = 0
 
-            for match in matches:
+            for match in participant_matches[participant.id]:
                 # Determine if the user was participant1 or participant2
-                is_participant1 = match.participant1 == participant
+                is_participant1 = match.participant1_id == participant.id
                 opponent = (
                     match.participant2.user.username
                     if is_participant1
                     else match.participant1.user.username
                 )
 
-                # Get all sets for this match
-                match_sets = match.set_set.all().order_by("set_number")
                 sets_data = []
                 match_sets_won = 0
                 match_sets_lost = 0
 
-                for set_obj in match_sets:
+                for set_obj in match.set_set.all():
                     if is_participant1:
                         games_won = set_obj.participant1_score or 0
                         games_lost = set_obj.participant2_score or 0
@@ -115,7 +153,8 @@ class UserStatistics:
                 matches_data.append(
                     {
                         "round": match.round,
-                        "round_order": round_order.get(match.round, 0),  # For sorting
+                        # Earlier rounds have more players, for sorting
+                        "round_order": -round_players(match.round),
                         "opponent": opponent,
                         "date": match.date,
                         "sets_won": match_sets_won,
@@ -150,26 +189,8 @@ class UserStatistics:
 
     @property
     def overall_ranking(self):
-        """Calculate overall ranking based on total points."""
-        ranking = (
-            User.objects.annotate(
-                total_score=Coalesce(
-                    Sum("tournaments__participant__score"),
-                    0,
-                ),
-                rank=Window(
-                    expression=DenseRank(),
-                    order_by=F("total_score").desc(),
-                ),
-            )
-            .filter(
-                id=self.user.id,
-            )
-            .values_list("rank", flat=True)
-            .first()
-        )
-
-        return ranking or 0
+        """Return the dense rank of the user by total points."""
+        return GlobalRanking.objects.score_ranks([self.user.id])[self.user.id]
 
 
 class User(AbstractUser):
@@ -182,7 +203,93 @@ class User(AbstractUser):
         return UserStatistics(self)
 
 
-class UserTournamentManager(models.Manager):
+class TournamentQuerySet(models.QuerySet):
+    """QuerySet for tournaments."""
+
+    def with_round_status(self):
+        """Annotate the number of unresolved matches in the current round.
+
+        ``Tournament.round_finished`` uses the annotation when present, so a list
+        of tournaments can report round completion without a query per row.
+        """
+        unresolved = (
+            Match.objects.filter(
+                tournament=OuterRef("pk"),
+                round=OuterRef("current_round"),
+                winner__isnull=True,
+            )
+            .order_by()
+            .values("tournament")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return self.annotate(unresolved_matches=Coalesce(Subquery(unresolved), 0))
+
+    def listed(self):
+        """Return the unfinished tournaments and those that ended in the last year.
+
+        The home page and the tournament list endpoint show only these, so they
+        do not grow with every tournament the club has ever played.
+        """
+        since = timezone.now().date() - datetime.timedelta(days=LISTED_DAYS)
+        return self.filter(~Q(current_round="finalizado") | Q(end_date__gte=since))
+
+    def get_cached(self, slug):
+        """Return the metadata of the tournament with the slug.
+
+        Served from the process-local tournament cache while the tournament's
+        version is unchanged. Raises ``Tournament.DoesNotExist`` like ``get``.
+        """
+        tournament_id = tournament_slugs.get(slug, None)
+        known_slug = tournament_id is not None
+        # A lagging replica could be cached under the version bumped by the
+        # write it has not seen yet
+        with primary_reads():
+            if not known_slug:
+                tournament_id = self.values_list("id", flat=True).get(slug=slug)
+                tournament_slugs.set(slug, None, tournament_id)
+
+            # Read before the data, like cached_fragment, so a write committed
+            # meanwhile leaves the metadata under an outdated version
+            version = tournament_version(tournament_id)
+            metadata = tournament_cache.get(tournament_id, version)
+            if metadata is not None and metadata.tournament.slug == slug:
+                return metadata
+
+            try:
+                tournament = self.with_round_status().get(id=tournament_id, slug=slug)
+            except self.model.DoesNotExist:
+                if not known_slug:
+                    raise
+                # The slug moved to another tournament since it was cached
+                tournament_slugs.delete(slug)
+                return self.get_cached(slug)
+            metadata = TournamentMetadata(
+                tournament,
+                tournament.participant_set.values_list("user_id", flat=True),
+            )
+        tournament_cache.set(tournament_id, version, metadata)
+        return metadata
+
+    async def aget_cached(self, slug):
+        """Async version of ``get_cached``."""
+        return await sync_to_async(self.get_cached)(slug)
+
+
+class TournamentMetadata:
+    """Read-only snapshot of a tournament shared by the requests of a process."""
+
+    def __init__(self, tournament, participant_ids):
+        """Initialize with the tournament and the ids of its applied users."""
+        self.tournament = tournament
+        self.participant_ids = frozenset(participant_ids)
+
+    def has_applied(self, user):
+        """Return if the user applied to the tournament."""
+        return user.id in self.participant_ids
+
+
+class UserTournamentManager(models.Manager.from_queryset(TournamentQuerySet)):
     """Manager for user tournament-related queries."""
 
     def get_played_tournaments(self, user):
@@ -211,10 +318,24 @@ class UserTournamentManager(models.Manager):
         ).select_related()
 
 
+def unique_slug(name, used, max_length=255):
+    """Return the slug of the name not in ``used``, adding -2, -3... if needed.
+
+    Names without any ASCII letter or digit fall back to "torneo".
+    """
+    base = slugify(name) or "torneo"
+    slug, suffix = base[:max_length], 2
+    while slug in used:
+        tail = f"-{suffix}"
+        slug, suffix = f"{base[: max_length - len(tail)]}{tail}", suffix + 1
+    return slug
+
+
 class Tournament(models.Model):
     """Tournament model."""
 
     name = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=255, unique=True)
     inscription_end_date = models.DateField()
     start_date = models.DateField()
     end_date = models.DateField()
@@ -231,13 +352,35 @@ class Tournament(models.Model):
         choices=round_choices,
         default="no_comenzado",
     )
+    draw_size = models.PositiveIntegerField(
+        default=16,
+        validators=[MinValueValidator(2), MaxValueValidator(MAX_DRAW_SIZE)],
+        help_text="Maximum number of participants selected for the tournament.",
+    )
+    # Heap-indexed participant ids, see app.brackets.Bracket
+    bracket = models.JSONField(default=list, blank=True, editable=False)
 
     objects = UserTournamentManager()
 
+    # Maps a final position to points, see app.points.PointsTable
+    points_table = DEFAULT_POINTS_TABLE
+
     def __str__(self):
         """Return name."""
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Save the tournament, deriving a unique slug from the name if missing."""
+        if not self.slug:
+            base = slugify(self.name) or "torneo"
+            used = set(
+                Tournament.objects.filter(slug__startswith=base)
+                .exclude(pk=self.pk)
+                .values_list("slug", flat=True),
+            )
+            self.slug = unique_slug(self.name, used)
+        super().save(*args, **kwargs)
+
     @property
     def status(self):
         """Return status."""
@@ -253,90 +396,76 @@ class Tournament(models.Model):
     @property
     def status_color(self):
         """Return status color."""
-        if self.status == "Inscripciones abiertas":
-            return "green"
-        if self.status == "Inscripciones cerradas":
-            return "orange"
-        if self.status == "En curso":
-            return "blue"
-        return "red"
+        return {
+            "Inscripciones abiertas": "green",
+            "Inscripciones cerradas": "orange",
+            "En curso": "blue",
+        }.get(self.status, "red")
+
+    @property
+    def rounds(self):
+        """Return the round keys of the tournament, first to final.
+
+        Until the bracket is drawn, the rounds are derived from the draw size.
+        """
+        if self.bracket:
+            return Bracket(self.bracket).rounds
+        return bracket_rounds(bracket_size(self.draw_size))
+
+    def position(self, matches_won):
+        """Return the position reached by a participant with ``matches_won``."""
+        rounds = self.rounds
+        if matches_won == len(rounds) + 1:
+            return "Campeón"
+        if 1 <= matches_won <= len(rounds):
+            return round_title(round_players(rounds[matches_won - 1]))
+        return "Participante"
 
     @property
     def next_round(self):
         """Return next round."""
-        next_round = {
-            "no_comenzado": "octavos",
-            "octavos": "cuartos",
-            "cuartos": "semifinal",
-            "semifinal": "final",
-            "final": "finalizado",
-        }
-        return next_round.get(self.current_round, None)
+        rounds = ["no_comenzado", *self.rounds, "finalizado"]
+        if self.current_round not in rounds[:-1]:
+            return None
+        return rounds[rounds.index(self.current_round) + 1]
 
     @property
     def readable_next_round(self):
         """Return readable round."""
-        return {
-            "no_comenzado": "No comenzado",
-            "octavos": "Octavos de Final",
-            "cuartos": "Cuartos de Final",
-            "semifinal": "Semifinal",
-            "final": "Final",
-            "finalizado": "Finalizado",
-        }[self.next_round]
+        return dict(round_choices)[self.next_round]
 
     @property
     def round_finished(self):
         """Return if the current round is finished."""
         # check if all games have winners
-        matches = self.match_set.filter(round=self.current_round)
-        return all(match.winner for match in matches)
+        unresolved = getattr(self, "unresolved_matches", None)
+        if unresolved is None:
+            return not self.match_set.filter(
+                round=self.current_round,
+                winner__isnull=True,
+            ).exists()
+        return unresolved == 0
 
-    def select_participants(self, max_participants=16):
+    def select_participants(self, max_participants=None):
         """Select participants for the tournament.
 
-        Only selects from users who have applied to the tournament.
+        Only selects from users who have applied to the tournament, up to the
+        draw size by default.
         """
+        if max_participants is None:
+            max_participants = self.draw_size
+
         # Get all applied participants
         applied_participants = self.participant_set.filter(
             status="applied",
         ).select_related("user")
 
-        # Annotate participants with their global statistics
-        ranked_participants = applied_participants.annotate(
-            total_score=Coalesce(
-                Sum(
-                    "user__tournaments__participant__score",
-                    filter=Q(user__tournaments__current_round="finalizado"),
-                ),
-                0,
-            ),
-            total_sets_won=Coalesce(
-                Sum(
-                    "user__tournaments__participant__sets_won",
-                    filter=Q(user__tournaments__current_round="finalizado"),
-                ),
-                0,
-            ),
-            total_games_won=Coalesce(
-                Sum(
-                    "user__tournaments__participant__games_won",
-                    filter=Q(user__tournaments__current_round="finalizado"),
-                ),
-                0,
-            ),
-            total_games_lost=Coalesce(
-                Sum(
-                    "user__tournaments__participant__games_lost",
-                    filter=Q(user__tournaments__current_round="finalizado"),
-                ),
-                0,
-            ),
-        ).order_by(
-            F("total_score").desc(),
-            F("total_sets_won").desc(),
-            F("total_games_won").desc(),
-            F("total_games_lost"),
+        # Order participants by their career statistics
+        ranked_participants = applied_participants.order_by(
+            F("user__career_stats__total_score").desc(nulls_last=True),
+            F("user__career_stats__total_sets_won").desc(nulls_last=True),
+            F("user__career_stats__total_games_won").desc(nulls_last=True),
+            F("user__career_stats__total_games_lost").asc(nulls_first=True),
             Random(),
         )[:max_participants]
 
@@ -347,79 +476,274 @@ class Tournament(models.Model):
             self.participant_set.filter(id__in=selected_ids).update(
                 status="active",
             )
+            bump_tournament_version(self.id)
 
     def can_select_participants(self):
         """Return if the tournament can select participants."""
         return not self.participant_set.filter(status="active").exists()
 
     def settle_round(self):
-        """Settle the current round."""
-        matches = self.match_set.filter(round=self.current_round)
-        for match in matches:
-            match.settle()
+        """Settle the current round.
 
-        # cant do it in match settle because there
-        # may be players that advance without playing
-        participants = self.participant_set.filter(status="active")
-        for participant in participants:
-            participant.matches_won += 1
-            participant.save()
+        All the sets of the round are read in a single query and applied to the
+        participants in memory, which are then written back with one bulk update.
+        """
+        with transaction.atomic():
+            participants = {
+                participant.id: participant
+                for participant in self.participant_set.exclude(status="applied")
+            }
+
+            bracket = Bracket(self.bracket) if self.bracket else None
+            if self.current_round == "no_comenzado":
+                # Draw the bracket among the selected participants
+                bracket = Bracket.seed(
+                    participant.id
+                    for participant in participants.values()
+                    if participant.status == Participant.Status.ACTIVE
+                )
 
-        self.current_round = self.next_round
-        self.save()
+            round_matches = self.match_set.filter(round=self.current_round)
+            scores = defaultdict(list)
+            for match_id, participant1_score, participant2_score in (
+                Set.objects.filter(match__in=round_matches)
+                .order_by()
+                .values_list("match_id", "participant1_score", "participant2_score")
+            ):
+                scores[match_id].append((participant1_score, participant2_score))
+
+            for (
+                match_id,
+                slot,
+                participant1_id,
+                participant2_id,
+            ) in round_matches.order_by("id").values_list(
+                "id",
+                "slot",
+                "participant1_id",
+                "participant2_id",
+            ):
+                winner = Match.apply_result(
+                    participants[participant1_id],
+                    participants[participant2_id],
+                    scores[match_id],
+                )
+                if bracket is not None and slot is not None:
+                    bracket.advance(slot, winner.id)
+
+            # cant do it in match settle because there
+            # may be players that advance without playing
+            for participant in participants.values():
+                if participant.status == Participant.Status.ACTIVE:
+                    participant.matches_won += 1
+
+            if bracket is not None:
+                self.bracket = bracket.nodes
+            self.current_round = self.next_round
+            self.save(update_fields=["current_round", "bracket"])
+
+            self.assign_points(participants.values())
+            Participant.objects.bulk_update(
+                participants.values(),
+                [
+                    "status",
+                    "score",
+                    "matches_won",
+                    "sets_won",
+                    "games_won",
+                    "games_lost",
+                ],
+            )
 
-        self.distribute_points()
+            if self.current_round == "finalizado":
+                GlobalRanking.objects.refresh(
+                    user_ids=[
+                        participant.user_id for participant in participants.values()
+                    ],
+                )
+            else:
+                self.generate_matches()
 
-        if self.current_round != "finalizado":
-            self.generate_matches()
+    def check_round_scores(self, scores):
+        """Raise ``ValidationError`` unless the scores fit the current round.
+
+        See :meth:`enter_round_scores` for the format of ``scores``.
+        """
+        match_ids = set(
+            self.match_set.filter(round=self.current_round).values_list(
+                "id",
+                flat=True,
+            ),
+        )
+        errors = []
+        for match_id, match_scores in scores.items():
+            if match_id not in match_ids:
+                errors.append(f"El partido {match_id} no es de la ronda actual.")
+                continue
+            if len(match_scores) > MAX_SETS:
+                errors.append(f"El partido {match_id} tiene más de {MAX_SETS} sets.")
+            for number, (participant1_score, participant2_score) in enumerate(
+                match_scores,
+                start=1,
+            ):
+                if participant1_score is None and participant2_score is None:
+                    continue
+                if participant1_score is None or participant2_score is None:
+                    errors.append(
+                        f"Falta una puntuación del set {number} del partido "
+                        f"{match_id}.",
+                    )
+                elif participant1_score < 0 or participant2_score < 0:
+                    errors.append(
+                        f"Puntuación negativa en el set {number} del partido "
+                        f"{match_id}.",
+                    )
+        if errors:
+            raise ValidationError(errors)
+
+    def enter_round_scores(self, scores):
+        """Save the set scores of the current round's matches in one go.
+
+        ``scores`` maps match ids to lists of ``(participant1, participant2)``
+        games, first set first, where ``(None, None)`` leaves a set empty.
+        The scores replace the match's previous ones, so stored sets after the
+        last non-empty one are deleted. Everything is validated before writing
+        and the sets are then written with one bulk create and one bulk update.
+        Returns the number of sets written.
+        """
+        self.check_round_scores(scores)
+        with transaction.atomic():
+            existing = {
+                (set_.match_id, set_.set_number): set_
+                for set_ in Set.objects.filter(match_id__in=scores)
+            }
+            played = {
+                match_id: max(
+                    (
+                        number
+                        for number, (participant1_score, _) in enumerate(
+                            match_scores,
+                            start=1,
+                        )
+                        if participant1_score is not None
+                    ),
+                    default=0,
+                )
+                for match_id, match_scores in scores.items()
+            }
+            stale = [
+                set_.id
+                for (match_id, number), set_ in existing.items()
+                if number > played[match_id]
+            ]
+            created = []
+            updated = []
+            for match_id, match_scores in scores.items():
+                for number, (participant1_score, participant2_score) in enumerate(
+                    match_scores[: played[match_id]],
+                    start=1,
+                ):
+                    set_ = existing.get((match_id, number))
+                    if set_ is not None:
+                        set_.participant1_score = participant1_score
+                        set_.participant2_score = participant2_score
+                        updated.append(set_)
+                    elif participant1_score is not None:
+                        created.append(
+                            Set(
+                                match_id=match_id,
+                                set_number=number,
+                                participant1_score=participant1_score,
+                                participant2_score=participant2_score,
+                            ),
+                        )
+            if stale:
+                Set.objects.filter(id__in=stale).delete()
+            Set.objects.bulk_create(created)
+            Set.objects.bulk_update(
+                updated,
+                ["participant1_score", "participant2_score"],
+            )
+            # Bulk writes skip the signals that keep the results up to date
+            Match.objects.filter(id__in=scores).refresh_results()
+            bump_tournament_version(self.id)
+        return len(created) + len(updated)
 
     def distribute_points(self):
-        """Return points for given position."""
-        points_table = {
-            1: 2000,
-            2: 1500,
-            3: 1000,
-            4: 500,
-        }
+        """Assign points to every participant according to their position."""
+        participants = list(self.participant_set.exclude(status="applied"))
+        self.assign_points(participants)
+        Participant.objects.bulk_update(participants, ["score"])
 
-        participants = self.participant_set.exclude(
-            status="applied",
-        ).order_by(
-            F("matches_won").desc(),
-            F("sets_won").desc(),
-            F("games_won").desc(),
-            "games_lost",
-            Random(),
+    def assign_points(self, participants):
+        """Set the score of the given participants in memory by position.
+
+        Points come from ``points_table``; ties on the tiebreakers are resolved
+        randomly.
+        """
+        ranked = list(participants)
+        shuffle(ranked)
+        # sort is stable, so the shuffle decides the remaining ties
+        ranked.sort(
+            key=lambda participant: (
+                -participant.matches_won,
+                -participant.sets_won,
+                -participant.games_won,
+                participant.games_lost,
+            ),
         )
 
-        for position, participant in enumerate(participants, 1):
-            if position in points_table:
-                participant.score = points_table[position]
-            else:
-                participant.score = 475 - ((position - 5) * 25)
-            participant.save()
+        for position, participant in enumerate(ranked, 1):
+            participant.score = self.points_table(position)
 
     def generate_matches(self):
-        """Generate matches for the current round and go to the next round."""
-        participants = list(
-            self.participant_set.exclude(
+        """Generate matches for the current round and go to the next round.
+
+        Pairings follow the bracket; tournaments started before the bracket
+        existed are paired randomly.
+        """
+        if self.bracket:
+            bracket = Bracket(self.bracket)
+            pairings, byes = bracket.pairings(self.current_round)
+            for slot, participant_id in byes:
+                bracket.advance(slot, participant_id)
+            if byes:
+                self.bracket = bracket.nodes
+                self.save(update_fields=["bracket"])
+        else:
+            participants = self.participant_set.exclude(
                 status__in=["eliminated", "applied"],
-            ),
-        )
-        shuffle(participants)
+            )
+            pairs, byes = pair_participants(participants)
+            pairings = [
+                (None, participant1.id, participant2.id)
+                for participant1, participant2 in pairs
+            ]
 
         # Crear partidos emparejando de dos en dos
         match_date = timezone.now() + datetime.timedelta(days=2)
-        for i in range(0, len(participants) - 1, 2):
-            match = Match.objects.create(
-                tournament=self,
-                participant1=participants[i],
-                participant2=participants[i + 1],
-                date=match_date,
-                round=self.current_round,
+        matches = []
+        for slot, participant1_id, participant2_id in pairings:
+            matches.append(
+                Match(
+                    tournament=self,
+                    participant1_id=participant1_id,
+                    participant2_id=participant2_id,
+                    date=match_date,
+                    round=self.current_round,
+                    slot=slot,
+                ),
             )
-            logger.info("Partido creado: %s", match)
             match_date += datetime.timedelta(days=1)
+        Match.objects.bulk_create(matches)
+
+        logger.info(
+            "%s: %d partidos creados en %s, %d exentos",
+            self,
+            len(matches),
+            self.current_round,
+            len(byes),
+        )
 
 
 class Participant(models.Model):
@@ -446,21 +770,99 @@ class Participant(models.Model):
         default=Status.APPLIED,
     )
 
+    class Meta:
+        """Meta class."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "tournament"],
+                name="unique_participant",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["tournament", "status"],
+                name="participant_tournament_idx",
+            ),
+            models.Index(fields=["user", "status"], name="participant_user_idx"),
+        ]
+
     def __str__(self):
         """Return user."""
         return self.user.username
 
     @property
     def position(self):
-        """Return position."""
-        position = {
-            "1": "Octavofinalista",
-            "2": "Cuartofinalista",
-            "3": "Semifinalista",
-            "4": "Finalista",
-            "5": "Campeón",
+        """Return position.
+
+        Everyone selected starts with one match won, and each round won adds
+        another, so ``matches_won`` is the number of the last round reached.
+        """
+        return self.tournament.position(self.matches_won)
+
+
+class MatchQuerySet(models.QuerySet):
+    """QuerySet for matches."""
+
+    @staticmethod
+    def _set_wins(winner_score, loser_score):
+        """Return a subquery counting the sets won by one side of the match."""
+        sets_won = (
+            Set.objects.filter(
+                match=OuterRef("pk"),
+                **{f"{winner_score}__gt": F(loser_score)},
+            )
+            .order_by()
+            .values("match")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(sets_won), 0)
+
+    @classmethod
+    def _result_expressions(cls):
+        """Return the SQL expressions for set wins and winner of each match."""
+        participant1_set_wins = cls._set_wins(
+            "participant1_score",
+            "participant2_score",
+        )
+        participant2_set_wins = cls._set_wins(
+            "participant2_score",
+            "participant1_score",
+        )
+        winner = Case(
+            When(
+                GreaterThan(participant1_set_wins, participant2_set_wins),
+                then=F("participant1"),
+            ),
+            When(
+                GreaterThan(participant2_set_wins, participant1_set_wins),
+                then=F("participant2"),
+            ),
+            default=None,
+        )
+        return {
+            "participant1_set_wins": participant1_set_wins,
+            "participant2_set_wins": participant2_set_wins,
+            "winner": winner,
         }
-        return position.get(str(self.matches_won), "Participante")
+
+    def with_results(self):
+        """Annotate set wins and winner computed from the sets in SQL.
+
+        The annotations are prefixed with ``computed_`` so they can be compared
+        against the stored columns.
+        """
+        expressions = self._result_expressions()
+        return self.annotate(
+            computed_participant1_set_wins=expressions["participant1_set_wins"],
+            computed_participant2_set_wins=expressions["participant2_set_wins"],
+            computed_winner_id=expressions["winner"],
+        )
+
+    def refresh_results(self):
+        """Recompute the stored set wins and winner in a single UPDATE."""
+        return self.update(**self._result_expressions())
 
 
 class Match(models.Model):
@@ -479,11 +881,31 @@ class Match(models.Model):
     )
     date = models.DateTimeField()
     round = models.CharField(max_length=255, choices=round_choices)
+    # Heap index of the match in the tournament bracket, see app.brackets.Bracket
+    slot = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
+    # Denormalized from the match sets, kept up to date by app.signals
+    participant1_set_wins = models.PositiveIntegerField(default=0, editable=False)
+    participant2_set_wins = models.PositiveIntegerField(default=0, editable=False)
+    winner = models.ForeignKey(
+        Participant,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="won_matches",
+    )
+
+    objects = MatchQuerySet.as_manager()
 
     class Meta:
         """Meta class."""
 
         ordering = ["tournament", "date"]
+        indexes = [
+            models.Index(fields=["tournament", "round"], name="match_round_idx"),
+            models.Index(fields=["tournament", "date"], name="match_date_idx"),
+        ]
 
     def __str__(self):
         """Return match."""
@@ -491,56 +913,51 @@ class Match(models.Model):
 
     def settle(self):
         """Settle the match."""
-        for set_played in self.set_set.all():
-            if (
-                set_played.participant1_score is None
-                or set_played.participant2_score is None
-            ):
-                continue
-            self.participant1.games_won += set_played.participant1_score
-            self.participant2.games_won += set_played.participant2_score
-
-            self.participant1.games_lost += set_played.participant2_score
-            self.participant2.games_lost += set_played.participant1_score
-
-            if set_played.participant1_score > set_played.participant2_score:
-                self.participant1.sets_won += 1
-            else:
-                self.participant2.sets_won += 1
-
-        if self.winner == self.participant1:
-            self.participant2.status = Participant.Status.ELIMINATED
-        else:
-            self.participant1.status = Participant.Status.ELIMINATED
+        scores = self.set_set.values_list("participant1_score", "participant2_score")
+        self.apply_result(self.participant1, self.participant2, scores)
 
         self.participant1.save()
         self.participant2.save()
 
-    @property
-    def participant1_set_wins(self):
-        """Return number of sets won by participant1."""
-        return self.set_set.filter(
-            participant1_score__gt=F("participant2_score"),
-        ).count()
+    @staticmethod
+    def apply_result(participant1, participant2, scores):
+        """Add the played sets to both participants and eliminate the loser.
 
-    @property
-    def participant2_set_wins(self):
-        """Return number of sets won by participant2."""
-        return self.set_set.filter(
-            participant2_score__gt=F("participant1_score"),
-        ).count()
+        Only the in-memory participants are modified; saving is left to the
+        caller. ``scores`` is an iterable of ``(participant1, participant2)``
+        game pairs, one per set. Returns the participant who goes through.
+        """
+        participant1_set_wins = 0
+        participant2_set_wins = 0
+        for participant1_score, participant2_score in scores:
+            if participant1_score is None or participant2_score is None:
+                continue
+            participant1.games_won += participant1_score
+            participant2.games_won += participant2_score
 
-    @property
-    def winner(self):
-        """Return match winner."""
-        participant1_sets_win = self.participant1_set_wins
-        participant2_sets_win = self.participant2_set_wins
-
-        if participant1_sets_win > participant2_sets_win:
-            return self.participant1
-        if participant1_sets_win < participant2_sets_win:
-            return self.participant2
-        return None
+            participant1.games_lost += participant2_score
+            participant2.games_lost += participant1_score
+
+            if participant1_score > participant2_score:
+                participant1.sets_won += 1
+                participant1_set_wins += 1
+            else:
+                participant2.sets_won += 1
+                if participant2_score > participant1_score:
+                    participant2_set_wins += 1
+
+        if participant1_set_wins > participant2_set_wins:
+            participant2.status = Participant.Status.ELIMINATED
+            return participant1
+        participant1.status = Participant.Status.ELIMINATED
+        return participant2
+
+    def refresh_results(self):
+        """Recompute the stored set wins and winner from the match sets."""
+        Match.objects.filter(pk=self.pk).refresh_results()
+        self.refresh_from_db(
+            fields=["participant1_set_wins", "participant2_set_wins", "winner"],
+        )
 
 
 class Set(models.Model):
@@ -555,6 +972,12 @@ class Set(models.Model):
         """Meta class."""
 
         ordering = ["set_number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["match", "set_number"],
+                name="unique_set_number",
+            ),
+        ]
 
     def __str__(self):
         """Return match."""
@@ -568,3 +991,351 @@ class Set(models.Model):
         if self.participant1_score < self.participant2_score:
             return self.match.participant2
         return None
+
+
+class UserCareerStatsQuerySet(models.QuerySet):
+    """QuerySet for user career statistics."""
+
+    def refresh(self, user_ids=None):
+        """Recompute the career totals of the given users.
+
+        Only finished tournaments count towards the totals. When ``user_ids`` is
+        None every user is recomputed from scratch.
+        """
+        participants = Participant.objects.filter(
+            tournament__current_round="finalizado",
+        ).exclude(status="applied")
+        rows = self.all()
+        if user_ids is not None:
+            participants = participants.filter(user_id__in=user_ids)
+            rows = rows.filter(user_id__in=user_ids)
+
+        totals = (
+            participants.order_by()
+            .values("user_id")
+            .annotate(
+                tournaments_played=Count("id"),
+                score=Sum("score"),
+                sets_won=Sum("sets_won"),
+                games_won=Sum("games_won"),
+                games_lost=Sum("games_lost"),
+            )
+        )
+
+        with transaction.atomic():
+            existing = {stats.user_id: stats for stats in rows}
+            to_create = []
+            to_update = []
+            for total in totals:
+                stats = existing.pop(total["user_id"], None)
+                if stats is None:
+                    stats = self.model(user_id=total["user_id"])
+                    to_create.append(stats)
+                else:
+                    to_update.append(stats)
+                stats.tournaments_played = total["tournaments_played"]
+                stats.total_score = total["score"]
+                stats.total_sets_won = total["sets_won"]
+                stats.total_games_won = total["games_won"]
+                stats.total_games_lost = total["games_lost"]
+
+            # whatever is left no longer has finished tournaments
+            self.filter(user_id__in=existing).delete()
+            self.bulk_create(to_create)
+            self.bulk_update(
+                to_update,
+                [
+                    "tournaments_played",
+                    "total_score",
+                    "total_sets_won",
+                    "total_games_won",
+                    "total_games_lost",
+                ],
+            )
+
+
+class UserCareerStats(models.Model):
+    """Totals of a user over every finished tournament."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="career_stats",
+    )
+    tournaments_played = models.PositiveIntegerField(default=0)
+    total_score = models.PositiveIntegerField(default=0)
+    total_sets_won = models.PositiveIntegerField(default=0)
+    total_games_won = models.PositiveIntegerField(default=0)
+    total_games_lost = models.PositiveIntegerField(default=0)
+
+    objects = UserCareerStatsQuerySet.as_manager()
+
+    class Meta:
+        """Meta class."""
+
+        verbose_name_plural = "user career stats"
+        indexes = [
+            models.Index(
+                fields=[
+                    "-total_score",
+                    "-total_sets_won",
+                    "-total_games_won",
+                    "total_games_lost",
+                ],
+                name="careerstats_seeding_idx",
+            ),
+        ]
+
+    def __str__(self):
+        """Return user."""
+        return str(self.user)
+
+
+def random_tiebreaker():
+    """Return a random value used to break ties in the global ranking."""
+    return random()  # noqa: S311
+
+
+class GlobalRankingQuerySet(models.QuerySet):
+    """QuerySet for the global ranking."""
+
+    ranking_order = (
+        F("user__career_stats__total_sets_won").desc(),
+        F("user__career_stats__total_games_won").desc(),
+        F("user__career_stats__total_games_lost").asc(),
+        "tiebreaker",
+    )
+
+    def refresh(self, user_ids=None):
+        """Refresh the career stats of the given users and update the ranks.
+
+        When ``user_ids`` is None the whole ranking is rebuilt from scratch.
+        """
+        with transaction.atomic():
+            UserCareerStats.objects.refresh(user_ids)
+
+            career_stats = UserCareerStats.objects.all()
+            rows = self.all()
+            if user_ids is not None:
+                career_stats = career_stats.filter(user_id__in=user_ids)
+                rows = rows.filter(user_id__in=user_ids)
+            ranked = set(career_stats.values_list("user_id", flat=True))
+            existing = set(rows.values_list("user_id", flat=True))
+
+            self.filter(user_id__in=existing - ranked).delete()
+            self.bulk_create(
+                self.model(user_id=user_id) for user_id in ranked - existing
+            )
+            self.update_ranks()
+
+    def update_ranks(self):
+        """Renumber the ranks, writing only the rows whose ranks changed.
+
+        ``rank`` is the position in the ranking order and ``score_rank`` the
+        dense rank by total score.
+        """
+        rows = list(
+            self.model.objects.order_by(*self.ranking_order).values_list(
+                "user_id",
+                "user__career_stats__total_score",
+                "rank",
+                "score_rank",
+            ),
+        )
+
+        score_ranks = {
+            score: score_rank
+            for score_rank, score in enumerate(
+                sorted({row[1] for row in rows}, reverse=True),
+                1,
+            )
+        }
+
+        changed = []
+        for rank, (user_id, total_score, old_rank, old_score_rank) in enumerate(
+            rows,
+            1,
+        ):
+            score_rank = score_ranks[total_score]
+            if rank != old_rank or score_rank != old_score_rank:
+                changed.append(
+                    self.model(user_id=user_id, rank=rank, score_rank=score_rank),
+                )
+        self.model.objects.bulk_update(changed, ["rank", "score_rank"])
+
+    def score_ranks(self, user_ids):
+        """Return a mapping of user id to dense rank by total score.
+
+        Each rank is read from its row by primary key. Users without finished
+        tournaments share the rank after the lowest score.
+        """
+        ranks = dict(
+            self.model.objects.filter(user_id__in=user_ids).values_list(
+                "user_id",
+                "score_rank",
+            ),
+        )
+        missing = set(user_ids) - ranks.keys()
+        if missing:
+            lowest = (
+                self.model.objects.order_by("-score_rank")
+                .values_list("score_rank", "user__career_stats__total_score")
+                .first()
+            )
+            if lowest is None:
+                unranked = 1
+            else:
+                lowest_rank, lowest_score = lowest
+                unranked = lowest_rank if lowest_score == 0 else lowest_rank + 1
+            ranks.update(dict.fromkeys(missing, unranked))
+        return ranks
+
+
+class GlobalRanking(models.Model):
+    """Precomputed global ranking of users over finished tournaments.
+
+    The totals it is ordered by live in ``UserCareerStats``.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="global_ranking",
+    )
+    # Random but stable tie-break, so equal users keep their relative order
+    tiebreaker = models.FloatField(default=random_tiebreaker)
+    rank = models.PositiveIntegerField(default=0)
+    score_rank = models.PositiveIntegerField(default=0)
+
+    objects = GlobalRankingQuerySet.as_manager()
+
+    class Meta:
+        """Meta class."""
+
+        ordering = ["rank"]
+        indexes = [
+            models.Index(fields=["rank"]),
+            models.Index(fields=["score_rank"]),
+        ]
+
+    def __str__(self):
+        """Return user and rank."""
+        return f"{self.rank}. {self.user}"
+
+
+class OutboxEmailQuerySet(models.QuerySet):
+    """QuerySet for the email outbox."""
+
+    def claim(self, limit, lease):
+        """Claim up to ``limit`` due emails for ``lease`` seconds and return them.
+
+        Claimed emails are not due again until the lease ends, so concurrent
+        workers never pick the same email and the emails of a worker that dies
+        are retried once it ends.
+        """
+        now = timezone.now()
+        token = uuid.uuid4()
+        due = self.filter(
+            status=OutboxEmail.Status.PENDING,
+            next_attempt_at__lte=now,
+        ).order_by("next_attempt_at", "id")
+        self.filter(
+            id__in=Subquery(due.values("id")[:limit]),
+            status=OutboxEmail.Status.PENDING,
+            next_attempt_at__lte=now,
+        ).update(
+            claim=token,
+            next_attempt_at=now + datetime.timedelta(seconds=lease),
+        )
+        return list(self.filter(claim=token))
+
+
+class OutboxEmail(models.Model):
+    """Email stored in the outbox until the send_outbox worker delivers it."""
+
+    class Status(models.TextChoices):
+        """Status choices."""
+
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    subject = models.TextField()
+    body = models.TextField()
+    content_subtype = models.CharField(max_length=255, default="plain")
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list)
+    bcc = models.JSONField(default=list)
+    reply_to = models.JSONField(default=list)
+    headers = models.JSONField(default=dict)
+    # [content, mimetype] pairs, like EmailMultiAlternatives.alternatives
+    alternatives = models.JSONField(default=list)
+
+    status = models.CharField(
+        max_length=255,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim = models.UUIDField(null=True, blank=True, editable=False)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutboxEmailQuerySet.as_manager()
+
+    class Meta:
+        """Meta class."""
+
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="outbox_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        """Return subject and recipients."""
+        return f"{self.subject} ({', '.join(self.to)})"
+
+    @classmethod
+    def from_message(cls, message):
+        """Return an unsaved outbox email holding the email message."""
+        if message.attachments:
+            msg = "The outbox does not store attachments."
+            raise ValueError(msg)
+        return cls(
+            subject=message.subject,
+            body=message.body,
+            content_subtype=message.content_subtype,
+            from_email=message.from_email,
+            to=list(message.to),
+            cc=list(message.cc),
+            bcc=list(message.bcc),
+            reply_to=list(message.reply_to),
+            headers=dict(message.extra_headers),
+            alternatives=[
+                [content, mimetype]
+                for content, mimetype in getattr(message, "alternatives", [])
+            ],
+        )
+
+    def to_message(self):
+        """Return the email message to deliver."""
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.to,
+            cc=self.cc,
+            bcc=self.bcc,
+            reply_to=self.reply_to,
+            headers=self.headers,
+            alternatives=[tuple(alternative) for alternative in self.alternatives],
+        )
+        message.content_subtype = self.content_subtype
+        return message
@@ -0,0 +1,34 @@
+class PointsTable:
+    """Points awarded to a participant by final position in a tournament.
+
+    Positions listed in ``fixed`` get those points; every later position gets
+    ``step`` points less than the one before it, starting at ``start`` and never
+    going below ``minimum``.
+    """
+
+    def __init__(self, fixed, start, step, minimum=0):
+        """Initialize the table."""
+        self.fixed = dict(fixed)
+        self.start = start
+        self.step = step
+        self.minimum = minimum
+        self.first_linear = max(self.fixed, default=0) + 1
+
+    def __call__(self, position):
+        """Return the points for the given position, starting at 1."""
+        if position in self.fixed:
+            return self.fixed[position]
+        points = self.start - (position - self.first_linear) * self.step
+        return max(points, self.minimum)
+
+
+DEFAULT_POINTS_TABLE = PointsTable(
+    fixed={
+        1: 2000,
+        2: 1500,
+        3: 1000,
+        4: 500,
+    },
+    start=475,
+    step=25,
+)
@@ -0,0 +1,159 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+
+PRIMARY_DATABASE = "default"
+PIN_SESSION_KEY = "_primary_until"
+
+
+class RoutingState:
+    """Where the reads of the current request go and whether it has written."""
+
+    def __init__(self, pinned=False):
+        """Initialize the state, pinned to the primary or not."""
+        self.pinned = pinned
+        self.replica_reads = False
+        self.wrote = False
+
+
+_routing = ContextVar("database_routing", default=None)
+
+
+@contextmanager
+def routing_state(pinned=False):
+    """Track the routing of the queries run inside the block."""
+    state = RoutingState(pinned)
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+@contextmanager
+def _reads_from(replica):
+    """Send the reads inside the block to the replica or to the primary."""
+    state = _routing.get()
+    if state is None:
+        yield
+        return
+    previous = state.replica_reads
+    state.replica_reads = replica
+    try:
+        yield
+    finally:
+        state.replica_reads = previous
+
+
+def replica_reads():
+    """Send the reads inside the block to the replica, unless pinned."""
+    return _reads_from(replica=True)
+
+
+def primary_reads():
+    """Send the reads inside the block to the primary."""
+    return _reads_from(replica=False)
+
+
+def read_from_replica(view):
+    """Decorate a read-only view, sync or async, to run its queries on the replica."""
+    if iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def async_wrapper(*args, **kwargs):
+            with replica_reads():
+                return await view(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return view(*args, **kwargs)
+
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """Send reads of replica views to the replica and everything else to the primary.
+
+    Reads only go to the replica inside :func:`replica_reads` and while the
+    session is not pinned to the primary after one of its writes.
+    """
+
+    def db_for_read(self, model, **hints):  # noqa: ARG002
+        """Return the replica for reads in replica views of unpinned sessions."""
+        state = _routing.get()
+        if (
+            settings.REPLICA_DATABASE
+            and state is not None
+            and state.replica_reads
+            and not state.pinned
+        ):
+            return settings.REPLICA_DATABASE
+        return PRIMARY_DATABASE
+
+    def db_for_write(self, model, **hints):  # noqa: ARG002
+        """Return the primary and record that the request wrote."""
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):  # noqa: ARG002
+        """Allow relations across aliases, which hold the same data."""
+        return True
+
+
+class PrimaryPinningMiddleware:
+    """Pin a session's reads to the primary for a while after it writes.
+
+    Replicas lag behind the primary, so a user who just saved something reads
+    it back from the primary for ``REPLICA_PIN_SECONDS``. Without a replica,
+    or for sessions without a logged in user (anonymous or just flushed by a
+    logout), nothing is pinned so the session is not saved again. Works under
+    WSGI and ASGI, so async views are not pushed into a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Initialize the middleware."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Route the queries of the request and pin the session after writes."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.REPLICA_DATABASE:
+            return self.get_response(request)
+        pinned = request.session.get(PIN_SESSION_KEY, 0) > time.time()
+        with routing_state(pinned) as state:
+            response = self.get_response(request)
+            if state.wrote and SESSION_KEY in request.session:
+                request.session[PIN_SESSION_KEY] = (
+                    time.time() + settings.REPLICA_PIN_SECONDS
+                )
+        return response
+
+    async def __acall__(self, request):
+        """Async version of ``__call__``."""
+        if not settings.REPLICA_DATABASE:
+            return await self.get_response(request)
+        pinned = await request.session.aget(PIN_SESSION_KEY, 0) > time.time()
+        with routing_state(pinned) as state:
+            response = await self.get_response(request)
+            if state.wrote and await request.session.ahas_key(SESSION_KEY):
+                await request.session.aset(
+                    PIN_SESSION_KEY,
+                    time.time() + settings.REPLICA_PIN_SECONDS,
+                )
+        return response
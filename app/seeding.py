@@ -0,0 +1,359 @@
+import datetime
+import math
+import random
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from app.brackets import Bracket
+from app.models import GlobalRanking, Match, Participant, Set, Tournament, User
+
+FIRST_NAMES = [
+    "Alba", "Álvaro", "Ana", "Carlos", "Carmen", "David", "Elena", "Hugo",
+    "Irene", "Javier", "Laura", "Lucía", "Manuel", "María", "Pablo", "Sara",
+]  # fmt: skip
+LAST_NAMES = [
+    "Álvarez", "Díaz", "Fernández", "García", "Gómez", "González", "López",
+    "Martín", "Martínez", "Moreno", "Muñoz", "Pérez", "Rodríguez", "Ruiz",
+    "Sánchez", "Torres",
+]  # fmt: skip
+
+# Games of the set winner and loser, weighted by how often they happen
+SET_SCORES = [(6, 0), (6, 1), (6, 2), (6, 3), (6, 4), (7, 5), (7, 6)]
+SET_SCORE_WEIGHTS = [3, 8, 14, 16, 15, 8, 8]
+SET_SCORE_POOL = [
+    score
+    for score, weight in zip(SET_SCORES, SET_SCORE_WEIGHTS, strict=True)
+    for _ in range(weight)
+]
+SETS_TO_WIN = 2
+
+
+class ClubSeeder:
+    """Generate a synthetic club: users, tournaments, matches and set scores.
+
+    All the randomness comes from ``seed``, so the same arguments give the same
+    club. Users and tournaments are written with batched ``bulk_create`` and
+    users get an unusable password, so no time goes into hashing. The bulk of
+    the rows (participants, matches and sets) is simulated on plain lists and
+    inserted with ``executemany`` using preallocated ids, which skips model
+    instances and signals; run it on a database nobody else writes to.
+    ``progress`` is called with the model and the number of rows after every
+    batch.
+    """
+
+    def __init__(self, seed=0, batch_size=5000, progress=None):
+        """Initialize the generator."""
+        self.rng = random.Random(seed)  # noqa: S311
+        self.batch_size = batch_size
+        self.progress = progress
+        self.counts = Counter()
+        self.strength = {}
+
+    def _count(self, model, rows):
+        """Count written rows and report progress."""
+        self.counts[model.__name__] += rows
+        if self.progress is not None:
+            self.progress(model, rows)
+
+    def _bulk_create(self, model, objs):
+        """Insert the model instances in batches."""
+        created = []
+        for start in range(0, len(objs), self.batch_size):
+            batch = model.objects.bulk_create(objs[start : start + self.batch_size])
+            created.extend(batch)
+            self._count(model, len(batch))
+        return created
+
+    def _insert(self, model, fields, rows):
+        """Insert plain tuples of the given fields in batches."""
+        opts = model._meta  # noqa: SLF001
+        quote = connection.ops.quote_name
+        table = quote(opts.db_table)
+        columns = ", ".join(quote(opts.get_field(name).column) for name in fields)
+        placeholders = ", ".join(["%s"] * len(fields))
+        # Table and column names come from the model, values are parameters
+        sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"  # noqa: S608
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start : start + self.batch_size]
+                cursor.executemany(sql, batch)
+                self._count(model, len(batch))
+
+    @staticmethod
+    def _next_id(model):
+        """Return the id following the highest one in the table."""
+        last = model.objects.order_by("-id").values_list("id", flat=True).first()
+        return (last or 0) + 1
+
+    def create_users(self, count):
+        """Create users with unusable passwords and return their ids."""
+        password = make_password(None)
+        start = self._next_id(User)
+        users = self._bulk_create(
+            User,
+            [
+                User(
+                    username=f"jugador{number}",
+                    email=f"jugador{number}@example.com",
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                    telefono=f"+346{number:08d}",
+                    password=password,
+                )
+                for number in range(start, start + count)
+            ],
+        )
+        user_ids = [user.id for user in users]
+        for user_id in user_ids:
+            self.strength[user_id] = self.rng.gauss(0, 1)
+        return user_ids
+
+    def create_tournaments(self, count, draw_size, user_ids, unfinished=0):
+        """Create tournaments played among the users and return them.
+
+        The last ``unfinished`` tournaments stop at a random round, with the
+        matches of that round still to be played.
+        """
+        start = self._next_id(Tournament)
+        today = timezone.now().date()
+        tournaments = []
+        for number in range(start, start + count):
+            finished = number < start + count - unfinished
+            start_date = today - datetime.timedelta(
+                days=self.rng.randint(60, 3650) if finished else 5,
+            )
+            tournaments.append(
+                Tournament(
+                    name=f"Torneo {number}",
+                    slug=f"torneo-{number}",
+                    inscription_end_date=start_date - datetime.timedelta(days=10),
+                    start_date=start_date,
+                    end_date=start_date + datetime.timedelta(days=60),
+                    image="https://example.com/torneo.jpg",
+                    description="Torneo generado.",
+                    draw_size=draw_size,
+                    current_round="finalizado" if finished else "no_comenzado",
+                ),
+            )
+        tournaments = self._bulk_create(Tournament, tournaments)
+
+        # Write the tournaments in groups of about a batch of participants
+        group_size = max(1, self.batch_size // draw_size)
+        for index in range(0, len(tournaments), group_size):
+            with transaction.atomic():
+                self._play_tournaments(
+                    tournaments[index : index + group_size],
+                    user_ids,
+                )
+        return tournaments
+
+    def _play_tournaments(self, tournaments, user_ids):
+        """Simulate the tournaments and write their rows."""
+        participants = []
+        matches = []
+        sets = []
+        ids = [self._next_id(Participant), self._next_id(Match)]
+        for tournament in tournaments:
+            entrants = self.rng.sample(
+                user_ids,
+                min(tournament.draw_size, len(user_ids)),
+            )
+            self._play(tournament, entrants, ids, participants, matches, sets)
+
+        Tournament.objects.bulk_update(tournaments, ["bracket", "current_round"])
+        self._insert(
+            Participant,
+            [
+                "id",
+                "user",
+                "tournament",
+                "status",
+                "score",
+                "matches_won",
+                "sets_won",
+                "games_won",
+                "games_lost",
+            ],
+            participants,
+        )
+        self._insert(
+            Match,
+            [
+                "id",
+                "tournament",
+                "participant1",
+                "participant2",
+                "date",
+                "round",
+                "slot",
+                "participant1_set_wins",
+                "participant2_set_wins",
+                "winner",
+            ],
+            matches,
+        )
+        self._insert(
+            Set,
+            ["match", "set_number", "participant1_score", "participant2_score"],
+            sets,
+        )
+
+    def _play(self, tournament, user_ids, ids, participants, matches, sets):  # noqa: PLR0913
+        """Play the tournament and append its rows.
+
+        ``ids`` holds the next participant and match ids and is advanced.
+        """
+        entrants = len(user_ids)
+        participant_ids = list(range(ids[0], ids[0] + entrants))
+        ids[0] += entrants
+        strength = [self.strength[user_id] for user_id in user_ids]
+        sets_won = [0] * entrants
+        games_won = [0] * entrants
+        games_lost = [0] * entrants
+        matches_won = [1] * entrants
+        active = [True] * entrants
+
+        bracket = Bracket.seed(range(entrants), rng=self.rng)
+        rounds = bracket.rounds
+        finished = tournament.current_round == "finalizado"
+        last_round = len(rounds) if finished else self.rng.randrange(len(rounds))
+        adapt_date = connection.ops.adapt_datetimefield_value
+        match_date = datetime.datetime.combine(
+            tournament.start_date,
+            datetime.time(10),
+            tzinfo=datetime.UTC,
+        )
+
+        for round_index, key in enumerate(rounds):
+            pairings, byes = bracket.pairings(key)
+            for slot, index in byes:
+                bracket.advance(slot, index)
+            played = round_index < last_round
+            for slot, index1, index2 in pairings:
+                match_id = ids[1]
+                ids[1] += 1
+                wins = [0, 0]
+                if played:
+                    wins = self._play_match(
+                        match_id,
+                        strength[index1] - strength[index2],
+                        sets,
+                    )
+                    for set_row in sets[-sum(wins) :]:
+                        games_won[index1] += set_row[2]
+                        games_lost[index1] += set_row[3]
+                        games_won[index2] += set_row[3]
+                        games_lost[index2] += set_row[2]
+                    sets_won[index1] += wins[0]
+                    sets_won[index2] += wins[1]
+                    winner, loser = index1, index2
+                    if wins[1] > wins[0]:
+                        winner, loser = loser, winner
+                    active[loser] = False
+                    bracket.advance(slot, winner)
+
+                matches.append(
+                    (
+                        match_id,
+                        tournament.id,
+                        participant_ids[index1],
+                        participant_ids[index2],
+                        adapt_date(match_date),
+                        key,
+                        slot,
+                        wins[0],
+                        wins[1],
+                        participant_ids[winner] if played else None,
+                    ),
+                )
+                match_date += datetime.timedelta(hours=2)
+
+            if not played:
+                tournament.current_round = key
+                break
+            for index in range(entrants):
+                if active[index]:
+                    matches_won[index] += 1
+
+        scores = self._scores(
+            tournament,
+            list(zip(matches_won, sets_won, games_won, games_lost, strict=True)),
+        )
+        tournament.bracket = [
+            None if node is None else participant_ids[node] for node in bracket.nodes
+        ]
+        participants.extend(
+            (
+                participant_ids[index],
+                user_ids[index],
+                tournament.id,
+                "active" if active[index] else "eliminated",
+                scores[index],
+                matches_won[index],
+                sets_won[index],
+                games_won[index],
+                games_lost[index],
+            )
+            for index in range(entrants)
+        )
+
+    def _scores(self, tournament, stats):
+        """Return the points of each entrant from their match statistics.
+
+        Entrants are ordered like in ``Tournament.assign_points``, with a
+        shuffle deciding the remaining ties.
+        """
+        ranked = sorted(
+            self.rng.sample(range(len(stats)), len(stats)),
+            key=lambda index: (
+                -stats[index][0],
+                -stats[index][1],
+                -stats[index][2],
+                stats[index][3],
+            ),
+        )
+        scores = [0] * len(stats)
+        for position, index in enumerate(ranked, 1):
+            scores[index] = tournament.points_table(position)
+        return scores
+
+    def _play_match(self, match_id, advantage, sets):
+        """Play a match and append its sets, returning the sets won by each.
+
+        The first player wins each set with a logistic probability of their
+        ``advantage`` in strength.
+        """
+        probability = 1 / (1 + math.exp(-advantage))
+        wins = [0, 0]
+        while wins[0] < SETS_TO_WIN and wins[1] < SETS_TO_WIN:
+            games1, games2 = self.rng.choice(SET_SCORE_POOL)
+            if self.rng.random() < probability:
+                wins[0] += 1
+            else:
+                wins[1] += 1
+                games1, games2 = games2, games1
+            sets.append((match_id, sum(wins), games1, games2))
+        return wins
+
+
+def seed_club(  # noqa: PLR0913
+    users,
+    tournaments,
+    draw_size=16,
+    unfinished=0,
+    seed=0,
+    batch_size=5000,
+    progress=None,
+):
+    """Generate a synthetic club and rebuild the global ranking.
+
+    Returns the number of rows created by model name.
+    """
+    seeder = ClubSeeder(seed=seed, batch_size=batch_size, progress=progress)
+    user_ids = seeder.create_users(users)
+    seeder.create_tournaments(tournaments, draw_size, user_ids, unfinished=unfinished)
+    GlobalRanking.objects.refresh()
+    return seeder.counts
@@ -0,0 +1,67 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from app.cache import bump_tournament_version
+from app.models import Match, Participant, Set, Tournament
+
+
+@receiver(post_save, sender=Set)
+def refresh_match_results(sender, instance, **kwargs):  # noqa: ARG001
+    """Keep the denormalized set wins and winner of the match up to date."""
+    if Set.match.is_cached(instance):
+        # Refresh the in-memory match too so callers holding it see the result
+        instance.match.refresh_results()
+        tournament_id = instance.match.tournament_id
+    else:
+        matches = Match.objects.filter(pk=instance.match_id)
+        matches.refresh_results()
+        tournament_id = matches.values_list("tournament_id", flat=True).first()
+
+    if tournament_id is not None:
+        bump_tournament_version(tournament_id)
+
+
+@receiver(post_delete, sender=Set)
+def refresh_deleted_set_match(sender, instance, origin=None, **kwargs):
+    """Refresh the match of a deleted set, unless the match is deleted too.
+
+    Deleting a tournament, participant or match cascades to its sets, and
+    their matches are gone, so only deletes started from sets refresh.
+    """
+    if isinstance(origin, Set) or getattr(origin, "model", None) is Set:
+        refresh_match_results(sender, instance, **kwargs)
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_delete, sender=Tournament)
+def invalidate_tournament(sender, instance, **kwargs):  # noqa: ARG001
+    """Invalidate the cached data of a saved or deleted tournament."""
+    bump_tournament_version(instance.id)
+
+
+@receiver(post_save, sender=Participant)
+@receiver(post_delete, sender=Participant)
+@receiver(post_save, sender=Match)
+@receiver(post_delete, sender=Match)
+def invalidate_tournament_of(sender, instance, **kwargs):  # noqa: ARG001
+    """Invalidate the cached data of the tournament a row belongs to."""
+    bump_tournament_version(instance.tournament_id)
+
+
+@receiver(m2m_changed, sender=Tournament.participants.through)
+def invalidate_applications(sender, instance, action, reverse, pk_set, **kwargs):  # noqa: ARG001
+    """Invalidate tournaments users applied to or withdrew from."""
+    if reverse and action == "pre_clear":
+        # user.tournaments.clear() does not say which tournaments it empties
+        pk_set = Participant.objects.filter(user=instance).values_list(
+            "tournament_id",
+            flat=True,
+        )
+    elif action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        bump_tournament_version(instance.id)
+        return
+    for tournament_id in pk_set or ():
+        bump_tournament_version(tournament_id)
@@ -0,0 +1,97 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.cache import tournament_cache, tournament_slugs
+from app.models import Set, Tournament
+from app.seeding import seed_club
+
+
+class TournamentApiTests(TestCase):
+    """Test cases for the tournament JSON API."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed a small club."""
+        seed_club(20, 1, draw_size=8, seed=6)
+        cls.tournament = Tournament.objects.get(slug__startswith="torneo")
+        cls.player = cls.tournament.participant_set.first().user
+
+    def setUp(self):
+        """Clear the caches and log in."""
+        cache.clear()
+        tournament_cache.clear()
+        tournament_slugs.clear()
+        self.client.force_login(self.player)
+
+    def get(self, name, **headers):
+        """Return the response of a tournament endpoint."""
+        return self.client.get(
+            reverse(name, args=[self.tournament.slug]),
+            headers=headers,
+        )
+
+    def test_endpoints(self):
+        """Test every endpoint answers with the tournament data."""
+        response = self.client.get(reverse("api_tournaments"))
+        self.assertEqual(
+            [row["slug"] for row in response.json()],
+            list(
+                Tournament.objects.listed()
+                .order_by("start_date", "name")
+                .values_list("slug", flat=True),
+            ),
+        )
+
+        self.assertEqual(self.get("api_tournament").json()["id"], self.tournament.id)
+
+        bracket = self.get("api_bracket").json()
+        self.assertEqual(len(bracket), 3)
+        self.assertIsNotNone(bracket[-1]["matches"][0]["winner"])
+
+        matches = self.get("api_matches").json()
+        self.assertEqual(
+            sum(
+                len(match["sets"]) for round_ in matches for match in round_["matches"]
+            ),
+            Set.objects.filter(match__tournament=self.tournament).count(),
+        )
+
+        standings = self.get("api_standings").json()
+        self.assertEqual(standings[0]["position"], "Campeón")
+
+    def test_unknown_tournament(self):
+        """Test an unknown tournament is not found."""
+        response = self.client.get(reverse("api_matches", args=["no-existe"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_conditional_get(self):
+        """Test unchanged polls get a 304 without tournament queries."""
+        response = self.get("api_matches")
+        etag = response.headers["ETag"]
+        self.assertIn("no-cache", response.headers["Cache-Control"])
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.get("api_matches", if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        tables = ("app_tournament", "app_participant", "app_match", "app_set")
+        self.assertFalse(
+            [
+                query
+                for query in context.captured_queries
+                if any(table in query["sql"] for table in tables)
+            ],
+        )
+
+        match_set = Set.objects.filter(match__tournament=self.tournament).first()
+        match_set.participant1_score, match_set.participant2_score = (
+            match_set.participant2_score,
+            match_set.participant1_score,
+        )
+        match_set.save()
+
+        response = self.get("api_matches", if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
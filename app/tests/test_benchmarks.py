@@ -0,0 +1,117 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TestCase
+
+from app.benchmarks.runner import compare, load_budgets, measure
+from app.benchmarks.scenarios import Fixtures, get_scenarios
+from app.management.commands.benchmark import BUDGETS_PATH
+from app.models import Tournament
+from app.seeding import seed_club
+
+
+class BudgetTests(SimpleTestCase):
+    """Test cases for comparing measurements with the budgets."""
+
+    def test_compare(self):
+        """Test extra queries and slowdowns past the tolerance are reported."""
+        budgets = {
+            "fast": {"queries": 3, "seconds": 0.01},
+            "slow": {"queries": 3, "seconds": 0.01},
+        }
+        results = {
+            "fast": {"queries": 3, "seconds": 0.012},
+            "slow": {"queries": 4, "seconds": 0.02},
+            "new": {"queries": 1, "seconds": 0.001},
+        }
+
+        violations, missing = compare(results, budgets, tolerance=0.5)
+
+        self.assertEqual(len(violations), 2)
+        self.assertTrue(all(violation.startswith("slow") for violation in violations))
+        self.assertEqual(missing, ["new"])
+
+
+class ScenarioTests(TestCase):
+    """Test cases for the benchmark scenarios."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed a small club."""
+        seed_club(100, 4, draw_size=8, unfinished=1, seed=1)
+
+    def test_scenarios_run_and_roll_back(self):
+        """Test every scenario answers as expected within its query budget.
+
+        Query counts do not grow with the club, so the small one stays within
+        the budgets measured on the large one. The data is left as it was.
+        """
+        ongoing = Tournament.objects.filter(slug__startswith="torneo").latest("id")
+        current_round = ongoing.current_round
+        budgets = load_budgets(BUDGETS_PATH)["budgets"]
+        statuses = {
+            "view:logout": 302,
+            "view:select_participants": 302,
+            "view:settle_round": 302,
+            "view:round_scores:post": 302,
+            "view:api_matches:not_modified": 304,
+        }
+
+        for scenario in get_scenarios(Fixtures(self.client)):
+            with self.subTest(scenario.name):
+                responses = []
+                run = scenario.run
+
+                def record(run=run, responses=responses):
+                    responses.append(run())
+
+                scenario.run = record
+                result = measure(scenario, repeat=1)
+
+                self.assertLessEqual(
+                    result["queries"],
+                    budgets[scenario.name]["queries"],
+                )
+                if scenario.name.startswith("view:"):
+                    self.assertEqual(
+                        responses[0].status_code,
+                        statuses.get(scenario.name, 200),
+                    )
+
+        ongoing.refresh_from_db()
+        self.assertEqual(ongoing.current_round, current_round)
+
+
+class ProductionProfileTests(SimpleTestCase):
+    """Test cases for the production SQLite profile."""
+
+    def test_pragmas_applied_on_connect(self):
+        """Test a new connection gets WAL and the tuned pragmas."""
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = {
+                **connection.settings_dict,
+                **settings.SQLITE_PRODUCTION,
+                "NAME": str(Path(directory) / "profile.sqlite3"),
+            }
+            wrapper = DatabaseWrapper(settings_dict, alias="profile")
+            try:
+                with wrapper.cursor() as cursor:
+                    pragmas = {}
+                    for pragma in ("journal_mode", "synchronous", "busy_timeout"):
+                        cursor.execute(f"PRAGMA {pragma}")
+                        pragmas[pragma] = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,
+                "busy_timeout": settings.SQLITE_PRAGMAS["busy_timeout"],
+            },
+        )
+        self.assertEqual(wrapper.transaction_mode, "IMMEDIATE")
@@ -0,0 +1,110 @@
+import random
+
+from django.test import SimpleTestCase
+
+from app.brackets import (
+    Bracket,
+    bracket_rounds,
+    count_byes,
+    get_round_choices,
+    pair_participants,
+)
+
+
+class PairingTests(SimpleTestCase):
+    """Test cases for pairing the participants of a round."""
+
+    def test_count_byes(self):
+        """Test byes bring the next round down to a power of two."""
+        self.assertEqual(
+            [count_byes(participants) for participants in range(1, 10)],
+            [1, 0, 1, 0, 3, 2, 1, 0, 7],
+        )
+
+    def test_pair_even_draw(self):
+        """Test a power of two draw pairs everyone exactly once."""
+        pairs, byes = pair_participants(range(16), rng=random.Random(1))  # noqa: S311
+
+        self.assertEqual(len(pairs), 8)
+        self.assertEqual(byes, [])
+        self.assertEqual(
+            sorted(player for pair in pairs for player in pair),
+            list(range(16)),
+        )
+
+    def test_pair_odd_draw(self):
+        """Test an odd draw gives explicit byes instead of dropping a player."""
+        pairs, byes = pair_participants(range(5), rng=random.Random(1))  # noqa: S311
+
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual(len(byes), 3)
+        self.assertEqual(
+            sorted([*byes, *(player for pair in pairs for player in pair)]),
+            list(range(5)),
+        )
+
+
+class BracketTests(SimpleTestCase):
+    """Test cases for the single elimination bracket."""
+
+    def test_bracket_rounds(self):
+        """Test rounds are derived from the draw size."""
+        self.assertEqual(
+            bracket_rounds(32),
+            ["dieciseisavos", "octavos", "cuartos", "semifinal", "final"],
+        )
+        self.assertEqual(len(bracket_rounds(256)), 8)
+        self.assertEqual(bracket_rounds(256)[0], "ronda_256")
+
+    def test_round_choices(self):
+        """Test round choices go from the largest draw to the final."""
+        keys = [key for key, _ in get_round_choices(8)]
+
+        self.assertEqual(
+            keys,
+            ["no_comenzado", "cuartos", "semifinal", "final", "finalizado"],
+        )
+
+    def test_seed_gives_at_most_one_bye_per_match(self):
+        """Test a short draw spreads its byes over the first round."""
+        bracket = Bracket.seed(range(5), rng=random.Random(1))  # noqa: S311
+
+        self.assertEqual(bracket.size, 8)
+        self.assertEqual(bracket.rounds, ["cuartos", "semifinal", "final"])
+        matches, byes = bracket.pairings("cuartos")
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(len(byes), 3)
+        self.assertEqual(
+            sorted(
+                [
+                    *(player for _, player in byes),
+                    *(player for _, *pair in matches for player in pair),
+                ],
+            ),
+            list(range(5)),
+        )
+
+    def test_advance_to_champion(self):
+        """Test winners move up the bracket until the final."""
+        bracket = Bracket.seed(range(4), rng=random.Random(1))  # noqa: S311
+
+        semifinals, byes = bracket.pairings("semifinal")
+        self.assertEqual(byes, [])
+        self.assertEqual([slot for slot, *_ in semifinals], [2, 3])
+        for slot, participant1, _ in semifinals:
+            bracket.advance(slot, participant1)
+
+        ((slot, participant1, participant2),), _ = bracket.pairings("final")
+        self.assertEqual(slot, 1)
+        self.assertEqual(
+            [participant1, participant2],
+            [participant1 for _, participant1, _ in semifinals],
+        )
+        bracket.advance(slot, participant2)
+        self.assertEqual(bracket.champion, participant2)
+
+    def test_path_to_final(self):
+        """Test the path from a first round match to the final."""
+        self.assertEqual(Bracket.path_to_final(13), [13, 6, 3, 1])
+        self.assertEqual(Bracket.slot_round(13), "octavos")
+        self.assertEqual(list(Bracket.round_slots("cuartos")), [4, 5, 6, 7])
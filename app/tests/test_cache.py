@@ -0,0 +1,170 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.cache import (
+    LocalCache,
+    bump_tournament_version,
+    tournament_cache,
+    tournament_slugs,
+)
+from app.models import Match, Participant, Set, Tournament, TournamentQuerySet
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self):
+        """Initialize at time zero."""
+        self.now = 0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+class LocalCacheTests(SimpleTestCase):
+    """Test cases for the process-local cache."""
+
+    def setUp(self):
+        """Set up a small cache."""
+        self.clock = FakeClock()
+        self.cache = LocalCache(max_entries=2, timeout=10, clock=self.clock)
+
+    def test_hit_and_miss(self):
+        """Test values are served for their own version only."""
+        self.assertIsNone(self.cache.get("a", 1))
+        self.cache.set("a", 1, "value")
+
+        self.assertEqual(self.cache.get("a", 1), "value")
+        self.assertIsNone(self.cache.get("a", 2))
+        self.assertEqual(
+            self.cache.stats(),
+            {"entries": 0, "hits": 1, "misses": 2, "evictions": 0},
+        )
+
+    def test_timeout(self):
+        """Test entries expire after the timeout."""
+        self.cache.set("a", 1, "value")
+        self.clock.now = 10
+
+        self.assertIsNone(self.cache.get("a", 1))
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        self.cache.set("a", 1, "a")
+        self.cache.set("b", 1, "b")
+        self.cache.get("a", 1)
+        self.cache.set("c", 1, "c")
+
+        self.assertEqual(self.cache.get("a", 1), "a")
+        self.assertIsNone(self.cache.get("b", 1))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+
+class TournamentCacheTests(TestCase):
+    """Test cases for the cached tournament metadata."""
+
+    def setUp(self):
+        """Set up test data."""
+        tournament_cache.clear()
+        tournament_slugs.clear()
+        self.User = get_user_model()
+        self.user = self.User.objects.create_user(
+            username="test",
+            telefono="+34666555444",
+        )
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            inscription_end_date=timezone.now().date(),
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + datetime.timedelta(days=14),
+            image="http://example.com/image.jpg",
+            description="Test tournament description",
+        )
+
+    def get_cached(self):
+        """Return the cached metadata of the test tournament."""
+        return Tournament.objects.get_cached(self.tournament.slug)
+
+    def test_served_from_cache(self):
+        """Test the second read runs no queries."""
+        self.get_cached()
+
+        with self.assertNumQueries(0):
+            metadata = self.get_cached()
+
+        self.assertEqual(metadata.tournament, self.tournament)
+        self.assertFalse(metadata.has_applied(self.user))
+        self.assertEqual(tournament_cache.stats()["hits"], 1)
+
+    def test_invalidated_by_application(self):
+        """Test applying to the tournament invalidates its metadata."""
+        self.get_cached()
+
+        self.tournament.participants.add(self.user)
+
+        self.assertTrue(self.get_cached().has_applied(self.user))
+        self.user.tournaments.clear()
+        self.assertFalse(self.get_cached().has_applied(self.user))
+
+    def test_invalidated_by_results(self):
+        """Test new matches and sets invalidate the round status."""
+        participants = [
+            Participant.objects.create(
+                user=self.User.objects.create_user(
+                    username=f"player{index}",
+                    telefono=f"+3466650{index:04d}",
+                ),
+                tournament=self.tournament,
+                status="active",
+            )
+            for index in range(2)
+        ]
+        self.assertTrue(self.get_cached().tournament.round_finished)
+
+        match = Match.objects.create(
+            tournament=self.tournament,
+            participant1=participants[0],
+            participant2=participants[1],
+            date=timezone.now(),
+            round=self.tournament.current_round,
+        )
+        self.assertFalse(self.get_cached().tournament.round_finished)
+
+        Set.objects.create(
+            match_id=match.id,
+            set_number=1,
+            participant1_score=6,
+            participant2_score=3,
+        )
+        self.assertTrue(self.get_cached().tournament.round_finished)
+
+    def test_write_during_miss(self):
+        """Test a write committed while fetching is not hidden by the fetch."""
+        with_round_status = TournamentQuerySet.with_round_status
+
+        def write_meanwhile(queryset):
+            bump_tournament_version(self.tournament.id)
+            return with_round_status(queryset)
+
+        with mock.patch.object(
+            TournamentQuerySet,
+            "with_round_status",
+            write_meanwhile,
+        ):
+            self.get_cached()
+
+        with CaptureQueriesContext(connection) as context:
+            self.get_cached()
+        self.assertTrue(context.captured_queries)
+
+    def test_unknown_slug(self):
+        """Test a missing tournament raises like get."""
+        with self.assertRaises(Tournament.DoesNotExist):
+            Tournament.objects.get_cached("no-existe")
@@ -0,0 +1,109 @@
+import csv
+import gzip
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from app.models import GlobalRanking, Participant, Set, Tournament
+from app.seeding import seed_club
+
+
+class ExportTests(TestCase):
+    """Test cases for streaming the ranking, standings and history exports."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed a small club."""
+        seed_club(20, 2, draw_size=8, seed=4)
+        cls.tournament = Tournament.objects.filter(slug__startswith="torneo").first()
+        cls.player = cls.tournament.participant_set.first().user
+        cls.superuser = get_user_model().objects.filter(is_superuser=True).first()
+
+    def get_content(self, name, args=(), query="", user=None):
+        """Return the streamed content of an export."""
+        self.client.force_login(user or self.superuser)
+        response = self.client.get(reverse(name, args=args) + query)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_history_csv(self):
+        """Test the history has one row per set, gzipped or not."""
+        content = self.get_content("export_history", ["csv"])
+        rows = list(csv.reader(StringIO(content.decode())))
+
+        self.assertEqual(rows[0][:3], ["tournament", "round", "match"])
+        self.assertEqual(len(rows) - 1, Set.objects.count())
+        self.assertEqual(
+            gzip.decompress(self.get_content("export_history", ["csv"], "?gzip")),
+            content,
+        )
+
+    def test_history_is_staff_only(self):
+        """Test players cannot export the full history."""
+        self.client.force_login(self.player)
+        response = self.client.get(reverse("export_history", args=["csv"]))
+        self.assertEqual(response.status_code, 302)
+
+    def test_standings_ndjson(self):
+        """Test the standings list every selected participant with a position."""
+        content = self.get_content(
+            "export_standings",
+            [self.tournament.slug, "ndjson"],
+            user=self.player,
+        )
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+
+        self.assertEqual(
+            len(rows),
+            self.tournament.participant_set.exclude(
+                status=Participant.Status.APPLIED,
+            ).count(),
+        )
+        self.assertEqual(rows[0]["position"], "Campeón")
+        self.assertEqual(
+            [row["score"] for row in rows],
+            sorted((row["score"] for row in rows), reverse=True),
+        )
+
+    def test_unknown_format(self):
+        """Test an unknown format is not found."""
+        self.client.force_login(self.player)
+        response = self.client.get(reverse("export_global_ranking", args=["xml"]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_stream(self):
+        """Test the export streams through the async handler."""
+        await self.async_client.aforce_login(self.player)
+        response = await self.async_client.get(
+            reverse("export_global_ranking", args=["csv"]),
+        )
+        content = b"".join([block async for block in response.streaming_content])
+        self.assertEqual(
+            len(content.decode().splitlines()) - 1,
+            await GlobalRanking.objects.acount(),
+        )
+
+    def test_command(self):
+        """Test the command writes a gzipped export."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "ranking.ndjson.gz"
+            call_command(
+                "export_results",
+                "ranking",
+                path,
+                format="ndjson",
+                gzip=True,
+                stdout=StringIO(),
+            )
+            lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+
+        ranks = [json.loads(line)["rank"] for line in lines]
+        self.assertTrue(ranks)
+        self.assertEqual(ranks, list(range(1, GlobalRanking.objects.count() + 1)))
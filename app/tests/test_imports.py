@@ -0,0 +1,153 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from app import exports
+from app.imports import ResultImporter
+from app.models import Match, Set, Tournament
+from app.seeding import seed_club
+
+
+class ImportResultsTests(TestCase):
+    """Test cases for importing results from CSV files."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed a small club with a tournament in progress."""
+        seed_club(20, 2, draw_size=8, unfinished=1, seed=7)
+        cls.ongoing = Tournament.objects.filter(slug__startswith="torneo-").latest("id")
+        cls.matches = Match.objects.filter(
+            tournament=cls.ongoing,
+            round=cls.ongoing.current_round,
+        ).select_related("participant1__user", "participant2__user")
+
+    def setUp(self):
+        """Create a directory for the results files."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write(self, name, lines):
+        """Write a results file and return its path."""
+        path = self.directory / name
+        path.write_text(
+            "tournament,round,player1,player2,set,player1_games,player2_games\n"
+            + "".join(f"{line}\n" for line in lines),
+        )
+        return path
+
+    def import_results(self, path, *args):
+        """Run the command and return its output and errors."""
+        stdout = StringIO()
+        stderr = StringIO()
+        call_command("import_results", path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def row(self, match, set_number, games):
+        """Return a results line for a set of the match."""
+        return (
+            f"{match.tournament.slug},{match.round},"
+            f"{match.participant1.user.username},{match.participant2.user.username},"
+            f"{set_number},{games[0]},{games[1]}"
+        )
+
+    def test_import_export(self):
+        """Test the current round of an exported gzipped history imports back."""
+        self.ongoing.enter_round_scores(
+            {match.id: [(6, 4), (3, 6), (6, 2)] for match in self.matches},
+        )
+        path = self.directory / "historial.csv.gz"
+        with path.open("wb") as file:
+            for block in exports.stream(exports.history_export(), "csv", compress=True):
+                file.write(block)
+        winners = dict(self.matches.values_list("id", "winner_id"))
+        rows = Set.objects.count()
+        sets = Set.objects.filter(match__in=self.matches).count()
+        Set.objects.filter(match__in=self.matches).delete()
+
+        output, errors = self.import_results(path, "--commit", "--batch-size", "7")
+
+        self.assertIn(f"Imported {sets} sets", output)
+        # every other set is of a settled round or finished tournament
+        self.assertEqual(len(errors.splitlines()), rows - sets)
+        self.assertEqual(Set.objects.filter(match__in=self.matches).count(), sets)
+        self.assertEqual(dict(self.matches.values_list("id", "winner_id")), winners)
+
+    def test_dry_run_and_errors(self):
+        """Test a dry run saves nothing and invalid rows are reported."""
+        match = self.matches.first()
+        players = [match.participant1.user.username, match.participant2.user.username]
+        slug = match.tournament.slug
+        path = self.write(
+            "resultados.csv",
+            [
+                # players the other way round, scores follow them
+                f"{slug},{match.round},{players[1]},{players[0]},1,0,6",
+                f"{slug},{match.round},{players[0]},nadie,2,6,0",
+                f"{slug},{match.round},{players[0]},{players[1]},3,6,x",
+            ],
+        )
+
+        output, errors = self.import_results(path)
+        self.assertIn("would import 1 sets", output)
+        self.assertFalse(Set.objects.filter(match=match).exists())
+        self.assertEqual(
+            [line.split(":")[0] for line in errors.splitlines()],
+            ["Line 3", "Line 4"],
+        )
+
+        self.import_results(path, "--commit")
+        set_ = Set.objects.get(match=match)
+        self.assertEqual((set_.participant1_score, set_.participant2_score), (6, 0))
+        match.refresh_from_db()
+        self.assertEqual(match.winner_id, match.participant1_id)
+
+    def test_finished_tournament(self):
+        """Test results of finished tournaments are rejected."""
+        match = (
+            Match.objects.filter(
+                tournament__slug__startswith="torneo-",
+                tournament__current_round="finalizado",
+            )
+            .select_related("tournament", "participant1__user", "participant2__user")
+            .first()
+        )
+        scores = list(match.set_set.values_list("participant1_score", flat=True))
+        path = self.write("resultados.csv", [self.row(match, 1, (0, 6))])
+
+        output, errors = self.import_results(path, "--commit")
+
+        self.assertIn("Imported 0 sets", output)
+        self.assertIn("is finished", errors)
+        self.assertEqual(
+            list(match.set_set.values_list("participant1_score", flat=True)),
+            scores,
+        )
+
+    def test_settled_round(self):
+        """Test results of rounds settled already are rejected."""
+        match = self.matches.select_related("tournament").first()
+        Tournament.objects.filter(pk=self.ongoing.pk).update(
+            current_round="final" if match.round != "final" else "semifinal",
+        )
+        path = self.write("resultados.csv", [self.row(match, 1, (6, 0))])
+
+        output, errors = self.import_results(path, "--commit")
+
+        self.assertIn("Imported 0 sets", output)
+        self.assertIn("is settled", errors)
+        self.assertFalse(Set.objects.filter(match=match).exists())
+
+    def test_lookups_of_the_file_tournaments(self):
+        """Test only the tournaments named in the file are looked up."""
+        participants = ResultImporter.load_participants({self.ongoing.slug})
+        matches = ResultImporter.load_matches({self.ongoing.slug})
+
+        self.assertEqual({slug for slug, _ in participants}, {self.ongoing.slug})
+        self.assertEqual(
+            {tournament_id for _, tournament_id, _, _ in matches.values()},
+            {self.ongoing.id},
+        )
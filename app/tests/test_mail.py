@@ -0,0 +1,127 @@
+import datetime
+import smtplib
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app.mail import OutboxSender
+from app.models import OutboxEmail
+
+
+class CountingBackend(EmailBackend):
+    """Local memory backend counting the connections opened."""
+
+    opened = 0
+
+    def __init__(self, *args, **kwargs):
+        """Count the connection."""
+        super().__init__(*args, **kwargs)
+        CountingBackend.opened += 1
+
+
+class FailingBackend(EmailBackend):
+    """Backend standing in for an SMTP server that refuses every email."""
+
+    def send_messages(self, messages):  # noqa: ARG002
+        """Refuse the messages."""
+        msg = "Service not available"
+        raise smtplib.SMTPServerDisconnected(msg)
+
+
+def queue_email(count=1):
+    """Queue emails through the outbox backend."""
+    connection = mail.get_connection("app.mail.OutboxBackend")
+    for number in range(count):
+        message = mail.EmailMultiAlternatives(
+            f"Asunto {number}",
+            "Texto",
+            "club@example.com",
+            [f"jugador{number}@example.com"],
+            headers={"X-Club": "RacketRank"},
+            connection=connection,
+        )
+        message.attach_alternative("<p>Texto</p>", "text/html")
+        message.send()
+
+
+class OutboxTests(TestCase):
+    """Test cases for the email outbox and its worker."""
+
+    @override_settings(EMAIL_BACKEND="app.mail.OutboxBackend")
+    def test_register_queues_email(self):
+        """Test registering only stores the verification email in the outbox."""
+        response = self.client.post(
+            reverse("register"),
+            {
+                "username": "nuevo",
+                "first_name": "Ana",
+                "last_name": "López",
+                "email": "nuevo@example.com",
+                "telefono": "+34666123456",
+                "password1": "una-clave-larga-1",
+                "password2": "una-clave-larga-1",
+            },
+        )
+
+        self.assertRedirects(response, reverse("login"))
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, ["nuevo@example.com"])
+        self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+
+    def test_send_reuses_connections(self):
+        """Test the worker delivers the emails over one connection per thread."""
+        queue_email(10)
+        CountingBackend.opened = 0
+
+        with OutboxSender(2, backend=f"{__name__}.CountingBackend") as sender:
+            counts = sender.send_batch()
+
+        self.assertEqual(counts["sent"], 10)
+        self.assertLessEqual(CountingBackend.opened, 2)
+        self.assertFalse(
+            OutboxEmail.objects.exclude(status=OutboxEmail.Status.SENT).exists(),
+        )
+        # sent content is not kept, it may hold a password
+        self.assertFalse(
+            OutboxEmail.objects.exclude(body="", alternatives=[]).exists(),
+        )
+        message = mail.outbox[0]
+        self.assertEqual(message.body, "Texto")
+        self.assertEqual(message.alternatives[0][1], "text/html")
+        self.assertEqual(message.extra_headers, {"X-Club": "RacketRank"})
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_retries_with_backoff(self):
+        """Test failed emails are retried later and given up on at the limit."""
+        queue_email()
+
+        with OutboxSender(1, backend=f"{__name__}.FailingBackend") as sender:
+            self.assertEqual(sender.send_batch()["retried"], 1)
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.attempts, 1)
+            self.assertIn("SMTPServerDisconnected", email.last_error)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+
+            # not due yet
+            self.assertEqual(
+                sender.send_batch(),
+                {"sent": 0, "retried": 0, "failed": 0},
+            )
+
+            OutboxEmail.objects.update(
+                next_attempt_at=timezone.now() - datetime.timedelta(seconds=1),
+            )
+            self.assertEqual(sender.send_batch()["failed"], 1)
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.Status.FAILED)
+
+    def test_claimed_emails_are_skipped(self):
+        """Test an email claimed by a worker is not claimed again."""
+        queue_email(3)
+
+        self.assertEqual(len(OutboxEmail.objects.claim(2, 60)), 2)
+        self.assertEqual(len(OutboxEmail.objects.claim(2, 60)), 1)
+        self.assertEqual(OutboxEmail.objects.claim(2, 60), [])
@@ -1,10 +1,21 @@
 import datetime
+from io import StringIO
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from app.models import Match, Participant, Set, Tournament
+from app.models import (
+    GlobalRanking,
+    Match,
+    Participant,
+    Set,
+    Tournament,
+    UserCareerStats,
+)
 
 
 class TournamentModelTests(TestCase):
@@ -50,6 +61,20 @@ class TournamentModelTests(TestCase):
         self.tournament.save()
         self.assertEqual(self.tournament.status, "Finalizado")
 
+    def test_unique_slug(self):
+        """Test tournaments with the same name get distinct slugs."""
+        self.assertEqual(self.tournament.slug, "test-tournament")
+        for name, slug in [
+            ("Test Tournament", "test-tournament-2"),
+            ("Test Tournament", "test-tournament-3"),
+            ("Торнир", "torneo"),
+        ]:
+            self.tournament.pk = None
+            self.tournament.slug = ""
+            self.tournament.name = name
+            self.tournament.save()
+            self.assertEqual(self.tournament.slug, slug)
+
     def test_next_round(self):
         """Test the next_round property of the Tournament model."""
         self.assertEqual(self.tournament.next_round, "octavos")
@@ -58,6 +83,19 @@ class TournamentModelTests(TestCase):
         self.tournament.current_round = "final"
         self.assertEqual(self.tournament.next_round, "finalizado")
 
+    def test_next_round_large_draw(self):
+        """Test the rounds of a 32 player draw."""
+        self.tournament.draw_size = 32
+        rounds = []
+        while self.tournament.next_round != "finalizado":
+            self.tournament.current_round = self.tournament.next_round
+            rounds.append(self.tournament.current_round)
+
+        self.assertEqual(
+            rounds,
+            ["dieciseisavos", "octavos", "cuartos", "semifinal", "final"],
+        )
+
     def test_distribute_points(self):
         """Test the distribute_points method of the Tournament model."""
         participant1 = Participant.objects.create(
@@ -81,6 +119,61 @@ class TournamentModelTests(TestCase):
         self.assertEqual(participant1.score, 2000)  # Winner gets 2000 points
         self.assertEqual(participant2.score, 1500)  # Runner-up gets 1500 points
 
+    def test_distribute_points_large_draw(self):
+        """Test every participant of a large draw gets a valid score."""
+        Participant.objects.bulk_create(
+            Participant(
+                user=self.User.objects.create_user(
+                    username=f"player{index}",
+                    telefono=f"+3466660{index:04d}",
+                ),
+                tournament=self.tournament,
+                status="eliminated",
+                matches_won=index % 5,
+            )
+            for index in range(32)
+        )
+
+        with self.assertNumQueries(2):
+            self.tournament.distribute_points()
+
+        scores = sorted(
+            Participant.objects.filter(tournament=self.tournament).values_list(
+                "score",
+                flat=True,
+            ),
+            reverse=True,
+        )
+        self.assertEqual(scores[:5], [2000, 1500, 1000, 500, 475])
+        self.assertEqual(scores[-1], 0)
+
+    def test_generate_matches(self):
+        """Test matches are created in one insert, with byes for odd draws."""
+        self.tournament.current_round = "octavos"
+        Participant.objects.bulk_create(
+            Participant(
+                user=self.User.objects.create_user(
+                    username=f"player{index}",
+                    telefono=f"+3466670{index:04d}",
+                ),
+                tournament=self.tournament,
+                status="active",
+            )
+            for index in range(7)
+        )
+
+        with self.assertNumQueries(2):
+            self.tournament.generate_matches()
+
+        matches = Match.objects.filter(tournament=self.tournament, round="octavos")
+        self.assertEqual(matches.count(), 3)
+        players = {
+            participant_id
+            for match in matches
+            for participant_id in (match.participant1_id, match.participant2_id)
+        }
+        self.assertEqual(len(players), 6)
+
     def test_participant_creation(self):
         """Test participant creation and properties."""
         participant = Participant.objects.create(
@@ -91,6 +184,28 @@ class TournamentModelTests(TestCase):
         self.assertEqual(participant.position, "Participante")
         self.assertEqual(participant.score, 0)
 
+    def test_participant_position(self):
+        """Test the position title follows the rounds of the draw."""
+        self.tournament.draw_size = 32
+        participant = Participant(user=self.user1, tournament=self.tournament)
+
+        titles = []
+        for matches_won in range(1, 7):
+            participant.matches_won = matches_won
+            titles.append(participant.position)
+
+        self.assertEqual(
+            titles,
+            [
+                "Dieciseisavofinalista",
+                "Octavofinalista",
+                "Cuartofinalista",
+                "Semifinalista",
+                "Finalista",
+                "Campeón",
+            ],
+        )
+
 
 class MatchLogicTests(TestCase):
     """Test cases for match logic."""
@@ -165,6 +280,56 @@ class MatchLogicTests(TestCase):
 
         self.assertEqual(self.match.winner, self.participant1)
 
+    def test_round_finished(self):
+        """Test the round is finished once every match has a winner."""
+        with self.assertNumQueries(1):
+            self.assertFalse(self.tournament.round_finished)
+
+        Set.objects.create(
+            match=self.match,
+            set_number=1,
+            participant1_score=6,
+            participant2_score=4,
+        )
+        with self.assertNumQueries(1):
+            self.assertTrue(self.tournament.round_finished)
+
+    def test_round_status_annotation(self):
+        """Test with_round_status reports completion without extra queries."""
+        tournament = Tournament.objects.with_round_status().get(pk=self.tournament.pk)
+        self.assertEqual(tournament.unresolved_matches, 1)
+        with self.assertNumQueries(0):
+            self.assertFalse(tournament.round_finished)
+
+        Set.objects.create(
+            match=self.match,
+            set_number=1,
+            participant1_score=2,
+            participant2_score=6,
+        )
+        tournament = Tournament.objects.with_round_status().get(pk=self.tournament.pk)
+        self.assertEqual(tournament.unresolved_matches, 0)
+        self.assertTrue(tournament.round_finished)
+
+    def test_unique_participant_and_set_number(self):
+        """Test a user joins a tournament once and set numbers do not repeat."""
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            Participant.objects.create(user=self.user1, tournament=self.tournament)
+
+        Set.objects.create(
+            match=self.match,
+            set_number=1,
+            participant1_score=6,
+            participant2_score=4,
+        )
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            Set.objects.create(
+                match=self.match,
+                set_number=1,
+                participant1_score=6,
+                participant2_score=4,
+            )
+
     def test_match_settlement(self):
         """Test the settle method of the Match model."""
         # Create sets
@@ -190,3 +355,417 @@ class MatchLogicTests(TestCase):
         self.assertEqual(self.participant2.games_won, 7)
         self.assertEqual(self.participant1.sets_won, 2)
         self.assertEqual(self.participant2.status, "eliminated")
+
+    def test_match_results_follow_sets(self):
+        """Test the stored set wins and winner are kept in sync with the sets."""
+        first_set = Set.objects.create(
+            match=self.match,
+            set_number=1,
+            participant1_score=3,
+            participant2_score=6,
+        )
+        Set.objects.create(
+            match=self.match,
+            set_number=2,
+            participant1_score=6,
+            participant2_score=4,
+        )
+        Set.objects.create(
+            match=self.match,
+            set_number=3,
+            participant1_score=6,
+            participant2_score=1,
+        )
+
+        match = Match.objects.get(pk=self.match.pk)
+        self.assertEqual(match.participant1_set_wins, 2)
+        self.assertEqual(match.participant2_set_wins, 1)
+        self.assertEqual(match.winner_id, self.participant1.id)
+
+        first_set.participant1_score = 7
+        first_set.participant2_score = 5
+        first_set.save()
+        match.refresh_from_db()
+        self.assertEqual(match.participant1_set_wins, 3)
+        self.assertEqual(match.participant2_set_wins, 0)
+
+        Set.objects.filter(match=self.match).delete()
+        match.refresh_from_db()
+        self.assertEqual(match.participant1_set_wins, 0)
+        self.assertIsNone(match.winner)
+
+    def test_cascade_delete_skips_refresh(self):
+        """Test deleting a tournament does not refresh the matches of its sets."""
+        Set.objects.bulk_create(
+            Set(
+                match=self.match,
+                set_number=number,
+                participant1_score=6,
+                participant2_score=4,
+            )
+            for number in range(1, 4)
+        )
+        with CaptureQueriesContext(connection) as context:
+            self.tournament.delete()
+
+        self.assertFalse(
+            [
+                query
+                for query in context.captured_queries
+                if query["sql"].startswith('UPDATE "app_match" SET "participant1_set')
+            ],
+        )
+        self.assertFalse(Set.objects.exists())
+
+    def test_match_with_results(self):
+        """Test the with_results annotations agree with the stored columns."""
+        Set.objects.create(
+            match=self.match,
+            set_number=1,
+            participant1_score=2,
+            participant2_score=6,
+        )
+        Set.objects.create(
+            match=self.match,
+            set_number=2,
+            participant1_score=4,
+            participant2_score=6,
+        )
+
+        match = Match.objects.with_results().get(pk=self.match.pk)
+        self.assertEqual(match.computed_participant1_set_wins, 0)
+        self.assertEqual(match.computed_participant2_set_wins, 2)
+        self.assertEqual(match.computed_winner_id, self.participant2.id)
+        self.assertEqual(match.participant2_set_wins, 2)
+        self.assertEqual(match.winner_id, self.participant2.id)
+
+
+class SettleRoundTests(TestCase):
+    """Test cases for settling a tournament round."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.User = get_user_model()
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            inscription_end_date=timezone.now().date(),
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + datetime.timedelta(days=14),
+            image="http://example.com/image.jpg",
+            description="Test tournament description",
+            current_round="final",
+        )
+
+    def create_matches(self, count):
+        """Create matches in the current round won 2-1 by participant1."""
+        matches = []
+        for _ in range(count):
+            index = Participant.objects.count()
+            participant1, participant2 = (
+                Participant.objects.create(
+                    user=self.User.objects.create_user(
+                        username=f"player{index + offset}",
+                        telefono=f"+3466620{index + offset:04d}",
+                    ),
+                    tournament=self.tournament,
+                    status="active",
+                )
+                for offset in range(2)
+            )
+            match = Match.objects.create(
+                tournament=self.tournament,
+                participant1=participant1,
+                participant2=participant2,
+                date=timezone.now(),
+                round=self.tournament.current_round,
+            )
+            for set_number, scores in enumerate([(6, 4), (3, 6), (7, 5)], 1):
+                Set.objects.create(
+                    match=match,
+                    set_number=set_number,
+                    participant1_score=scores[0],
+                    participant2_score=scores[1],
+                )
+            matches.append(match)
+        return matches
+
+    def test_settle_round_results(self):
+        """Test settling the final applies sets, eliminations and points."""
+        (match,) = self.create_matches(1)
+
+        self.tournament.settle_round()
+
+        participant1 = Participant.objects.get(pk=match.participant1_id)
+        participant2 = Participant.objects.get(pk=match.participant2_id)
+        self.assertEqual(self.tournament.current_round, "finalizado")
+        self.assertEqual(participant1.status, "active")
+        self.assertEqual(participant1.matches_won, 1)
+        self.assertEqual(participant1.sets_won, 2)
+        self.assertEqual(participant1.games_won, 16)
+        self.assertEqual(participant1.games_lost, 15)
+        self.assertEqual(participant1.score, 2000)
+        self.assertEqual(participant2.status, "eliminated")
+        self.assertEqual(participant2.matches_won, 0)
+        self.assertEqual(participant2.sets_won, 1)
+        self.assertEqual(participant2.score, 1500)
+
+    def test_settle_round_follows_bracket(self):
+        """Test starting a short draw seeds a bracket and advances the byes."""
+        self.tournament.current_round = "no_comenzado"
+        self.tournament.draw_size = 8
+        self.tournament.save()
+        for index in range(5):
+            Participant.objects.create(
+                user=self.User.objects.create_user(
+                    username=f"seeded{index}",
+                    telefono=f"+3466630{index:04d}",
+                ),
+                tournament=self.tournament,
+                status="active",
+            )
+
+        self.tournament.settle_round()
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.current_round, "cuartos")
+        (match,) = Match.objects.filter(tournament=self.tournament)
+        self.assertIn(match.slot, range(4, 8))
+        semifinalists = [
+            participant
+            for participant in self.tournament.bracket[4:8]
+            if participant is not None
+        ]
+        # The three byes already wait in the semifinals
+        self.assertEqual(len(semifinalists), 3)
+
+        for set_number in (1, 2):
+            Set.objects.create(
+                match=match,
+                set_number=set_number,
+                participant1_score=6,
+                participant2_score=2,
+            )
+        self.tournament.settle_round()
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.current_round, "semifinal")
+        self.assertEqual(self.tournament.bracket[match.slot], match.participant1_id)
+        semifinals = Match.objects.filter(
+            tournament=self.tournament,
+            round="semifinal",
+        )
+        self.assertEqual(sorted(semifinals.values_list("slot", flat=True)), [2, 3])
+
+    def test_settle_round_query_count_is_constant(self):
+        """Test settling a round does not run queries per match."""
+        self.create_matches(2)
+        with CaptureQueriesContext(connection) as small_draw:
+            self.tournament.settle_round()
+
+        self.tournament.pk = None
+        self.tournament.slug = ""
+        self.tournament.current_round = "final"
+        self.tournament.save()
+        self.create_matches(8)
+        with CaptureQueriesContext(connection) as large_draw:
+            self.tournament.settle_round()
+
+        self.assertEqual(
+            len(small_draw.captured_queries),
+            len(large_draw.captured_queries),
+        )
+
+    def test_finalizing_updates_global_ranking(self):
+        """Test finishing the tournament ranks its participants globally."""
+        (match,) = self.create_matches(1)
+
+        self.tournament.settle_round()
+
+        rankings = list(GlobalRanking.objects.order_by("rank"))
+        self.assertEqual(
+            [(ranking.user_id, ranking.rank) for ranking in rankings],
+            [(match.participant1.user_id, 1), (match.participant2.user_id, 2)],
+        )
+        winner_stats = rankings[0].user.career_stats
+        self.assertEqual(winner_stats.tournaments_played, 1)
+        self.assertEqual(winner_stats.total_score, 2000)
+        self.assertEqual(winner_stats.total_sets_won, 2)
+        self.assertEqual(winner_stats.total_games_won, 16)
+        self.assertEqual(rankings[1].user.career_stats.total_games_lost, 16)
+
+    def test_rebuild_global_ranking_command(self):
+        """Test the management command rebuilds the ranking from scratch."""
+        (match,) = self.create_matches(1)
+        self.tournament.settle_round()
+        GlobalRanking.objects.all().delete()
+        Participant.objects.filter(pk=match.participant2_id).update(sets_won=5)
+
+        call_command("rebuild_global_ranking", stdout=StringIO())
+
+        self.assertEqual(
+            list(GlobalRanking.objects.values_list("user_id", "rank")),
+            [(match.participant2.user_id, 1), (match.participant1.user_id, 2)],
+        )
+
+
+class UserStatisticsTests(TestCase):
+    """Test cases for the user statistics."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.User = get_user_model()
+        self.user = self.User.objects.create_user(
+            username="test",
+            telefono="+34666555444",
+        )
+
+    def create_finished_tournament(self, name):
+        """Create a finished tournament where the user played two matches."""
+        tournament = Tournament.objects.create(
+            name=name,
+            inscription_end_date=timezone.now().date(),
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + datetime.timedelta(days=14),
+            image="http://example.com/image.jpg",
+            description="Test tournament description",
+            current_round="finalizado",
+        )
+        participant = Participant.objects.create(
+            user=self.user,
+            tournament=tournament,
+            status="active",
+        )
+        for round_name, scores in [("final", (6, 3)), ("semifinal", (4, 6))]:
+            index = self.User.objects.count()
+            opponent = Participant.objects.create(
+                user=self.User.objects.create_user(
+                    username=f"opponent{index}",
+                    telefono=f"+3466630{index:04d}",
+                ),
+                tournament=tournament,
+                status="eliminated",
+            )
+            match = Match.objects.create(
+                tournament=tournament,
+                participant1=opponent,
+                participant2=participant,
+                date=timezone.now(),
+                round=round_name,
+            )
+            Set.objects.create(
+                match=match,
+                set_number=1,
+                participant1_score=scores[1],
+                participant2_score=scores[0],
+            )
+
+    def test_tournament_stats(self):
+        """Test the per-tournament breakdown from the user's point of view."""
+        self.create_finished_tournament("First")
+
+        (stats,) = self.user.get_statistics().get_tournament_stats()
+
+        self.assertEqual(stats["tournament_name"], "First")
+        self.assertEqual(stats["total_sets_won"], 1)
+        self.assertEqual(stats["total_sets_lost"], 1)
+        self.assertEqual(
+            [match["round"] for match in stats["matches"]],
+            ["semifinal", "final"],
+        )
+        final = stats["matches"][1]
+        self.assertEqual(final["result"], "Ganado")
+        self.assertEqual(final["sets"][0]["games_won"], 6)
+        self.assertEqual(final["sets"][0]["games_lost"], 3)
+
+    def test_tournament_stats_query_count(self):
+        """Test the statistics run a fixed number of queries."""
+        for name in ["First", "Second", "Third"]:
+            self.create_finished_tournament(name)
+
+        statistics = self.user.get_statistics()
+        with self.assertNumQueries(3):
+            tournament_stats = statistics.get_tournament_stats()
+        self.assertEqual(len(tournament_stats), 3)
+
+    def test_total_points_of_finished_tournaments(self):
+        """Test only finished tournaments count, like the overall ranking."""
+        self.create_finished_tournament("First")
+        self.create_finished_tournament("Second")
+        Participant.objects.filter(user=self.user).update(score=100)
+        Tournament.objects.filter(name="Second").update(current_round="final")
+        UserCareerStats.objects.refresh()
+
+        self.assertEqual(self.user.get_statistics().total_points, 100)
+
+    def test_overall_ranking(self):
+        """Test the dense rank by total points, including unranked users."""
+        other = self.User.objects.create_user(username="other", telefono="+34666555400")
+        newcomer = self.User.objects.create_user(
+            username="newcomer",
+            telefono="+34666555401",
+        )
+        UserCareerStats.objects.bulk_create(
+            [
+                UserCareerStats(user=self.user, total_score=1500),
+                UserCareerStats(user=other, total_score=2000),
+            ],
+        )
+        GlobalRanking.objects.bulk_create(
+            [GlobalRanking(user=self.user), GlobalRanking(user=other)],
+        )
+        GlobalRanking.objects.update_ranks()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.user.get_statistics().overall_ranking, 2)
+        self.assertEqual(
+            GlobalRanking.objects.score_ranks([self.user.id, other.id, newcomer.id]),
+            {self.user.id: 2, other.id: 1, newcomer.id: 3},
+        )
+
+
+class SelectParticipantsTests(TestCase):
+    """Test cases for seeding the participants of a tournament."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.User = get_user_model()
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament",
+            inscription_end_date=timezone.now().date(),
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + datetime.timedelta(days=14),
+            image="http://example.com/image.jpg",
+            description="Test tournament description",
+        )
+
+    def test_select_participants_by_career_stats(self):
+        """Test the applicants with the best career stats are selected."""
+        applicants = []
+        for index, (score, sets_won) in enumerate(
+            [(500, 3), (2000, 1), (500, 4), (None, None)],
+        ):
+            user = self.User.objects.create_user(
+                username=f"player{index}",
+                telefono=f"+3466650{index:04d}",
+            )
+            if score is not None:
+                UserCareerStats.objects.create(
+                    user=user,
+                    total_score=score,
+                    total_sets_won=sets_won,
+                )
+            applicants.append(
+                Participant.objects.create(user=user, tournament=self.tournament),
+            )
+
+        self.tournament.select_participants(max_participants=2)
+
+        self.assertEqual(
+            set(
+                self.tournament.participant_set.filter(status="active").values_list(
+                    "id",
+                    flat=True,
+                ),
+            ),
+            {applicants[1].id, applicants[2].id},
+        )
@@ -0,0 +1,28 @@
+from django.test import SimpleTestCase
+
+from app.points import DEFAULT_POINTS_TABLE, PointsTable
+
+
+class PointsTableTests(SimpleTestCase):
+    """Test cases for the points tables."""
+
+    def test_default_points_table(self):
+        """Test the default table keeps the historic points."""
+        self.assertEqual(
+            [DEFAULT_POINTS_TABLE(position) for position in range(1, 8)],
+            [2000, 1500, 1000, 500, 475, 450, 425],
+        )
+        self.assertEqual(DEFAULT_POINTS_TABLE(23), 25)
+
+    def test_points_never_negative(self):
+        """Test large draws bottom out at the minimum instead of going negative."""
+        self.assertEqual(DEFAULT_POINTS_TABLE(24), 0)
+        self.assertEqual(DEFAULT_POINTS_TABLE(256), 0)
+
+    def test_custom_points_table(self):
+        """Test a custom table with its own linear tail and minimum."""
+        table = PointsTable(fixed={1: 100}, start=50, step=10, minimum=5)
+        self.assertEqual(
+            [table(position) for position in range(1, 9)],
+            [100, 50, 40, 30, 20, 10, 5, 5],
+        )
@@ -0,0 +1,99 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.cache import tournament_cache, tournament_slugs
+from app.models import Tournament
+from app.seeding import seed_club
+
+# "SCAN <table>" without an index is a full table scan
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+# Tables a view may read whole, because it lists every row
+ALLOWED_SCANS = {
+    "home": {"app_tournament"},
+}
+
+
+class QueryPlanTests(TestCase):
+    """Check the views do not scan whole tables on a large club."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed a club and collect planner statistics."""
+        seed_club(3000, 40, draw_size=32, unfinished=2, seed=1)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        cls.user = get_user_model().objects.get(username="jugador10")
+        cls.superuser = get_user_model().objects.get(username="admin")
+        cls.tournament = Tournament.objects.exclude(
+            current_round="finalizado",
+        ).latest("id")
+        cls.match = cls.tournament.match_set.first()
+
+    def setUp(self):
+        """Start with cold caches so the views reach the database."""
+        cache.clear()
+        tournament_cache.clear()
+        tournament_slugs.clear()
+
+    def full_scans(self, url, user):
+        """Return the tables scanned whole by the queries behind the url."""
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        scans = set()
+        for query in context.captured_queries:
+            if not query["sql"].startswith("SELECT"):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                for *_, detail in cursor.fetchall():
+                    match = FULL_SCAN.match(detail)
+                    if match:
+                        scans.add(match.group(1))
+        return scans
+
+    def assert_no_full_scans(self, name, *args, user=None, query=""):
+        """Assert the view only reads through indexes."""
+        url = reverse(name, args=args) + query
+        scans = self.full_scans(url, user or self.user)
+        self.assertEqual(scans - ALLOWED_SCANS.get(name, set()), set(), url)
+
+    def test_home(self):
+        """Test the home page plans."""
+        self.assert_no_full_scans("home")
+
+    def test_tournament_pages(self):
+        """Test the tournament, standings and matches page plans."""
+        for name in ("tournament", "standings", "matches"):
+            with self.subTest(name):
+                self.assert_no_full_scans(name, self.tournament.slug)
+
+    def test_match(self):
+        """Test the score entry page plans."""
+        self.assert_no_full_scans(
+            "match",
+            self.tournament.slug,
+            self.match.id,
+            user=self.superuser,
+        )
+
+    def test_global_ranking(self):
+        """Test the global ranking plans, first page and own page."""
+        self.assert_no_full_scans("global_ranking")
+        self.assert_no_full_scans("global_ranking", query="?mi_posicion=1")
+
+    def test_user_pages(self):
+        """Test the personal stats, history and profile page plans."""
+        for name in ("personal_stats", "history", "profile"):
+            with self.subTest(name):
+                self.assert_no_full_scans(name)
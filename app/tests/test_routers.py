@@ -0,0 +1,120 @@
+from django.contrib.auth import SESSION_KEY, get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from app.models import GlobalRanking, Tournament
+from app.routers import (
+    PIN_SESSION_KEY,
+    PrimaryPinningMiddleware,
+    primary_reads,
+    read_from_replica,
+    replica_reads,
+    routing_state,
+)
+
+
+@override_settings(REPLICA_DATABASE="replica")
+class PrimaryReplicaRouterTests(TestCase):
+    """Test cases for routing reads to the replica."""
+
+    def test_reads_default_to_primary(self):
+        """Test reads outside replica views go to the primary."""
+        self.assertEqual(Tournament.objects.all().db, "default")
+        with routing_state():
+            self.assertEqual(Tournament.objects.all().db, "default")
+
+    def test_replica_reads(self):
+        """Test replica views read from the replica and write to the primary."""
+        with routing_state() as state, replica_reads():
+            self.assertEqual(GlobalRanking.objects.all().db, "replica")
+            with primary_reads():
+                self.assertEqual(GlobalRanking.objects.all().db, "default")
+            self.assertFalse(state.wrote)
+
+            Tournament.objects.all().update(description="")
+            self.assertTrue(state.wrote)
+
+    def test_pinned_session_reads_primary(self):
+        """Test a session pinned after a write reads from the primary."""
+        with routing_state(pinned=True), replica_reads():
+            self.assertEqual(GlobalRanking.objects.all().db, "default")
+
+    def test_read_from_replica(self):
+        """Test the view decorator sends the view's reads to the replica."""
+
+        @read_from_replica
+        def view():
+            return GlobalRanking.objects.all().db
+
+        with routing_state():
+            self.assertEqual(view(), "replica")
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_no_replica(self):
+        """Test every read goes to the primary without a replica."""
+        with routing_state(), replica_reads():
+            self.assertEqual(GlobalRanking.objects.all().db, "default")
+
+
+def write(request):  # noqa: ARG001
+    """View that writes to the database."""
+    get_user_model().objects.create_user(
+        username="writer",
+        telefono="+34666000001",
+    )
+    return HttpResponse()
+
+
+@override_settings(REPLICA_DATABASE="replica")
+class PrimaryPinningMiddlewareTests(TestCase):
+    """Test cases for pinning sessions to the primary after writes."""
+
+    def get_request(self, logged_in=True):
+        """Return a request with a session, of a logged in user or empty."""
+        request = RequestFactory().get("/")
+        request.session = SessionStore()
+        if logged_in:
+            request.session[SESSION_KEY] = "1"
+        return request
+
+    def test_write_pins_session(self):
+        """Test a request that writes pins its session to the primary."""
+        request = self.get_request()
+        PrimaryPinningMiddleware(write)(request)
+
+        self.assertIn(PIN_SESSION_KEY, request.session)
+
+        def read(request):  # noqa: ARG001
+            with replica_reads():
+                return HttpResponse(GlobalRanking.objects.all().db)
+
+        response = PrimaryPinningMiddleware(read)(request)
+        self.assertEqual(response.content, b"default")
+
+    def test_anonymous_write_does_not_pin(self):
+        """Test writes of anonymous or logged out sessions leave them untouched."""
+        request = self.get_request(logged_in=False)
+        PrimaryPinningMiddleware(write)(request)
+
+        self.assertFalse(request.session.modified)
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_no_replica_does_not_pin(self):
+        """Test nothing is pinned without a replica."""
+        request = self.get_request()
+        PrimaryPinningMiddleware(write)(request)
+
+        self.assertNotIn(PIN_SESSION_KEY, request.session)
+
+    def test_read_does_not_pin(self):
+        """Test a read-only request leaves the session unpinned."""
+
+        def read(request):  # noqa: ARG001
+            list(Tournament.objects.all())
+            return HttpResponse()
+
+        request = self.get_request()
+        PrimaryPinningMiddleware(read)(request)
+
+        self.assertNotIn(PIN_SESSION_KEY, request.session)
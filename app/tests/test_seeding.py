@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count, F, Q
+from django.test import TestCase
+
+from app.brackets import Bracket
+from app.models import Match, Participant, Set, Tournament, User
+from app.seeding import seed_club
+
+
+class SeedClubTests(TestCase):
+    """Test cases for generating a synthetic club."""
+
+    def test_seed_club(self):
+        """Test the generated rows are consistent with each other."""
+        counts = seed_club(60, 3, draw_size=12, unfinished=1, seed=3)
+
+        self.assertEqual(counts["User"], 60)
+        self.assertEqual(counts["Participant"], 36)
+        self.assertEqual(counts["Set"], Set.objects.count())
+        self.assertFalse(
+            User.objects.filter(username__startswith="jugador")
+            .first()
+            .has_usable_password(),
+        )
+
+        finished = Tournament.objects.filter(
+            slug__startswith="torneo",
+            current_round="finalizado",
+        )
+        self.assertEqual(finished.count(), 2)
+        for tournament in finished:
+            # 12 entrants play 11 matches, 4 of them get a bye to the second round
+            self.assertEqual(tournament.match_set.count(), 11)
+            champion = Participant.objects.get(id=Bracket(tournament.bracket).champion)
+            self.assertEqual(champion.status, Participant.Status.ACTIVE)
+            self.assertEqual(
+                tournament.participant_set.filter(
+                    status=Participant.Status.ACTIVE,
+                ).count(),
+                1,
+            )
+
+        played = Match.objects.exclude(winner=None).annotate(
+            wins1=Count(
+                "set",
+                filter=Q(set__participant1_score__gt=F("set__participant2_score")),
+            ),
+        )
+        for match in played:
+            self.assertEqual(match.wins1, match.participant1_set_wins)
+            self.assertEqual(
+                match.set_set.count(),
+                match.participant1_set_wins + match.participant2_set_wins,
+            )
+
+    def test_seed_club_is_deterministic(self):
+        """Test the same seed generates the same results."""
+        seed_club(30, 2, draw_size=8, seed=5)
+        first = list(
+            Set.objects.values_list("participant1_score", "participant2_score"),
+        )
+        Tournament.objects.all().delete()
+        User.objects.filter(username__startswith="jugador").delete()
+
+        seed_club(30, 2, draw_size=8, seed=5)
+        second = list(
+            Set.objects.values_list("participant1_score", "participant2_score"),
+        )
+
+        self.assertEqual(first, second)
+
+    def test_command(self):
+        """Test the command seeds the club and reports the throughput."""
+        out = StringIO()
+        call_command("seed_club", users=20, tournaments=2, draw_size=8, stdout=out)
+
+        self.assertEqual(
+            Tournament.objects.filter(slug__startswith="torneo").count(),
+            2,
+        )
+        self.assertIn("rows/s", out.getvalue())
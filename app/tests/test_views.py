@@ -0,0 +1,465 @@
+import datetime
+import re
+from unittest import mock
+from urllib.parse import quote, unquote
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app.cache import tournament_cache, tournament_slugs
+from app.models import (
+    GlobalRanking,
+    Match,
+    Participant,
+    Set,
+    Tournament,
+    UserCareerStats,
+)
+from app.seeding import seed_club
+
+
+class TournamentRoutingTests(TestCase):
+    """Test cases for routing tournaments by slug."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        tournament_cache.clear()
+        tournament_slugs.clear()
+        self.user = get_user_model().objects.create_user(
+            username="viewer",
+            telefono="+34666000000",
+        )
+        self.client.force_login(self.user)
+
+    def test_slug_from_name(self):
+        """Test new tournaments get a URL safe slug from their name."""
+        tournament = Tournament.objects.create(
+            name="Open Club Sur 2025",
+            inscription_end_date=timezone.now().date(),
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date(),
+            image="http://example.com/image.jpg",
+            description="Test tournament description",
+        )
+
+        self.assertEqual(tournament.slug, "open-club-sur-2025")
+        response = self.client.get(
+            reverse("tournament", kwargs={"tournament": tournament.slug}),
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            Tournament.objects.get(name="Otoño").slug,
+            "otono",
+        )
+
+    def test_unknown_slug(self):
+        """Test an unknown tournament is a 404."""
+        response = self.client.get(
+            reverse("standings", kwargs={"tournament": "no-existe"}),
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_home_lists_tournaments_in_one_query(self):
+        """Test the home page loads every tournament with a single query."""
+        self.client.get(reverse("home"))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("home"))
+        tournament_queries = [
+            query
+            for query in context.captured_queries
+            if 'FROM "app_tournament"' in query["sql"]
+        ]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["tournaments"]), 4)
+        self.assertEqual(len(tournament_queries), 1)
+
+    def test_home_lists_unfinished_and_recent_tournaments(self):
+        """Test the home page leaves out tournaments finished over a year ago."""
+        today = timezone.now().date()
+        for name, ended in (("Antiguo", 400), ("Reciente", 30)):
+            end_date = today - datetime.timedelta(days=ended)
+            Tournament.objects.create(
+                name=name,
+                inscription_end_date=end_date - datetime.timedelta(days=70),
+                start_date=end_date - datetime.timedelta(days=60),
+                end_date=end_date,
+                image="http://example.com/image.jpg",
+                description="Test tournament description",
+                current_round="finalizado",
+            )
+
+        response = self.client.get(reverse("home"))
+
+        names = [tournament.name for tournament in response.context["tournaments"]]
+        self.assertIn("Reciente", names)
+        self.assertNotIn("Antiguo", names)
+        self.assertEqual(len(names), 5)
+
+
+class MatchesViewTests(TestCase):
+    """Test cases for the matches view."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        tournament_cache.clear()
+        tournament_slugs.clear()
+        self.User = get_user_model()
+        self.tournament = Tournament.objects.get(name="Primavera")
+        self.tournament.current_round = "octavos"
+        self.tournament.save()
+
+        self.user = self.User.objects.create_user(
+            username="viewer",
+            telefono="+34666000000",
+        )
+        self.client.force_login(self.user)
+
+    def create_matches(self, count):
+        """Create matches with three played sets each."""
+        for _ in range(count):
+            index = self.User.objects.count()
+            participants = [
+                Participant.objects.create(
+                    user=self.User.objects.create_user(
+                        username=f"player{index + offset}",
+                        telefono=f"+3466610{index + offset:04d}",
+                    ),
+                    tournament=self.tournament,
+                    status="active",
+                )
+                for offset in range(2)
+            ]
+            match = Match.objects.create(
+                tournament=self.tournament,
+                participant1=participants[0],
+                participant2=participants[1],
+                date=timezone.now() + datetime.timedelta(days=1),
+                round="octavos",
+            )
+            for set_number, scores in enumerate([(6, 4), (3, 6), (6, 2)], 1):
+                Set.objects.create(
+                    match=match,
+                    set_number=set_number,
+                    participant1_score=scores[0],
+                    participant2_score=scores[1],
+                )
+
+    def count_queries(self):
+        """Return the number of queries needed to render the matches page.
+
+        The process-local caches are emptied first, so every count starts from
+        the same cold tournament lookup.
+        """
+        tournament_cache.clear()
+        tournament_slugs.clear()
+        url = reverse("matches", kwargs={"tournament": "primavera"})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_matches_query_count_is_constant(self):
+        """Test the matches page does not run queries per match."""
+        self.create_matches(2)
+        small_draw = self.count_queries()
+
+        self.create_matches(6)
+        large_draw = self.count_queries()
+
+        self.assertEqual(small_draw, large_draw)
+
+    def test_rounds_fragment_is_cached(self):
+        """Test the rounds are rendered once until a result changes."""
+        self.create_matches(2)
+        first_render = self.count_queries()
+
+        cached_render = self.count_queries()
+        self.assertLess(cached_render, first_render)
+
+        match = Match.objects.filter(tournament=self.tournament).first()
+        Set.objects.filter(match=match).first().save()
+        self.assertEqual(self.count_queries(), first_render)
+
+    def test_rounds_fragment_per_role(self):
+        """Test superusers do not share the cached rounds of other users."""
+        self.create_matches(1)
+        Match.objects.update(round=self.tournament.current_round)
+        url = reverse("matches", kwargs={"tournament": "primavera"})
+        self.assertNotContains(self.client.get(url), "m5.433 13.917")
+
+        self.client.force_login(
+            self.User.objects.create_superuser(
+                username="staff",
+                telefono="+34666000001",
+            ),
+        )
+        self.assertContains(self.client.get(url), "m5.433 13.917")
+
+
+@mock.patch("app.views.RANKING_PAGE_SIZE", 2)
+class GlobalRankingViewTests(TestCase):
+    """Test cases for the global ranking view."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.User = get_user_model()
+        self.users = [
+            self.User.objects.create_user(
+                username=f"player{index}",
+                telefono=f"+3466640{index:04d}",
+            )
+            for index in range(5)
+        ]
+        UserCareerStats.objects.bulk_create(
+            UserCareerStats(user=user, total_sets_won=10 - index)
+            for index, user in enumerate(self.users)
+        )
+        GlobalRanking.objects.bulk_create(
+            GlobalRanking(user=user) for user in self.users
+        )
+        GlobalRanking.objects.update_ranks()
+        self.client.force_login(self.users[2])
+
+    def get_ranks(self, query=""):
+        """Return the ranks listed on the page and the response context."""
+        response = self.client.get(reverse("global_ranking") + query)
+        self.assertEqual(response.status_code, 200)
+        return [ranking.rank for ranking in response.context["rankings"]], response
+
+    def test_keyset_pages(self):
+        """Test walking the pages forward keeps the rank numbers."""
+        ranks, response = self.get_ranks()
+        self.assertEqual(ranks, [1, 2])
+        self.assertIsNone(response.context["previous_after"])
+
+        ranks, response = self.get_ranks(f"?desde={response.context['next_after']}")
+        self.assertEqual(ranks, [3, 4])
+        self.assertEqual(response.context["previous_after"], 0)
+
+        ranks, response = self.get_ranks(f"?desde={response.context['next_after']}")
+        self.assertEqual(ranks, [5])
+        self.assertIsNone(response.context["next_after"])
+
+    def test_jump_to_my_position(self):
+        """Test the page holding the current user can be opened directly."""
+        ranks, response = self.get_ranks("?mi_posicion")
+        self.assertEqual(ranks, [3, 4])
+        self.assertEqual(response.context["user_rank"], 3)
+
+
+class AsyncViewTests(TestCase):
+    """Test cases for serving the read views through the async handler."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed a small club."""
+        seed_club(20, 2, draw_size=8, unfinished=1, seed=2)
+        cls.tournament = Tournament.objects.get(
+            slug__startswith="torneo",
+            current_round="finalizado",
+        )
+        cls.player = cls.tournament.participant_set.first().user
+        cls.superuser = get_user_model().objects.filter(is_superuser=True).first()
+
+    def setUp(self):
+        """Clear the caches."""
+        cache.clear()
+        tournament_cache.clear()
+        tournament_slugs.clear()
+
+    async def test_read_views(self):
+        """Test every read view renders under ASGI for players and staff."""
+        paths = [
+            reverse("home"),
+            reverse("standings", args=[self.tournament.slug]),
+            reverse("matches", args=[self.tournament.slug]),
+            reverse("global_ranking"),
+            reverse("global_ranking") + "?mi_posicion",
+            reverse("history"),
+            reverse("personal_stats"),
+        ]
+        for user in (self.player, self.superuser):
+            await self.async_client.aforce_login(user)
+            for path in paths:
+                with self.subTest(user=user.username, path=path):
+                    # the async test client decodes the path as Latin-1
+                    response = await self.async_client.get(
+                        quote(unquote(path), safe="/?", encoding="latin-1"),
+                    )
+                    self.assertEqual(response.status_code, 200)
+
+    async def test_history(self):
+        """Test the played tournaments list the user's score and position."""
+        await self.async_client.aforce_login(self.player)
+
+        response = await self.async_client.get(reverse("history"))
+
+        played = response.context["played_tournaments"]
+        self.assertEqual([row["name"] for row in played], [self.tournament.name])
+        participant = await self.tournament.participant_set.aget(user=self.player)
+        self.assertEqual(played[0]["score"], participant.score)
+
+
+class SelectParticipantsButtonTests(TestCase):
+    """Test cases for the select participants button of the tournament pages."""
+
+    def setUp(self):
+        """Create a tournament whose inscriptions are over and log in as admin."""
+        self.User = get_user_model()
+        self.tournament = Tournament.objects.create(
+            name="Invierno Club",
+            inscription_end_date=timezone.now().date() - datetime.timedelta(days=1),
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + datetime.timedelta(days=14),
+            image="http://example.com/image.jpg",
+            description="Test tournament description",
+            current_round="octavos",
+        )
+        participants = [
+            Participant.objects.create(
+                user=self.User.objects.create_user(
+                    username=f"player{index}",
+                    telefono=f"+3466620{index:04d}",
+                ),
+                tournament=self.tournament,
+            )
+            for index in range(2)
+        ]
+        self.match = Match.objects.create(
+            tournament=self.tournament,
+            participant1=participants[0],
+            participant2=participants[1],
+            date=timezone.now(),
+            round="octavos",
+        )
+        self.client.force_login(
+            self.User.objects.create_superuser(
+                username="staff",
+                telefono="+34666000001",
+            ),
+        )
+
+    def test_button_enabled(self):
+        """Test the match and round scores pages let admins select participants."""
+        for url in [
+            reverse("match", args=[self.tournament.slug, self.match.id]),
+            reverse("round_scores", args=[self.tournament.slug]),
+        ]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'name="select_participants"')
+                self.assertIsNone(
+                    re.search(
+                        r'disabled\s+name="select_participants"',
+                        response.content.decode(),
+                    ),
+                )
+
+
+class RoundScoresViewTests(TestCase):
+    """Test cases for entering the scores of a whole round."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed a club with a tournament in progress."""
+        seed_club(20, 1, draw_size=8, unfinished=1, seed=1)
+        cls.tournament = Tournament.objects.get(slug__startswith="torneo")
+        cls.matches = list(
+            cls.tournament.match_set.filter(
+                round=cls.tournament.current_round,
+            ).order_by("id"),
+        )
+        cls.superuser = get_user_model().objects.filter(is_superuser=True).first()
+
+    def setUp(self):
+        """Log in as staff."""
+        self.client.force_login(self.superuser)
+
+    def test_page(self):
+        """Test every set of the round is saved from one form in a few queries."""
+        url = reverse("round_scores", args=[self.tournament.slug])
+        response = self.client.get(url)
+        self.assertEqual(len(response.context["form"].matches), len(self.matches))
+
+        data = {}
+        for match in self.matches:
+            for number, scores in enumerate([(6, 4), (6, 3)], 1):
+                for side, score in enumerate(scores, 1):
+                    data[f"match_{match.id}_set_{number}_{side}"] = score
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(url, data)
+        self.assertRedirects(
+            response,
+            reverse("matches", args=[self.tournament.slug]),
+            fetch_redirect_response=False,
+        )
+        self.assertLess(len(context.captured_queries), 20)
+
+        for match in Match.objects.filter(id__in=[match.id for match in self.matches]):
+            self.assertEqual(match.participant1_set_wins, 2)
+            self.assertEqual(match.winner_id, match.participant1_id)
+        self.assertTrue(self.tournament.round_finished)
+
+    def test_json(self):
+        """Test the JSON endpoint saves the sets and rejects invalid rounds whole."""
+        url = reverse("api_round_scores", args=[self.tournament.slug])
+        match = self.matches[0]
+        sets_before = Set.objects.count()
+
+        response = self.client.post(
+            url,
+            {
+                "matches": [
+                    {"id": match.id, "sets": [[3, 6], [2, 6]]},
+                    {"id": self.matches[-1].id, "sets": [[6, None]]},
+                ],
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()["errors"]), 1)
+        self.assertEqual(Set.objects.count(), sets_before)
+
+        response = self.client.post(
+            url,
+            {"matches": [{"id": match.id, "sets": [[3, 6], [2, 6]]}]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.json(), {"sets": 2})
+        match.refresh_from_db()
+        self.assertEqual(match.winner_id, match.participant2_id)
+
+    def test_fewer_sets_replace_result(self):
+        """Test sets past the entered ones are deleted, not kept from before."""
+        match = self.matches[0]
+        match.set_set.all().delete()
+        self.tournament.enter_round_scores({match.id: [(6, 4), (4, 6), (6, 3)]})
+
+        self.tournament.enter_round_scores({match.id: [(6, 4), (6, 3), (None, None)]})
+
+        self.assertEqual(match.set_set.count(), 2)
+        match.refresh_from_db()
+        self.assertEqual(
+            (match.participant1_set_wins, match.participant2_set_wins),
+            (2, 0),
+        )
+
+    def test_json_rejects_other_rounds(self):
+        """Test matches outside the current round are rejected."""
+        other = self.tournament.match_set.exclude(
+            round=self.tournament.current_round,
+        ).first()
+        response = self.client.post(
+            reverse("api_round_scores", args=[self.tournament.slug]),
+            {"matches": [{"id": other.id, "sets": [[6, 0]]}]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
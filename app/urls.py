@@ -1,9 +1,7 @@
 from django.contrib.auth import views as auth_views
-from django.urls import path, register_converter
+from django.urls import path
 
-from app import converters, views
-
-register_converter(converters.TournamentChecker, "tournament")
+from app import api, views
 
 urlpatterns = [
     path("", views.home, name="home"),
@@ -26,30 +24,64 @@ urlpatterns = [
         name="password_reset_done",
     ),
     path("logout", auth_views.LogoutView.as_view(), name="logout"),
-    path("torneo/<tournament:tournament>", views.tournament, name="tournament"),
+    path("torneo/<slug:tournament>", views.tournament, name="tournament"),
     path(
-        "torneo/<tournament:tournament>/clasificación",
+        "torneo/<slug:tournament>/clasificación",
         views.standings,
         name="standings",
     ),
-    path("torneo/<tournament:tournament>/partidos", views.matches, name="matches"),
     path(
-        "torneo/<tournament:tournament>/select_participants/",
+        "torneo/<slug:tournament>/clasificación.<str:export_format>",
+        views.export_standings,
+        name="export_standings",
+    ),
+    path("torneo/<slug:tournament>/partidos", views.matches, name="matches"),
+    path(
+        "torneo/<slug:tournament>/select_participants/",
         views.select_participants,
         name="select_participants",
     ),
     path(
-        "torneo/<tournament:tournament>/settle_round/",
+        "torneo/<slug:tournament>/settle_round/",
         views.settle_round,
         name="settle_round",
     ),
     path(
-        "torneo/<tournament:tournament>/partido/<int:match_id>",
+        "torneo/<slug:tournament>/resultados",
+        views.round_scores,
+        name="round_scores",
+    ),
+    path(
+        "torneo/<slug:tournament>/partido/<int:match_id>",
         views.match,
         name="match",
     ),
     path("global-ranking", views.global_ranking, name="global_ranking"),
+    path(
+        "global-ranking.<str:export_format>",
+        views.export_global_ranking,
+        name="export_global_ranking",
+    ),
+    path(
+        "historial.<str:export_format>",
+        views.export_history,
+        name="export_history",
+    ),
     path("personal_stats", views.personal_stats, name="personal_stats"),
     path("historial", views.history, name="history"),
     path("perfil", views.profile, name="profile"),
+    path("api/torneos", api.tournaments, name="api_tournaments"),
+    path("api/torneo/<slug:tournament>", api.tournament, name="api_tournament"),
+    path("api/torneo/<slug:tournament>/cuadro", api.bracket, name="api_bracket"),
+    path("api/torneo/<slug:tournament>/partidos", api.matches, name="api_matches"),
+    path(
+        "api/torneo/<slug:tournament>/clasificación",
+        api.standings,
+        name="api_standings",
+    ),
+    path(
+        "api/torneo/<slug:tournament>/resultados",
+        api.round_scores,
+        name="api_round_scores",
+    ),
 ]
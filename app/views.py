@@ -1,32 +1,56 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import PasswordResetView
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
 from django.core.management.utils import get_random_secret_key
-from django.db.models import F, Sum
-from django.db.models.functions import Random
-from django.shortcuts import redirect, render
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.utils.http import content_disposition_header
 from django_email_verification import send_email
 
-from app import models
-from app.forms import CustomUserCreationForm, UserProfileForm, create_set_formset
+from app import exports, models
+from app.brackets import round_label, round_players
+from app.cache import cached_fragment
+from app.forms import (
+    CustomUserCreationForm,
+    RoundScoresForm,
+    UserProfileForm,
+    create_set_formset,
+)
+from app.routers import read_from_replica
+
+RANKING_PAGE_SIZE = 50
+
+
+async def alist(queryset):
+    """Evaluate a queryset with the async ORM."""
+    return [obj async for obj in queryset]
+
+
+async def arender(request, template_name, context):
+    """Render a template from an async view.
+
+    The user is loaded with the async ORM first, so the templates can read
+    ``request.user`` without a query inside the event loop.
+    """
+    request.user = await request.auser()
+    return render(request, template_name, context)
 
 
 @login_required
-def home(request):
+async def home(request):
     """Home view."""
-    primavera = models.Tournament.objects.get(name="Primavera")
-    verano = models.Tournament.objects.get(name="Verano")
-    otono = models.Tournament.objects.get(name="Otoño")
-    invierno = models.Tournament.objects.get(name="Invierno")
-    context = {
-        "primavera": primavera,
-        "verano": verano,
-        "otono": otono,
-        "invierno": invierno,
-    }
-    return render(request, "app/home.html", context)
+    tournaments = await alist(
+        models.Tournament.objects.listed().order_by("start_date", "name"),
+    )
+    return await arender(request, "app/home.html", {"tournaments": tournaments})
 
 
 def register(request):
@@ -37,7 +61,8 @@ def register(request):
             user = form.save(commit=False)
             user.is_active = False
             user.save()
-            send_email(user)
+            # Only queued in the outbox, so no need for the library's thread
+            send_email(user, thread=False)
             messages.success(
                 request,
                 "Hemos enviado un correo electrónico para verificar tu cuenta.",
@@ -71,19 +96,43 @@ class CustomPasswordResetView(PasswordResetView):
         return super().form_valid(form)
 
 
+def get_cached_tournament_or_404(slug):
+    """Return the cached metadata of the tournament with the slug, or raise 404."""
+    try:
+        return models.Tournament.objects.get_cached(slug)
+    except models.Tournament.DoesNotExist:
+        msg = "No existe el torneo."
+        raise Http404(msg) from None
+
+
+async def aget_cached_tournament_or_404(slug):
+    """Async version of ``get_cached_tournament_or_404``."""
+    try:
+        return await models.Tournament.objects.aget_cached(slug)
+    except models.Tournament.DoesNotExist:
+        msg = "No existe el torneo."
+        raise Http404(msg) from None
+
+
 @login_required
 def tournament(request, tournament):
     """Tournament view."""
-    tournament = models.Tournament.objects.get(name=tournament.capitalize())
+    metadata = get_cached_tournament_or_404(tournament)
 
     if "inscribir" in request.POST:
-        tournament.participants.add(request.user)
+        metadata.tournament.participants.add(request.user)
+        metadata = get_cached_tournament_or_404(tournament)
     elif "desinscribir" in request.POST:
-        tournament.participants.remove(request.user)
-
-    user_applied = tournament.participants.filter(id=request.user.id).exists()
+        metadata.tournament.participants.remove(request.user)
+        metadata = get_cached_tournament_or_404(tournament)
 
-    context = {"tournament": tournament, "user_applied": user_applied}
+    context = {
+        "tournament": metadata.tournament,
+        "user_applied": metadata.has_applied(request.user),
+        "can_select_participants": (
+            request.user.is_superuser and metadata.tournament.can_select_participants()
+        ),
+    }
     return render(request, "app/tournament.html", context)
 
 
@@ -91,21 +140,18 @@ def tournament(request, tournament):
 @staff_member_required
 def select_participants(request, tournament):
     """Select participants for the tournament."""
-    tournament = models.Tournament.objects.get(name=tournament.capitalize())
+    tournament = get_object_or_404(models.Tournament, slug=tournament)
 
     if request.method == "POST":
         tournament.select_participants()
-    return redirect("tournament", tournament=tournament.name.lower())
-
+    return redirect("tournament", tournament=tournament.slug)
 
-@login_required
-def matches(request, tournament):
-    """Match view."""
-    tournament_obj = models.Tournament.objects.get(name=tournament.capitalize())
 
+def render_match_rounds(tournament, is_superuser):
+    """Render the rounds and matches of the tournament, latest round first."""
     # Fetch all matches for the tournament with necessary relations in one query
     matches = (
-        models.Match.objects.filter(tournament=tournament_obj)
+        models.Match.objects.filter(tournament=tournament)
         .order_by("-date")
         .select_related(
             "participant1__user",
@@ -121,57 +167,88 @@ def matches(request, tournament):
         round_name = match.round
         if round_name not in rounds_data:
             rounds_data[round_name] = {
-                "name": round_name.capitalize(),
+                "name": round_label(round_players(round_name)),
                 "matches": [],
             }
         rounds_data[round_name]["matches"].append(match)
 
-    round_order = {
-        "octavos": 1,
-        "cuartos": 2,
-        "semifinal": 3,
-        "final": 4,
+    # Latest round first: the fewer players left, the later the round
+    sorted_rounds = [
+        rounds_data[round_name] for round_name in sorted(rounds_data, key=round_players)
+    ]
+    context = {
+        "tournament": tournament,
+        "rounds": sorted_rounds,
+        "is_superuser": is_superuser,
     }
+    return render_to_string("app/fragments/matches-rounds.html", context).strip()
+
 
-    # Sort rounds based on predefined order
-    sorted_rounds = sorted(
-        rounds_data.values(),
-        key=lambda x: round_order[x["name"].lower()],
-        reverse=True,
+async def can_select_participants(user, tournament):
+    """Return if the user can select the participants of the tournament."""
+    return (
+        user.is_superuser
+        and await sync_to_async(
+            tournament.can_select_participants,
+        )()
     )
-    user_applied = tournament_obj.participants.filter(id=request.user.id).exists()
 
+
+@login_required
+async def matches(request, tournament):
+    """Match view."""
+    metadata, user = await asyncio.gather(
+        aget_cached_tournament_or_404(tournament),
+        request.auser(),
+    )
+    tournament_obj = metadata.tournament
+    is_superuser = user.is_superuser
+
+    rounds_html, can_select = await asyncio.gather(
+        sync_to_async(cached_fragment)(
+            "matches",
+            tournament_obj.id,
+            lambda: render_match_rounds(tournament_obj, is_superuser),
+            is_superuser,
+        ),
+        can_select_participants(user, tournament_obj),
+    )
     context = {
         "tournament": tournament_obj,
-        "user_applied": user_applied,
-        "rounds": sorted_rounds,
+        "user_applied": metadata.has_applied(user),
+        "rounds_html": rounds_html,
         "can_generate_matches": (
-            request.user.is_staff
-            and tournament_obj.participants.count() > 1
+            user.is_staff
+            and len(metadata.participant_ids) > 1
             and tournament_obj.next_round
             and tournament_obj.round_finished
         ),
+        "can_select_participants": can_select,
     }
 
-    return render(request, "app/matches.html", context)
+    return await arender(request, "app/matches.html", context)
 
 
 @login_required
 @staff_member_required
 def settle_round(request, tournament):
     """Generate matches for the next round."""
+    tournament = get_object_or_404(models.Tournament, slug=tournament)
+
     if request.method == "POST":
-        tournament = models.Tournament.objects.get(name=tournament.capitalize())
         tournament.settle_round()
-    return redirect("matches", tournament=tournament.name.lower())
+    return redirect("matches", tournament=tournament.slug)
 
 
 @login_required
 @staff_member_required
 def match(request, tournament, match_id):
     """Match view."""
-    tournament = models.Tournament.objects.get(name=tournament.capitalize())
-    match = models.Match.objects.get(id=match_id)
+    tournament = get_object_or_404(models.Tournament, slug=tournament)
+    match = models.Match.objects.select_related(
+        "participant1__user",
+        "participant2__user",
+    ).get(id=match_id)
     match_sets = models.Set.objects.filter(match=match)
 
     set_formset = create_set_formset(match)
@@ -183,88 +260,187 @@ def match(request, tournament, match_id):
         )
         if formset.is_valid():
             formset.save()
-            return redirect("matches", tournament=tournament.name.lower())
+            return redirect("matches", tournament=tournament.slug)
     else:
         formset = set_formset(
             queryset=match_sets,
             initial=[{"match": match, "set_number": i + 1} for i in range(5)],
         )
 
-    context = {"match": match, "formset": formset, "tournament": tournament}
+    context = {
+        "match": match,
+        "formset": formset,
+        "tournament": tournament,
+        "can_select_participants": (
+            request.user.is_superuser and tournament.can_select_participants()
+        ),
+    }
     return render(request, "app/match.html", context)
 
 
 @login_required
-def standings(request, tournament):
-    """Player standings view."""
-    tournament = models.Tournament.objects.get(name=tournament.capitalize())
+@staff_member_required
+def round_scores(request, tournament):
+    """Score entry view for every match of the current round."""
+    tournament = get_object_or_404(models.Tournament, slug=tournament)
+    matches = (
+        models.Match.objects.filter(
+            tournament=tournament,
+            round=tournament.current_round,
+        )
+        .order_by("date", "id")
+        .select_related("participant1__user", "participant2__user")
+        .prefetch_related("set_set")
+    )
+
+    if request.method == "POST":
+        form = RoundScoresForm(matches, request.POST)
+        if form.is_valid():
+            try:
+                tournament.enter_round_scores(form.scores())
+            except ValidationError as error:
+                form.add_error(None, error)
+            else:
+                return redirect("matches", tournament=tournament.slug)
+    else:
+        form = RoundScoresForm(matches)
+
+    context = {
+        "form": form,
+        "tournament": tournament,
+        "can_select_participants": (
+            request.user.is_superuser and tournament.can_select_participants()
+        ),
+    }
+    return render(request, "app/round-scores.html", context)
+
+
+def render_standings(tournament):
+    """Render the standings rows of the tournament."""
     participants = (
         models.Participant.objects.filter(tournament=tournament)
         .exclude(status="applied")
+        .select_related("user", "tournament")
         .order_by(
             "-score",
         )
     )
-    user_applied = tournament.participants.filter(id=request.user.id).exists()
+    return render_to_string(
+        "app/fragments/standings-rows.html",
+        {"participants": participants},
+    )
+
 
+@login_required
+@read_from_replica
+async def standings(request, tournament):
+    """Player standings view."""
+    metadata, user = await asyncio.gather(
+        aget_cached_tournament_or_404(tournament),
+        request.auser(),
+    )
+    tournament = metadata.tournament
+
+    standings_html, can_select = await asyncio.gather(
+        sync_to_async(cached_fragment)(
+            "standings",
+            tournament.id,
+            lambda: render_standings(tournament),
+        ),
+        can_select_participants(user, tournament),
+    )
     context = {
         "tournament": tournament,
-        "user_applied": user_applied,
-        "participants": participants,
+        "user_applied": metadata.has_applied(user),
+        "standings_html": standings_html,
+        "can_select_participants": can_select,
     }
-    return render(request, "app/standings.html", context)
+    return await arender(request, "app/standings.html", context)
 
 
 @login_required
-def global_ranking(request):
-    """Global ranking view."""
-    rankings = (
-        get_user_model()
-        .objects.annotate(
-            total_sets_won=Sum("participant__sets_won"),
-            total_games_won=Sum("participant__games_won"),
-            total_games_lost=Sum("participant__games_lost"),
-            # Add random value for consistent tie-breaking within a single request
-            random_order=Random(),
-        )
-        .filter(
-            # Only include users who have participated in tournaments
-            participant__isnull=False,
-        )
-        .order_by(
-            # Order by our criteria
-            F("total_sets_won").desc(nulls_last=True),
-            F("total_games_won").desc(nulls_last=True),
-            F("total_games_lost").asc(nulls_last=True),
-            "random_order",
-        )
-        .distinct()
+@read_from_replica
+async def global_ranking(request):
+    """Global ranking view.
+
+    Paginated by seeking on the stored rank, so every page is an index range
+    scan whatever its position.
+    """
+    user = await request.auser()
+    user_rank_query = (
+        models.GlobalRanking.objects.filter(user=user)
+        .values_list("rank", flat=True)
+        .afirst()
     )
-    context = {"rankings": rankings}
-    return render(request, "app/global-ranking.html", context)
+
+    try:
+        after = max(int(request.GET.get("desde", 0)), 0)
+    except ValueError:
+        after = 0
+
+    def page(after):
+        return alist(
+            models.GlobalRanking.objects.select_related("user__career_stats")
+            .filter(rank__gt=after)
+            .order_by("rank")[: RANKING_PAGE_SIZE + 1],
+        )
+
+    if "mi_posicion" in request.GET:
+        user_rank = await user_rank_query
+        if user_rank:
+            # start of the page holding the user
+            after = (user_rank - 1) // RANKING_PAGE_SIZE * RANKING_PAGE_SIZE
+        rankings = await page(after)
+    else:
+        user_rank, rankings = await asyncio.gather(user_rank_query, page(after))
+    has_next = len(rankings) > RANKING_PAGE_SIZE
+    rankings = rankings[:RANKING_PAGE_SIZE]
+
+    context = {
+        "rankings": rankings,
+        "user_rank": user_rank,
+        "previous_after": max(after - RANKING_PAGE_SIZE, 0) if after else None,
+        "next_after": rankings[-1].rank if has_next else None,
+    }
+    return await arender(request, "app/global-ranking.html", context)
 
 
 @login_required
-def personal_stats(request):
+@read_from_replica
+async def personal_stats(request):
     """Personal statistics view."""
-    user_stats = request.user.get_statistics()
+    user_stats = (await request.auser()).get_statistics()
 
+    tournament_stats, total_points, overall_ranking = await asyncio.gather(
+        sync_to_async(user_stats.get_tournament_stats)(),
+        user_stats.atotal_points(),
+        sync_to_async(lambda: user_stats.overall_ranking)(),
+    )
     context = {
-        "tournament_stats": user_stats.get_tournament_stats(),
-        "total_points": user_stats.total_points,
-        "overall_ranking": user_stats.overall_ranking,
+        "tournament_stats": tournament_stats,
+        "total_points": total_points,
+        "overall_ranking": overall_ranking,
     }
 
-    return render(request, "app/personal-stats.html", context)
+    return await arender(request, "app/personal-stats.html", context)
 
 
-@login_required
-def history(request):
-    """User tournaments view."""
-    played_tournaments = models.Tournament.objects.get_played_tournaments(request.user)
+async def played_tournaments_data(user):
+    """Return the name, dates, score and position of the user's played tournaments."""
+    played_tournaments = await alist(
+        models.Tournament.objects.get_played_tournaments(user),
+    )
+    participants = {
+        participant.tournament_id: participant
+        async for participant in models.Participant.objects.filter(
+            user=user,
+            tournament__in=[tournament.id for tournament in played_tournaments],
+        )
+    }
     played_tournaments_data = []
     for tournament in played_tournaments:
-        participant = tournament.participant_set.get(user=request.user)
+        participant = participants[tournament.id]
+        participant.tournament = tournament
         played_tournaments_data.append(
             {
                 "name": tournament.name,
@@ -274,18 +450,78 @@ def history(request):
                 "position": participant.position,
             },
         )
+    return played_tournaments_data
+
 
-    registered_tournaments = models.Tournament.objects.get_registered_tournaments(
-        request.user,
+@login_required
+async def history(request):
+    """User tournaments view."""
+    user = await request.auser()
+    played, registered, active = await asyncio.gather(
+        played_tournaments_data(user),
+        alist(models.Tournament.objects.get_registered_tournaments(user)),
+        alist(models.Tournament.objects.get_active_tournaments(user)),
     )
-    active_tournaments = models.Tournament.objects.get_active_tournaments(request.user)
 
     context = {
-        "played_tournaments": played_tournaments_data,
-        "registered_tournaments": registered_tournaments,
-        "active_tournaments": active_tournaments,
+        "played_tournaments": played,
+        "registered_tournaments": registered,
+        "active_tournaments": active,
     }
-    return render(request, "app/history.html", context)
+    return await arender(request, "app/history.html", context)
+
+
+def export_response(request, export, export_format):
+    """Stream the export as a file download, gzipped with ``?gzip``."""
+    if export_format not in exports.EXPORT_FORMATS:
+        msg = "Formato de exportación no válido."
+        raise Http404(msg)
+    compress = "gzip" in request.GET
+
+    # the rows are read after the view returns, outside its database routing
+    export.queryset = export.queryset.using(export.queryset.db)
+    content = exports.stream(export, export_format, compress=compress)
+    if isinstance(request, ASGIRequest):
+        content = exports.aiterate(content)
+
+    response = StreamingHttpResponse(
+        content,
+        content_type=(
+            "application/gzip" if compress else exports.EXPORT_FORMATS[export_format]
+        ),
+    )
+    response["Content-Disposition"] = content_disposition_header(
+        as_attachment=True,
+        filename=exports.filename(export, export_format, compress=compress),
+    )
+    return response
+
+
+@login_required
+@read_from_replica
+def export_global_ranking(request, export_format):
+    """Global ranking export view."""
+    return export_response(request, exports.ranking_export(), export_format)
+
+
+@login_required
+@read_from_replica
+def export_standings(request, tournament, export_format):
+    """Tournament standings export view."""
+    tournament = get_cached_tournament_or_404(tournament).tournament
+    return export_response(
+        request,
+        exports.standings_export(tournament),
+        export_format,
+    )
+
+
+@login_required
+@staff_member_required
+@read_from_replica
+def export_history(request, export_format):
+    """Match and set history export view."""
+    return export_response(request, exports.history_export(), export_format)
 
 
 @login_required
@@ -299,4 +535,10 @@ def profile(request):
     else:
         form = UserProfileForm(instance=request.user)
 
-    return render(request, "app/profile.html", {"form": form})
+    context = {
+        "form": form,
+        "career_stats": models.UserCareerStats.objects.filter(
+            user=request.user,
+        ).first(),
+    }
+    return render(request, "app/profile.html", context)
@@ -53,6 +53,7 @@ MIDDLEWARE = [
     "django_browser_reload.middleware.BrowserReloadMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "app.routers.PrimaryPinningMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -88,6 +89,66 @@ DATABASES = {
     },
 }
 
+# Production profile, enabled with DATABASE_PROFILE=production. WAL lets readers
+# keep going while score entry and settlement write, and synchronous=NORMAL is
+# still safe against corruption with WAL. The pragmas are per connection, so
+# they run on every new connection, which is kept open between requests.
+# Writers take the lock when the transaction starts, so they wait on
+# busy_timeout instead of failing to upgrade a read lock.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": config("SQLITE_MMAP_SIZE", default=256 * 1024 * 1024, cast=int),
+    "cache_size": -config("SQLITE_CACHE_KIB", default=64 * 1024, cast=int),
+    "busy_timeout": config("SQLITE_BUSY_TIMEOUT", default=5000, cast=int),
+}
+SQLITE_PRODUCTION = {
+    "CONN_MAX_AGE": config("CONN_MAX_AGE", default=600, cast=int),
+    "CONN_HEALTH_CHECKS": True,
+    "OPTIONS": {
+        "init_command": ";".join(
+            f"PRAGMA {pragma}={value}" for pragma, value in SQLITE_PRAGMAS.items()
+        ),
+        "transaction_mode": "IMMEDIATE",
+    },
+}
+
+DATABASE_PROFILE = config("DATABASE_PROFILE", default="development")
+if DATABASE_PROFILE == "production":
+    DATABASES["default"].update(SQLITE_PRODUCTION)
+
+# Read replica, e.g. DATABASE_REPLICA=db-replica.sqlite3 to try it locally with
+# a copy of the primary kept up to date by `manage.py sync_replica`. Only the
+# views marked with app.routers.read_from_replica read from it, and a session
+# reads from the primary for REPLICA_PIN_SECONDS after it writes.
+DATABASE_REPLICA = config("DATABASE_REPLICA", default="")
+REPLICA_DATABASE = None
+if DATABASE_REPLICA:
+    REPLICA_DATABASE = "replica"
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES["default"],
+        "NAME": BASE_DIR / DATABASE_REPLICA,
+        "TEST": {"MIRROR": "default"},
+    }
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=10, cast=int)
+DATABASE_ROUTERS = ["app.routers.PrimaryReplicaRouter"]
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Tournament data is cached per process and invalidated through version
+# counters kept in the default cache, which must be shared (Memcached, Redis)
+# when running several worker processes.
+
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -139,13 +200,26 @@ LOGOUT_REDIRECT_URL = "login"
 AUTH_USER_MODEL = "app.User"
 PHONENUMBER_DEFAULT_REGION = "ES"
 
-EMAIL_USE_TLS = True
-EMAIL_HOST = "smtp.gmail.com"
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
+EMAIL_HOST = config("EMAIL_HOST", default="smtp.gmail.com")
 EMAIL_HOST_USER = config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
-EMAIL_PORT = 587
+EMAIL_PORT = config("EMAIL_PORT", default=587, cast=int)
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Requests only store emails in the outbox, the send_outbox worker delivers them
+# through OUTBOX_BACKEND, retrying failures with exponential backoff
+EMAIL_BACKEND = "app.mail.OutboxBackend"
+OUTBOX_BACKEND = config(
+    "OUTBOX_BACKEND",
+    default="django.core.mail.backends.smtp.EmailBackend",
+)
+OUTBOX_THREADS = config("OUTBOX_THREADS", default=4, cast=int)
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_RETRY_DELAY = 30  # seconds, doubled after every failure
+OUTBOX_MAX_RETRY_DELAY = 60 * 60
+OUTBOX_CLAIM_SECONDS = 5 * 60
+
 
 def email_verified_callback(user):
     """Execute after email verification."""